@@ -0,0 +1,455 @@
+# EXECUÇÃO EM LOTE (SEM INTERFACE) DO PRÉ-TRATAMENTO HIDROTÉRMICO
+# Lê tabelas de condições (CSV ou Parquet) no formato de
+# BEPE FAPESP/Pretreatment/experimental_data.csv em blocos de tamanho fixo,
+# simula os blocos em um pool de processos e grava os resultados em disco à
+# medida que ficam prontos, com checkpoints para retomar execuções interrompidas
+#
+# Uso:
+#   python Batch_Runner.py condicoes.csv resultados.csv --chunk-size 50000 --workers 8
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from Hydrothermal_Pretreatment import (
+    INHIBITOR_SPECIES, SPECIES, SUGAR_SPECIES, TEMPERATURE_RANGE, simulate_hydrothermal_batch
+)
+
+# Entradas do simulador e os nomes de coluna aceitos para cada uma (o
+# primeiro é o usado em experimental_data.csv). As composições podem vir
+# como fração (0-1) ou porcentagem (0-100), decidido por coluna.
+INPUT_COLUMNS = {
+    "temperature": ("Temperature [°C]", "temperature"),
+    "solid_loading": ("Solid Loading [g/L]", "solid_loading"),
+    "cellulose_fraction": ("Cellulose Composition (%)", "cellulose_fraction"),
+    "hemicellulose_fraction": ("Hemicellulose Composition (%)", "hemicellulose_fraction"),
+    "time_final": ("Time [min]", "time_final"),
+}
+
+# Colunas calculadas acrescentadas a cada linha
+OUTPUT_COLUMNS = (
+    tuple(f"{name}_final" for name in SPECIES)
+    + ("cellulose_degraded_percent", "hemicellulose_degraded_percent", "sugar_release", "inhibitors", "error")
+)
+
+# Composições lidas como fração ou porcentagem
+COMPOSITION_INPUTS = ("cellulose_fraction", "hemicellulose_fraction")
+
+# Coluna auxiliar com os campos excedentes das linhas do CSV mais longas que o cabeçalho
+_OVERFLOW_COLUMN = "__campos_excedentes__"
+
+_SUGAR_IDX = [SPECIES.index(s) for s in SUGAR_SPECIES]
+_INHIBITOR_IDX = [SPECIES.index(s) for s in INHIBITOR_SPECIES]
+
+# =============================================================================
+# LEITURA E VALIDAÇÃO
+# =============================================================================
+
+def resolve_input_columns(columns):
+    """
+    Associa cada entrada do simulador a uma coluna da tabela.
+
+    Args:
+        columns (list): Nomes das colunas (espaços nas pontas são ignorados).
+
+    Returns:
+        dict: Entrada do simulador → nome da coluna na tabela.
+    """
+    stripped = {str(c).strip(): c for c in columns}
+    resolved = {}
+    for name, aliases in INPUT_COLUMNS.items():
+        match = next((stripped[a] for a in aliases if a in stripped), None)
+        if match is None:
+            raise KeyError(f"Coluna obrigatória ausente: {aliases[0]!r} (ou {', '.join(map(repr, aliases[1:]))})")
+        resolved[name] = match
+    return resolved
+
+def read_chunks(path, chunk_size):
+    """
+    Lê uma tabela de condições em blocos de chunk_size linhas.
+
+    Args:
+        path (Path): Arquivo .csv ou .parquet.
+        chunk_size (int): Linhas por bloco.
+
+    Linhas do CSV com mais campos que o cabeçalho não são descartadas: os
+    campos excedentes ficam em uma coluna auxiliar e a linha é marcada como
+    inválida por validate_conditions.
+
+    Yields:
+        pd.DataFrame: Blocos com as colunas originais (sem espaços nas pontas).
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".parquet":
+        # pyarrow só é necessário para Parquet
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas().rename(columns=lambda c: str(c).strip())
+    else:
+        header = [str(c).strip() for c in pd.read_csv(path, nrows=0, skipinitialspace=True).columns]
+        n_fields = len(header)
+
+        def overflow(fields):
+            # Linha com 2+ campos excedentes: guarda os excedentes na coluna auxiliar
+            return fields[:n_fields] + [", ".join(fields[n_fields:])]
+
+        # O parser em Python aceita uma função em on_bad_lines (o de C só descarta)
+        reader = pd.read_csv(path, chunksize=chunk_size, header=None, skiprows=1,
+                             names=header + [_OVERFLOW_COLUMN], skipinitialspace=True, engine="python",
+                             on_bad_lines=overflow)
+        for chunk in reader:
+            yield chunk.rename(columns=lambda c: str(c).strip())
+
+def percent_compositions(chunk):
+    """
+    Decide, por coluna, se as composições de um bloco estão em porcentagem.
+
+    Uma coluna está em porcentagem quando algum valor passa de 1.
+
+    Args:
+        chunk (pd.DataFrame): Bloco da tabela de condições.
+
+    Returns:
+        dict: Entrada → True (porcentagem), False (fração) ou None (coluna
+        sem valores numéricos no bloco).
+    """
+    columns = resolve_input_columns(chunk.columns)
+    percent = {}
+    for name in COMPOSITION_INPUTS:
+        values = pd.to_numeric(chunk[columns[name]], errors="coerce").to_numpy(dtype=float)
+        values = values[np.isfinite(values)]
+        percent[name] = bool(values.max() > 1) if len(values) else None
+    return percent
+
+def validate_conditions(chunk, percent=None):
+    """
+    Converte as entradas de um bloco e identifica as linhas inválidas.
+
+    Args:
+        chunk (pd.DataFrame): Bloco da tabela de condições.
+        percent (dict): Composições em porcentagem (ver percent_compositions);
+            as ausentes ou None são decididas pelo próprio bloco.
+
+    Returns:
+        tuple: (entradas, erros), com entradas um dict de arrays (n,) e erros
+        um array (n,) de mensagens ("" para linhas válidas).
+    """
+    columns = resolve_input_columns(chunk.columns)
+    inputs = {name: pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=float)
+              for name, col in columns.items()}
+
+    # Composições em porcentagem são convertidas para fração (a coluna inteira)
+    percent = {**percent_compositions(chunk),
+               **{name: value for name, value in (percent or {}).items() if value is not None}}
+    for name in COMPOSITION_INPUTS:
+        if percent[name]:
+            inputs[name] = inputs[name] / 100.0
+
+    errors = np.full(len(chunk), "", dtype=object)
+
+    def flag(mask, message):
+        errors[mask & (errors == "")] = message
+
+    # Linhas do CSV mais longas que o cabeçalho (os campos podem estar deslocados)
+    if _OVERFLOW_COLUMN in chunk.columns:
+        extra = chunk[_OVERFLOW_COLUMN]
+        for row in np.flatnonzero(extra.notna().to_numpy()):
+            errors[row] = f"linha com mais campos que o cabeçalho (excedentes: {extra.iloc[row]})"
+
+    for name, values in inputs.items():
+        flag(~np.isfinite(values), f"valor ausente ou não numérico em {columns[name]!r}")
+    t_min, t_max = TEMPERATURE_RANGE
+    flag((inputs["temperature"] < t_min) | (inputs["temperature"] > t_max),
+         f"temperatura fora da faixa {t_min:.0f}-{t_max:.0f}°C")
+    flag(inputs["solid_loading"] < 0, "carga de sólidos negativa")
+    flag((inputs["cellulose_fraction"] < 0) | (inputs["hemicellulose_fraction"] < 0), "composição negativa")
+    flag((inputs["cellulose_fraction"] > 1) | (inputs["hemicellulose_fraction"] > 1), "composição acima de 100%")
+    flag(inputs["cellulose_fraction"] + inputs["hemicellulose_fraction"] > 1,
+         "celulose + hemicelulose acima de 100%")
+    flag(inputs["time_final"] < 0, "tempo negativo")
+    return inputs, errors
+
+# =============================================================================
+# SIMULAÇÃO DE UM BLOCO
+# =============================================================================
+
+def simulate_chunk(chunk, percent=None):
+    """
+    Simula todas as linhas válidas de um bloco em uma única chamada vetorizada.
+
+    Linhas inválidas não interrompem o bloco: recebem NaN nos resultados e
+    a mensagem na coluna "error".
+
+    Args:
+        chunk (pd.DataFrame): Bloco da tabela de condições.
+        percent (dict): Composições em porcentagem (ver validate_conditions).
+
+    Returns:
+        pd.DataFrame: Colunas originais seguidas de OUTPUT_COLUMNS.
+    """
+    inputs, errors = validate_conditions(chunk, percent)
+    n = len(chunk)
+    final = np.full((n, len(SPECIES)), np.nan)
+    degraded = np.full((n, 2), np.nan)
+
+    valid = np.flatnonzero(errors == "")
+    if len(valid):
+        try:
+            results = simulate_hydrothermal_batch(
+                **{name: values[valid] for name, values in inputs.items()}, n_points=2
+            )
+            final[valid] = results["concentrations"][:, -1, :]
+            degraded[valid, 0] = results["cellulose_degraded_percent"]
+            degraded[valid, 1] = results["hemicellulose_degraded_percent"]
+        except Exception as e:
+            errors[valid] = f"erro na simulação: {e}"
+
+    output = chunk.drop(columns=_OVERFLOW_COLUMN, errors="ignore").reset_index(drop=True)
+    computed = {f"{name}_final": final[:, i] for i, name in enumerate(SPECIES)}
+    computed.update({
+        "cellulose_degraded_percent": degraded[:, 0],
+        "hemicellulose_degraded_percent": degraded[:, 1],
+        "sugar_release": final[:, _SUGAR_IDX].sum(axis=1),
+        "inhibitors": final[:, _INHIBITOR_IDX].sum(axis=1),
+        "error": errors,
+    })
+    return pd.concat([output, pd.DataFrame(computed)], axis=1)
+
+def _process_chunk(args):
+    """
+    Simula e serializa um bloco (executado nos processos do pool).
+
+    A conversão para CSV/Parquet, mais cara que a própria simulação, também
+    fica nos processos; o processo principal só grava os bytes.
+
+    Returns:
+        tuple: (bytes serializados, linhas, linhas com erro).
+    """
+    index, chunk, percent, parquet = args
+    frame = simulate_chunk(chunk, percent)
+    buffer = io.BytesIO()
+    if parquet:
+        frame.to_parquet(buffer, index=False)
+    else:
+        # Cabeçalho apenas no primeiro bloco do arquivo
+        frame.to_csv(buffer, header=index == 0, index=False)
+    return buffer.getvalue(), len(frame), int((frame["error"] != "").sum())
+
+# =============================================================================
+# GRAVAÇÃO DOS RESULTADOS
+# =============================================================================
+
+class _CsvSink:
+    """Um único CSV; a posição no arquivo após cada bloco vai para o checkpoint."""
+
+    def __init__(self, path, offset):
+        self.path = Path(path)
+        if offset:
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)  # descarta um bloco gravado pela metade
+        else:
+            self.path.write_bytes(b"")
+        self._file = open(self.path, "ab")
+
+    def write(self, index, payload):
+        self._file.write(payload)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+class _ParquetSink:
+    """Uma pasta com um arquivo part-NNNNNN.parquet por bloco."""
+
+    def __init__(self, path, chunks_done):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        for part in self.path.glob("part-*.parquet"):
+            if int(part.stem.split("-")[1]) >= chunks_done:
+                part.unlink()
+
+    def write(self, index, payload):
+        part = self.path / f"part-{index:06d}.parquet"
+        tmp = part.with_suffix(".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, part)
+        return 0
+
+    def close(self):
+        pass
+
+# =============================================================================
+# CHECKPOINT E EXECUÇÃO
+# =============================================================================
+
+def _load_checkpoint(path, settings):
+    """Lê o checkpoint, conferindo se pertence à mesma execução."""
+    if not path.exists():
+        return None
+    state = json.loads(path.read_text())
+    mismatched = [k for k, v in settings.items() if state.get(k) != v]
+    if mismatched:
+        raise ValueError(
+            f"Checkpoint {path} foi criado com outros parâmetros ({', '.join(mismatched)}); "
+            "use --restart para começar de novo"
+        )
+    return state
+
+def _save_checkpoint(path, state):
+    """Grava o checkpoint de forma atômica."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, path)
+
+def _print_progress(report):
+    """Relatório de progresso padrão (stderr)."""
+    print(
+        f"\rbloco {report['chunks_done']}: {report['rows_done']:,} linhas "
+        f"({report['errors']:,} com erro) | {report['rows_per_second']:,.0f} linhas/s",
+        end="\n" if report["finished"] else "",
+        file=sys.stderr,
+        flush=True,
+    )
+
+def run_batch(input_path, output_path, chunk_size=10_000, n_workers=None, checkpoint_path=None,
+              restart=False, progress=_print_progress):
+    """
+    Simula uma tabela de condições inteira, bloco a bloco.
+
+    Os blocos são distribuídos em um pool de processos; no máximo dois
+    blocos por processo ficam em memória ao mesmo tempo. A unidade de cada
+    coluna de composição (fração ou porcentagem) é decidida no primeiro
+    bloco com valores e vale para a tabela inteira. Os resultados são
+    gravados na ordem de entrada assim que cada bloco termina e, depois de
+    cada gravação, o checkpoint é atualizado. Uma execução interrompida
+    continua do último bloco gravado.
+
+    Args:
+        input_path (str): Tabela de condições (.csv ou .parquet).
+        output_path (str): Resultados: arquivo .csv ou pasta .parquet
+            (um arquivo por bloco).
+        chunk_size (int): Linhas por bloco.
+        n_workers (int): Processos do pool (padrão: número de CPUs; 1
+            simula no próprio processo).
+        checkpoint_path (str): Arquivo de checkpoint (padrão: ao lado da
+            saída, com sufixo .checkpoint.json).
+        restart (bool): Ignora um checkpoint existente e começa do zero.
+        progress (callable): Recebe um dict de progresso após cada bloco
+            (None desativa).
+
+    Returns:
+        dict: Estado final: blocos e linhas processados, linhas com erro,
+        tempo e vazão.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    checkpoint_path = Path(checkpoint_path or f"{output_path}.checkpoint.json")
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    settings = {"input": str(input_path.resolve()), "output": str(output_path.resolve()), "chunk_size": chunk_size}
+    state = None if restart else _load_checkpoint(checkpoint_path, settings)
+    if state is None:
+        state = {**settings, "chunks_done": 0, "rows_done": 0, "errors": 0, "output_offset": 0, "finished": False}
+    if state["finished"]:
+        return state
+
+    parquet = output_path.suffix.lower() == ".parquet"
+    sink = _ParquetSink(output_path, state["chunks_done"]) if parquet else _CsvSink(output_path, state["output_offset"])
+
+    start = time.perf_counter()
+    rows_at_start = state["rows_done"]
+
+    def commit(index, processed):
+        payload, rows, errors = processed
+        state["output_offset"] = sink.write(index, payload)
+        state["chunks_done"] = index + 1
+        state["rows_done"] += rows
+        state["errors"] += errors
+        _save_checkpoint(checkpoint_path, state)
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            progress({**state, "elapsed": elapsed,
+                      "rows_per_second": (state["rows_done"] - rows_at_start) / elapsed if elapsed > 0 else 0.0})
+
+    # Unidade das composições, decidida uma vez por coluna (também nos
+    # blocos já gravados, para que uma execução retomada decida igual)
+    percent = dict.fromkeys(COMPOSITION_INPUTS)
+
+    executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    try:
+        pending = deque()
+        for index, chunk in enumerate(read_chunks(input_path, chunk_size)):
+            if None in percent.values():
+                for name, value in percent_compositions(chunk).items():
+                    if percent[name] is None:
+                        percent[name] = value
+            # Blocos já gravados em uma execução anterior
+            if index < state["chunks_done"]:
+                continue
+            args = (index, chunk, dict(percent), parquet)
+            if executor is None:
+                commit(index, _process_chunk(args))
+                continue
+            pending.append((index, executor.submit(_process_chunk, args)))
+            while len(pending) >= 2 * n_workers:
+                index_done, future = pending.popleft()
+                commit(index_done, future.result())
+        while pending:
+            index_done, future = pending.popleft()
+            commit(index_done, future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        sink.close()
+
+    elapsed = time.perf_counter() - start
+    state["finished"] = True
+    _save_checkpoint(checkpoint_path, state)
+    report = {**state, "elapsed": elapsed,
+              "rows_per_second": (state["rows_done"] - rows_at_start) / elapsed if elapsed > 0 else 0.0}
+    if progress is not None:
+        progress(report)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Simula em lote o pré-tratamento hidrotérmico para uma tabela de condições."
+    )
+    parser.add_argument("input", help="Tabela de condições (.csv ou .parquet)")
+    parser.add_argument("output", help="Resultados (.csv, ou .parquet para uma pasta com um arquivo por bloco)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="Linhas por bloco (padrão: 10000)")
+    parser.add_argument("--workers", type=int, default=None, help="Processos do pool (padrão: número de CPUs)")
+    parser.add_argument("--checkpoint", default=None, help="Arquivo de checkpoint (padrão: <saída>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="Ignora o checkpoint e começa do zero")
+    parser.add_argument("--quiet", action="store_true", help="Não mostra o progresso")
+    args = parser.parse_args(argv)
+
+    report = run_batch(
+        args.input, args.output,
+        chunk_size=args.chunk_size,
+        n_workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
+        progress=None if args.quiet else _print_progress,
+    )
+    print(
+        f"Concluído: {report['rows_done']:,} linhas em {report['chunks_done']} blocos "
+        f"({report['errors']:,} com erro)",
+        file=sys.stderr,
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,501 @@
+# SUÍTE DE BENCHMARKS DOS CAMINHOS CRÍTICOS DE SIMULAÇÃO
+# Mede latência (percentis), vazão e pico de memória de cada benchmark,
+# compara com as referências gravadas em benchmark_baselines.json e falha
+# (código de saída 1) quando algum deles piora além do limite
+#
+# A comparação divide a mediana de cada rodada pelo tempo de uma carga de
+# calibração medida no início da mesma rodada (e usa a mediana das razões): a
+# variação de velocidade da máquina, entre sessões e durante a execução,
+# se cancela. Benchmarks acima do limite são medidos uma segunda vez antes de
+# serem apontados como regressão. Referências
+# gravadas em outro ambiente (environment()) só geram avisos.
+#
+# Uso:
+#   python Benchmark_Suite.py                  # compara com as referências
+#   python Benchmark_Suite.py --update         # regrava as referências
+#   python Benchmark_Suite.py -k hydrothermal  # apenas os benchmarks com "hydrothermal" no nome
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from Enzymatic_Hydrolysis import (
+    ANGARITA_2015_PARAMETERS, enzyme_equilibrium, simulate_enzymatic_hydrolysis, simulate_hydrolysis_batch
+)
+from Fermentation import simulate_fermentation, simulate_fermentation_batch
+from Forest_Inference import ForestModel, export_forest
+from Hydrothermal_Pretreatment import (
+    SPECIES, HydrothermalResult, create_hydrothermal_plot_data, simulate_hydrothermal_batch,
+    simulate_hydrothermal_degradation
+)
+from Model_Registry import discover_artifacts
+from Process_Pipeline import ProcessPipeline
+from Response_Surface import ResponseSurface, build_response_surface
+from Plot_Rendering import scenario_overlay_spec
+from Simulation_Cache import SimulationCache, cached_hydrothermal_degradation, hydrothermal_cache_key
+
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baselines.json"
+
+# Piora relativa tolerada na latência mediana e no pico de memória
+DEFAULT_THRESHOLD = 0.25
+
+# Tempo mínimo e repetições por benchmark; os que integram EDOs (mais
+# sujeitos a ruído) medem por mais tempo
+DEFAULT_MIN_TIME = 1.0
+DEFAULT_MIN_REPEAT = 5
+SOLVER_MIN_TIME = 3.0
+SOLVER_MIN_REPEAT = 30
+
+# Rodadas em que as latências são divididas (a comparação usa a melhor mediana)
+ROUNDS = 5
+
+# Tempo total de medição da carga de calibração por benchmark (s)
+_CALIBRATION_TIME = 0.5
+
+# Folga absoluta no pico de memória (evita alarmes por poucos bytes)
+_MEMORY_SLACK = 64 * 1024
+
+# Condição de referência (palha de cana, experimental_data.csv)
+REFERENCE_CONDITION = {
+    "temperature": 195.0,
+    "solid_loading": 100.0,
+    "cellulose_fraction": 0.348,
+    "hemicellulose_fraction": 0.230,
+    "time_final": 40.0,
+}
+
+# =============================================================================
+# REGISTRO DOS BENCHMARKS
+# =============================================================================
+
+# Nome → (função de preparo, itens por chamada, tempo mínimo, repetições
+# mínimas). A função de preparo roda fora da medição e retorna a chamada a
+# ser cronometrada.
+BENCHMARKS = {}
+
+# Diretórios temporários do benchmark em execução (removidos após a medição)
+_SCRATCH_DIRS = []
+
+def benchmark(name, items=1, solver=False):
+    """Registra uma função de preparo como benchmark (solver: mede por mais tempo)."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, items, *((SOLVER_MIN_TIME, SOLVER_MIN_REPEAT) if solver
+                                            else (DEFAULT_MIN_TIME, DEFAULT_MIN_REPEAT)))
+        return setup
+    return register
+
+def _scratch_directory(prefix):
+    """Diretório temporário removido ao fim da medição do benchmark."""
+    scratch = tempfile.TemporaryDirectory(prefix=prefix)
+    _SCRATCH_DIRS.append(scratch)
+    return scratch.name
+
+def _sweep_conditions(n, seed=0):
+    """Condições aleatórias dentro da faixa válida do modelo hidrotérmico."""
+    rng = np.random.default_rng(seed)
+    return {
+        "temperature": rng.uniform(180, 210, n),
+        "solid_loading": rng.uniform(50, 200, n),
+        "cellulose_fraction": rng.uniform(0.3, 0.45, n),
+        "hemicellulose_fraction": rng.uniform(0.2, 0.3, n),
+        "time_final": rng.uniform(1, 120, n),
+    }
+
+@benchmark("hydrothermal_single")
+def _hydrothermal_single():
+    return lambda: simulate_hydrothermal_degradation(**REFERENCE_CONDITION)
+
+@benchmark("hydrothermal_single_odeint", solver=True)
+def _hydrothermal_single_odeint():
+    return lambda: simulate_hydrothermal_degradation(**REFERENCE_CONDITION, method="odeint")
+
+@benchmark("hydrothermal_sweep_loop_100", items=100)
+def _hydrothermal_sweep_loop():
+    conditions = _sweep_conditions(100)
+    rows = [dict(zip(conditions, values)) for values in zip(*conditions.values())]
+    return lambda: [simulate_hydrothermal_degradation(**row) for row in rows]
+
+@benchmark("hydrothermal_sweep_batch_1k", items=1_000)
+def _hydrothermal_sweep_batch():
+    conditions = _sweep_conditions(1_000)
+    return lambda: simulate_hydrothermal_batch(**conditions)
+
+@benchmark("hydrothermal_sweep_final_state_10k", items=10_000)
+def _hydrothermal_sweep_final_state():
+    conditions = _sweep_conditions(10_000)
+    return lambda: simulate_hydrothermal_batch(**conditions, n_points=2)
+
+@benchmark("hydrothermal_plot_data")
+def _hydrothermal_plot_data():
+    base = simulate_hydrothermal_degradation(**REFERENCE_CONDITION)
+
+    def run():
+        # Resultado novo a cada chamada: as propriedades derivadas são recalculadas
+        result = HydrothermalResult(base.block, base.temperature, base.solid_loading, base.time_final,
+                                    base.initial_cellulose, base.initial_hemicellulose)
+        return create_hydrothermal_plot_data(result)
+    return run
+
+@benchmark("hydrothermal_overlay_40x10")
+def _hydrothermal_overlay():
+    conditions = _sweep_conditions(40)
+    scenarios = [
+        (f"cenário {i}", simulate_hydrothermal_degradation(**dict(zip(conditions, values)), adaptive=True))
+        for i, values in enumerate(zip(*conditions.values()))
+    ]
+    return lambda: scenario_overlay_spec(scenarios, SPECIES, title="Sobreposição")
+
+@benchmark("hydrothermal_surface_query")
+def _hydrothermal_surface_query():
+    # Superfície gerada em um diretório temporário (fora da medição)
+    path = _scratch_directory("response_surface_")
+    build_response_surface(path)
+    surface = ResponseSurface(path)
+    return lambda: surface.result(**REFERENCE_CONDITION)
+
+@benchmark("hydrolysis_single", solver=True)
+def _hydrolysis_single():
+    return lambda: simulate_enzymatic_hydrolysis(0.45, 0.10, 100.0, 10.0, time_final=96.0, n_points=97)
+
+@benchmark("hydrolysis_single_notebook", solver=True)
+def _hydrolysis_single_notebook():
+    """
+    Referência: a integração do notebook Hydrolysis.ipynb (solve_ivp LSODA
+    com RHS escalar, rtol=1e-8), na mesma condição de hydrolysis_single.
+    """
+    p = ANGARITA_2015_PARAMETERS
+    S0, E_T = 100.0, 10.0
+    E_F, E_B = (float(e) for e in enzyme_equilibrium(E_T, S0, p["E_max"], p["k_ad"]))
+
+    def model(t, y):
+        C, G2, G, H, X, S = y
+        S = max(S, 1e-6)
+        R_S = p["alfa"] * S / S0
+        Ebc, Ebh = E_B * C / S, E_B * H / S
+        r1 = p["k_1r"] * Ebc * R_S * C / (1 + G2/p["k_11G2"] + G/p["k_11G"] + X/p["k_11X"])
+        r2 = p["k_2r"] * Ebc * R_S * C / (1 + G2/p["k_21G2"] + G/p["k_21G"] + X/p["k_21X"])
+        r3 = p["k_3r"] * E_F * G2 / (p["k_3M"] * (1 + G/p["k_31G"] + X/p["k_31X"]) + G2)
+        r4 = p["k_4r"] * Ebh * R_S * H / (1 + G2/p["k_41G2"] + G/p["k_41G"] + X/p["k_41X"])
+        return [-r1 - r2, 1.056 * r1 - r3, 1.111 * r2 + 1.053 * r3, -r4, 1.136 * r4, -r1 - r2 - r4]
+
+    y0 = [S0 * 0.45, 0.0, 0.0, S0 * 0.10, 0.0, S0]
+    t = np.linspace(0, 96.0, 97)
+    return lambda: solve_ivp(model, (0, 96.0), y0, t_eval=t, method="LSODA", rtol=1e-8)
+
+@benchmark("hydrolysis_batch_100", items=100, solver=True)
+def _hydrolysis_batch():
+    rng = np.random.default_rng(0)
+    args = (rng.uniform(0.3, 0.6, 100), rng.uniform(0.02, 0.15, 100),
+            rng.uniform(50, 200, 100), rng.uniform(2, 30, 100))
+    return lambda: simulate_hydrolysis_batch(*args, time_final=96.0, n_points=97)
+
+@benchmark("surrogate_forest_batch_100", items=100)
+def _surrogate_forest_batch():
+    # Floresta exportada em um diretório temporário (fora da medição)
+    artifacts = discover_artifacts("random_forest")
+    path = _scratch_directory("forest_")
+    export_forest(artifacts["model"], artifacts["scaler_X"], artifacts["scaler_y"], path=path)
+    forest = ForestModel(path)
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.uniform(0.6, 0.7, 100), rng.uniform(0.07, 0.09, 100), rng.uniform(0.2, 0.3, 100),
+                         rng.uniform(100, 250, 100), rng.uniform(0.05, 1.2, 100), np.linspace(0, 100, 100)])
+    return lambda: forest.predict(X)
+
+@benchmark("fermentation_single", solver=True)
+def _fermentation_single():
+    return lambda: simulate_fermentation(0.5, 40.0, 15.0, time_final=72.0, n_points=73)
+
+@benchmark("fermentation_batch_100", items=100, solver=True)
+def _fermentation_batch():
+    rng = np.random.default_rng(0)
+    args = (rng.uniform(0.1, 2.0, 100), rng.uniform(10, 80, 100), rng.uniform(5, 30, 100))
+    return lambda: simulate_fermentation_batch(*args, time_final=72.0, n_points=73)
+
+@benchmark("pipeline_end_to_end", solver=True)
+def _pipeline_end_to_end():
+    pretreatment = {**REFERENCE_CONDITION, "lignin_fraction": 0.241}
+    hydrolysis = {"solid_loading": 100.0, "enzyme_loading": 10.0, "time_final": 72.0, "n_points": 73}
+    fermentation = {"biomass": 0.5}
+    # Pipeline novo a cada chamada: todas as etapas são resolvidas
+    return lambda: ProcessPipeline().run(pretreatment, hydrolysis, fermentation)
+
+def _pretreatment_rerun(cache, condition):
+    """
+    Reproduz o trabalho de uma nova execução (rerun) da seção de
+    pré-tratamento do app: simulação via cache, métricas formatadas e
+    especificação do gráfico em cache (convertida pelo plotly, quando
+    instalado).
+    """
+    results = cached_hydrothermal_degradation(cache, **condition, adaptive=True)
+    metrics = (
+        f"{results['cellulose_degraded_percent']:.1f}%",
+        f"{results['final_cellulose']:.1f} g/L",
+        f"{results['hemicellulose_degraded_percent']:.1f}%",
+        f"{results['final_hemicellulose']:.1f} g/L",
+    )
+    species = ("cellulose", "hemicellulose")
+    key = hydrothermal_cache_key(**condition, adaptive=True)
+    spec = cache.get_or_compute(("figure", "hydrothermal", False, species, key), lambda: scenario_overlay_spec(
+        [("", results)], species, title=f"Hydrothermal Degradation at {condition['temperature']}°C"
+    ))
+    try:
+        from plotly import io as pio
+    except ImportError:
+        return metrics, spec
+    return metrics, pio.to_json(spec)
+
+@benchmark("streamlit_rerun_cold")
+def _streamlit_rerun_cold():
+    cache = SimulationCache()
+
+    def run():
+        cache.clear()
+        return _pretreatment_rerun(cache, REFERENCE_CONDITION)
+    return run
+
+@benchmark("streamlit_rerun_warm")
+def _streamlit_rerun_warm():
+    cache = SimulationCache()
+    _pretreatment_rerun(cache, REFERENCE_CONDITION)
+    return lambda: _pretreatment_rerun(cache, REFERENCE_CONDITION)
+
+# =============================================================================
+# MEDIÇÃO
+# =============================================================================
+
+def _calibration_workload():
+    """
+    Carga fixa, independente do código do projeto, usada para normalizar as
+    latências: laço em Python com operações NumPy pequenas, como os solvers.
+    """
+    rng = np.random.default_rng(0)
+    A = rng.uniform(size=(200, 6, 6)) + 6 * np.eye(6)
+    b = rng.uniform(size=6)
+
+    def run():
+        total = 0.0
+        for matrix in A:
+            total += float(np.linalg.solve(matrix, b).sum())
+        return total
+    return run
+
+def _timed_calls(run, min_time, min_repeat, max_repeat):
+    """Latências (s) de chamadas repetidas até min_time e min_repeat."""
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < max_repeat and (len(latencies) < min_repeat or time.perf_counter() - start < min_time):
+        t0 = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+def measure(run, items=1, min_time=DEFAULT_MIN_TIME, min_repeat=DEFAULT_MIN_REPEAT, max_repeat=10_000, warmup=2,
+            calibration=None):
+    """
+    Mede latência, vazão e pico de memória de uma chamada.
+
+    A medição é dividida em ROUNDS rodadas. Com calibration, cada rodada
+    começa medindo a carga de calibração, de modo que a latência de cada
+    rodada é comparada com a velocidade da máquina naquele momento.
+
+    Args:
+        run (callable): Chamada sem argumentos a ser medida.
+        items (int): Itens (condições) processados por chamada.
+        min_time (float): Tempo mínimo total de medição (s).
+        min_repeat (int): Número mínimo de repetições.
+        max_repeat (int): Número máximo de repetições.
+        warmup (int): Chamadas descartadas antes da medição.
+        calibration (callable): Carga de calibração (ver _calibration_workload).
+
+    Returns:
+        dict: Percentis de latência (ms), melhor mediana entre as rodadas,
+        vazão (itens/s), pico de memória (bytes) e número de repetições; com
+        calibration, também a mediana da calibração ("calibration_ms") e a
+        mediana das razões latência/calibração das rodadas ("normalized_p50").
+    """
+    for _ in range(warmup):
+        run()
+
+    latencies, round_medians, calibration_medians = [], [], []
+    for _ in range(ROUNDS):
+        if calibration is not None:
+            calibration_medians.append(np.median(_timed_calls(calibration, _CALIBRATION_TIME / ROUNDS, 3, 1_000)))
+        part = _timed_calls(run, min_time / ROUNDS, -(-min_repeat // ROUNDS), -(-max_repeat // ROUNDS))
+        round_medians.append(np.median(part))
+        latencies.extend(part)
+    latencies = np.array(latencies) * 1e3
+
+    # Pico de memória em uma chamada separada (tracemalloc deixa a execução mais lenta)
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    mean = latencies.mean()
+    result = {
+        "p50_ms": float(p50),
+        "best_p50_ms": float(min(round_medians) * 1e3),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "mean_ms": float(mean),
+        "throughput_per_s": float(items / (mean / 1e3)),
+        "peak_memory_bytes": int(peak),
+        "repeat": len(latencies),
+        "items": items,
+    }
+    if calibration is not None:
+        result["calibration_ms"] = float(np.median(calibration_medians) * 1e3)
+        result["normalized_p50"] = float(np.median(np.divide(round_medians, calibration_medians)))
+    return result
+
+def run_benchmarks(names=None, min_time=None):
+    """
+    Executa os benchmarks registrados, com a carga de calibração
+    intercalada nas rodadas de cada um (ver measure).
+
+    Args:
+        names (list): Nomes a executar (padrão: todos).
+        min_time (float): Tempo mínimo de medição por benchmark (s) (padrão:
+            o de cada benchmark).
+
+    Returns:
+        dict: Nome → resultado de measure.
+    """
+    calibration = _calibration_workload()
+    results = {}
+    for name, (setup, items, default_time, min_repeat) in BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        try:
+            results[name] = measure(setup(), items=items, min_time=default_time if min_time is None else min_time,
+                                    min_repeat=min_repeat, calibration=calibration)
+        finally:
+            while _SCRATCH_DIRS:
+                _SCRATCH_DIRS.pop().cleanup()
+    return results
+
+def relative_change(result, base):
+    """
+    Variação relativa da latência em relação à referência.
+
+    Compara a mediana das razões latência/calibração das rodadas, o que
+    cancela a variação de velocidade da máquina; referências antigas, sem
+    esse campo, usam a mediana em milissegundos.
+    """
+    if "normalized_p50" in base and "normalized_p50" in result:
+        return result["normalized_p50"] / base["normalized_p50"] - 1
+    return result["p50_ms"] / base["p50_ms"] - 1
+
+def compare(results, baselines, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara resultados com as referências.
+
+    Um benchmark regride quando a latência (ver relative_change) ou o pico
+    de memória ultrapassam a referência em mais de threshold (fração).
+
+    Returns:
+        list: Mensagens das regressões encontradas.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baselines.get(name)
+        if base is None:
+            continue
+        change = relative_change(result, base)
+        if change > threshold:
+            key = "best_p50_ms" if "normalized_p50" in base else "p50_ms"
+            regressions.append(
+                f"{name}: latência mediana {result[key]:.3f} ms "
+                f"(referência {base[key]:.3f} ms, +{change:.0%}"
+                + (" após normalizar pela calibração)" if key == "best_p50_ms" else ")")
+            )
+        if result["peak_memory_bytes"] > base["peak_memory_bytes"] * (1 + threshold) + _MEMORY_SLACK:
+            regressions.append(
+                f"{name}: pico de memória {result['peak_memory_bytes'] / 1024:.0f} KiB "
+                f"(referência {base['peak_memory_bytes'] / 1024:.0f} KiB)"
+            )
+    return regressions
+
+def environment():
+    """Descrição da máquina em que as referências foram medidas."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def _format_table(results, baselines):
+    lines = [f"{'benchmark':<36}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'itens/s':>12}{'pico KiB':>10}{'vs ref':>9}"]
+    for name, r in results.items():
+        base = baselines.get(name)
+        change = f"{relative_change(r, base):+.0%}" if base else "-"
+        lines.append(
+            f"{name:<36}{r['p50_ms']:>10.3f}{r['p90_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+            f"{r['throughput_per_s']:>12,.0f}{r['peak_memory_bytes'] / 1024:>10.0f}{change:>9}"
+        )
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks das simulações do Ethanol AI.")
+    parser.add_argument("-k", dest="pattern", default=None, help="Executa apenas benchmarks cujo nome contém o texto")
+    parser.add_argument("--update", action="store_true", help="Regrava as referências com os resultados atuais")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Piora relativa tolerada (padrão: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-time", type=float, default=None,
+                        help=f"Tempo mínimo de medição por benchmark (s) (padrão: {DEFAULT_MIN_TIME:g}, "
+                             f"{SOLVER_MIN_TIME:g} nos solvers)")
+    parser.add_argument("--baselines", default=str(BASELINE_PATH), help="Arquivo JSON das referências")
+    parser.add_argument("--json", dest="json_output", default=None, help="Grava os resultados em um arquivo JSON")
+    args = parser.parse_args(argv)
+
+    names = None if args.pattern is None else [n for n in BENCHMARKS if args.pattern in n]
+    results = run_benchmarks(names, min_time=args.min_time)
+
+    baseline_path = Path(args.baselines)
+    stored = json.loads(baseline_path.read_text()) if baseline_path.exists() else {"benchmarks": {}}
+    baselines = stored["benchmarks"]
+    print(_format_table(results, baselines))
+
+    if args.json_output:
+        Path(args.json_output).write_text(json.dumps({"environment": environment(), "benchmarks": results}, indent=2))
+
+    if args.update:
+        stored = {"environment": environment(), "benchmarks": {**baselines, **results}}
+        baseline_path.write_text(json.dumps(stored, indent=2) + "\n")
+        print(f"Referências gravadas em {baseline_path}")
+        return 0
+
+    regressions = compare(results, baselines, args.threshold)
+    if regressions:
+        # Uma regressão só conta se se repetir em uma segunda medição
+        suspects = [name for name in results if compare({name: results[name]}, baselines, args.threshold)]
+        for name, retry in run_benchmarks(suspects, min_time=args.min_time).items():
+            if relative_change(retry, baselines[name]) < relative_change(results[name], baselines[name]):
+                results[name] = retry
+        regressions = compare(results, baselines, args.threshold)
+    if regressions:
+        # Referências de outra máquina ou versão: apenas informativas
+        advisory = stored.get("environment") != environment()
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}"
+              + (" (referências de outro ambiente; apenas aviso)" if advisory else "") + ":", file=sys.stderr)
+        for message in regressions:
+            print(f"  {message}", file=sys.stderr)
+        return 0 if advisory else 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+# MODELO DE HIDRÓLISE ENZIMÁTICA - ANGARITA ET AL. 2015
+# Extraído do notebook BEPE FAPESP/Enzymatic Hydrolysis/Hydrolysis.ipynb
+
+import numpy as np
+
+from Instrumentation import instrumented, record
+from Stiff_Solver import solve_block_system
+
+# =============================================================================
+# PARÂMETROS DO MODELO
+# =============================================================================
+
+# Parâmetros cinéticos (Angarita et al. 2015)
+ANGARITA_2015_PARAMETERS = {
+    "alfa": 1.0,          # Fator de resistência
+    "k_1r": 0.177,        # Taxa de reação r1 (h⁻¹)
+    "k_2r": 8.81,         # Taxa de reação r2 (h⁻¹)
+    "k_3r": 201.0,        # Taxa de reação r3 (h⁻¹)
+    "k_4r": 16.34,        # Taxa de reação r4 (h⁻¹)
+    # Constantes de inibição - Reação 1 (celobiose, glicose, xilose) (g/L)
+    "k_11G2": 0.402,
+    "k_11G": 2.71,
+    "k_11X": 2.15,
+    # Constantes de inibição - Reação 2 (g/L)
+    "k_21G2": 119.6,
+    "k_21G": 4.69,
+    "k_21X": 0.095,
+    # Constantes de Michaelis-Menten - Reação 3 (g/L)
+    "k_3M": 26.6,
+    "k_31G": 11.06,
+    "k_31X": 1.023,
+    # Constantes de inibição - Reação 4 (g/L)
+    "k_41G2": 16.25,
+    "k_41G": 4.0,
+    "k_41X": 154.0,
+    # Parâmetros de adsorção enzimática
+    "k_ad": 7.16,         # Constante de adsorção
+    "E_max": 8.32/1000,   # Capacidade máxima de adsorção (g/L)
+}
+
+# Variáveis de estado: celulose, celobiose, glicose, hemicelulose, xilose, biomassa total
+STATES = ("cellulose", "cellobiose", "glucose", "hemicellulose", "xylose", "solids")
+
+# Matriz estequiométrica (estado × reação r1-r4)
+_STOICHIOMETRY = np.array([
+    [-1.0,   -1.0,   0.0,    0.0],    # C
+    [1.056,  0.0,    -1.0,   0.0],    # G2
+    [0.0,    1.111,  1.053,  0.0],    # G
+    [0.0,    0.0,    0.0,    -1.0],   # H
+    [0.0,    0.0,    0.0,    1.136],  # X
+    [-1.0,   -1.0,   0.0,    -1.0],   # S
+])
+
+# Fatores de conversão para rendimento teórico de glicose a partir de celulose
+GLUCOSE_PER_CELLULOSE = 1.111
+
+# =============================================================================
+# EQUILÍBRIO DE ADSORÇÃO ENZIMÁTICA
+# =============================================================================
+
+def enzyme_equilibrium(E_T, S, E_max, k_ad):
+    """
+    Calcula enzima livre e adsorvida em equilíbrio, em forma fechada.
+
+    O equilíbrio E_T - E_F = S·E_max·k_ad·E_F / (1 + k_ad·E_F) é uma equação
+    do segundo grau em E_F; a raiz positiva é tomada na forma numericamente
+    estável, o que substitui o fsolve do notebook.
+
+    Args:
+        E_T (array): Concentração total de enzima (g/L).
+        S (array): Biomassa total (g/L).
+        E_max (float): Capacidade máxima de adsorção (g/L).
+        k_ad (float): Constante de adsorção.
+
+    Returns:
+        tuple: (E_F, E_B) enzima livre e adsorvida (g/L).
+    """
+    E_T = np.asarray(E_T, dtype=float)
+    S = np.asarray(S, dtype=float)
+
+    # k_ad·E_F² + b·E_F - E_T = 0
+    b = 1 + k_ad * (S * E_max - E_T)
+    sqrt_delta = np.sqrt(b**2 + 4 * k_ad * E_T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        E_F = np.where(b >= 0, 2 * E_T / (b + sqrt_delta), (sqrt_delta - b) / (2 * k_ad))
+    E_F = np.where(E_T > 0, E_F, 0.0)
+    return E_F, E_T - E_F
+
+# =============================================================================
+# SISTEMA DE EQUAÇÕES DIFERENCIAIS
+# =============================================================================
+
+def _rate_coefficients(solid_loading, enzyme_loading, params):
+    """
+    Pré-calcula os coeficientes constantes das taxas para cada condição.
+
+    Como Ebc·R_S = E_B·C/S · alfa·S/S0, a biomassa S se cancela e as taxas
+    heterogêneas ficam a·C²/I; a = k·alfa·E_B/S0.
+
+    Returns:
+        tuple: (a1, a2, a4, b3) com formato (N,) cada, b3 = k_3r·E_F.
+    """
+    E_F, _ = enzyme_equilibrium(enzyme_loading, solid_loading, params["E_max"], params["k_ad"])
+
+    # E_B/S0 diretamente da isoterma (evita divisão por S0 = 0)
+    k_ad = params["k_ad"]
+    bound_per_solid = params["E_max"] * k_ad * E_F / (1 + k_ad * E_F)
+    base = params["alfa"] * bound_per_solid
+    return params["k_1r"] * base, params["k_2r"] * base, params["k_4r"] * base, params["k_3r"] * E_F
+
+def hydrolysis_rates(y, coefficients, params):
+    """
+    Taxas de reação r1-r4, vetorizadas sobre condições.
+
+    Args:
+        y (np.ndarray): Estados com formato (N, 6), na ordem de STATES.
+        coefficients (tuple): Saída de _rate_coefficients.
+        params (dict): Parâmetros do modelo.
+
+    Returns:
+        np.ndarray: Taxas com formato (N, 4).
+    """
+    a1, a2, a4, b3 = coefficients
+    C, G2, G, H, X = y[:, 0], y[:, 1], y[:, 2], y[:, 3], y[:, 4]
+    p = params
+
+    I1 = 1 + G2/p["k_11G2"] + G/p["k_11G"] + X/p["k_11X"]
+    I2 = 1 + G2/p["k_21G2"] + G/p["k_21G"] + X/p["k_21X"]
+    I4 = 1 + G2/p["k_41G2"] + G/p["k_41G"] + X/p["k_41X"]
+    D3 = p["k_3M"] * (1 + G/p["k_31G"] + X/p["k_31X"]) + G2
+
+    return np.stack([
+        a1 * C**2 / I1,
+        a2 * C**2 / I2,
+        b3 * G2 / D3,
+        a4 * H**2 / I4,
+    ], axis=1)
+
+def hydrolysis_rate_jacobian(y, coefficients, params):
+    """
+    Derivadas analíticas das taxas r1-r4 em relação aos estados.
+
+    Args:
+        y (np.ndarray): Estados com formato (N, 6).
+        coefficients (tuple): Saída de _rate_coefficients.
+        params (dict): Parâmetros do modelo.
+
+    Returns:
+        np.ndarray: Derivadas com formato (N, 4, 6).
+    """
+    a1, a2, a4, b3 = coefficients
+    C, G2, G, H, X = y[:, 0], y[:, 1], y[:, 2], y[:, 3], y[:, 4]
+    p = params
+    dr = np.zeros((y.shape[0], 4, 6))
+
+    # r1, r2 e r4: a·Z²/I, com I linear em G2, G e X
+    for row, a, Z, z_idx, suffix in ((0, a1, C, 0, "1"), (1, a2, C, 0, "2"), (3, a4, H, 3, "4")):
+        I = 1 + G2/p[f"k_{suffix}1G2"] + G/p[f"k_{suffix}1G"] + X/p[f"k_{suffix}1X"]
+        r_over_I = a * Z**2 / I**2
+        dr[:, row, z_idx] = 2 * a * Z / I
+        dr[:, row, 1] = -r_over_I / p[f"k_{suffix}1G2"]
+        dr[:, row, 2] = -r_over_I / p[f"k_{suffix}1G"]
+        dr[:, row, 4] = -r_over_I / p[f"k_{suffix}1X"]
+
+    # r3: Michaelis-Menten com inibição competitiva
+    D3 = p["k_3M"] * (1 + G/p["k_31G"] + X/p["k_31X"]) + G2
+    r3_over_D = b3 * G2 / D3**2
+    dr[:, 2, 1] = b3 * (D3 - G2) / D3**2
+    dr[:, 2, 2] = -r3_over_D * p["k_3M"] / p["k_31G"]
+    dr[:, 2, 4] = -r3_over_D * p["k_3M"] / p["k_31X"]
+
+    return dr
+
+def _condition_system(coefficients, params):
+    """
+    RHS escalar e Jacobiano de cada condição, para solve_each_system.
+
+    Mesmas taxas de hydrolysis_rates, com floats do Python: em lotes
+    pequenos o custo de cada avaliação vetorizada domina a integração.
+
+    Returns:
+        callable: i → (rhs(y, t), jac(y, t)) da condição i.
+    """
+    p = params
+    i11G2, i11G, i11X = 1 / p["k_11G2"], 1 / p["k_11G"], 1 / p["k_11X"]
+    i21G2, i21G, i21X = 1 / p["k_21G2"], 1 / p["k_21G"], 1 / p["k_21X"]
+    i41G2, i41G, i41X = 1 / p["k_41G2"], 1 / p["k_41G"], 1 / p["k_41X"]
+    k3M, i31G, i31X = p["k_3M"], 1 / p["k_31G"], 1 / p["k_31X"]
+    # Coeficientes estequiométricos não nulos
+    s21, s32, s33, s54 = _STOICHIOMETRY[1, 0], _STOICHIOMETRY[2, 1], _STOICHIOMETRY[2, 2], _STOICHIOMETRY[4, 3]
+
+    def system(i):
+        a1, a2, a4, b3 = (float(c[i]) for c in coefficients)
+        condition = tuple(np.asarray(c[i:i + 1]) for c in coefficients)
+
+        def rhs(y, t):
+            C, G2, G, H, X, _ = y.tolist()
+            r1 = a1 * C * C / (1 + G2 * i11G2 + G * i11G + X * i11X)
+            r2 = a2 * C * C / (1 + G2 * i21G2 + G * i21G + X * i21X)
+            r3 = b3 * G2 / (k3M * (1 + G * i31G + X * i31X) + G2)
+            r4 = a4 * H * H / (1 + G2 * i41G2 + G * i41G + X * i41X)
+            return [-r1 - r2, s21 * r1 - r3, s32 * r2 + s33 * r3, -r4, s54 * r4, -r1 - r2 - r4]
+
+        def jac(y, t):
+            return _STOICHIOMETRY @ hydrolysis_rate_jacobian(y[None], condition, params)[0]
+
+        return rhs, jac
+    return system
+
+# =============================================================================
+# SIMULAÇÃO
+# =============================================================================
+
+def _prepare_conditions(cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading, params):
+    """Parâmetros completos, cargas (N,), coeficientes das taxas e estados iniciais (N, 6)."""
+    params = ANGARITA_2015_PARAMETERS if params is None else {**ANGARITA_2015_PARAMETERS, **params}
+    cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading = (
+        np.atleast_1d(a).astype(float) for a in np.broadcast_arrays(
+            cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading
+        )
+    )
+    n = solid_loading.shape[0]
+    record(n_conditions=n)
+
+    coefficients = _rate_coefficients(solid_loading, enzyme_loading, params)
+
+    # Condições iniciais
+    y0 = np.zeros((n, len(STATES)))
+    y0[:, 0] = solid_loading * cellulose_fraction
+    y0[:, 3] = solid_loading * hemicellulose_fraction
+    y0[:, 5] = solid_loading
+    return params, solid_loading, enzyme_loading, coefficients, y0
+
+@instrumented("hydrolysis")
+def simulate_hydrolysis_batch(cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading,
+                              time_final=96.0, n_points=97, params=None, method="auto", rtol=1e-6, atol=1e-9):
+    """
+    Simula a hidrólise enzimática para N condições em uma única integração.
+
+    As condições são empilhadas em um sistema único com Jacobiano analítico
+    bloco-diagonal esparso, resolvido por um integrador implícito (stiff).
+    Com method="auto", lotes pequenos (até SMALL_BATCH_MAX) são integrados
+    condição a condição pelo LSODA do odeint, como no notebook.
+
+    Args:
+        cellulose_fraction (array): Frações mássicas de celulose (0-1).
+        hemicellulose_fraction (array): Frações mássicas de hemicelulose (0-1).
+        solid_loading (array): Cargas de sólidos (g/L).
+        enzyme_loading (array): Cargas de enzima (g/L).
+        time_final (float): Tempo final da simulação (h).
+        n_points (int): Número de pontos no tempo.
+        params (dict): Parâmetros do modelo (padrão: ANGARITA_2015_PARAMETERS).
+        method (str): "auto" ou integrador do solve_ivp ("BDF", "Radau" ou
+            "LSODA").
+        rtol (float): Tolerância relativa.
+        atol (float): Tolerância absoluta.
+
+    Returns:
+        dict: "time" (T,), "concentrations" (N, T, 6) na ordem de STATES,
+        enzimas em equilíbrio e conversões/rendimentos finais (N,).
+    """
+    if time_final <= 0:
+        raise ValueError("Tempo de reação deve ser maior que zero")
+
+    params, solid_loading, enzyme_loading, coefficients, y0 = _prepare_conditions(
+        cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading, params
+    )
+
+    def rhs(t, y):
+        return hydrolysis_rates(y, coefficients, params) @ _STOICHIOMETRY.T
+
+    def jac(t, y):
+        return _STOICHIOMETRY @ hydrolysis_rate_jacobian(y, coefficients, params)
+
+    t = np.linspace(0, time_final, n_points)
+    concentrations, sol = solve_block_system(rhs, jac, y0, t, method=method, rtol=rtol, atol=atol,
+                                             condition_system=_condition_system(coefficients, params))
+    E_F, E_B = enzyme_equilibrium(enzyme_loading, solid_loading, params["E_max"], params["k_ad"])
+
+    C0, H0 = y0[:, 0], y0[:, 3]
+    final = concentrations[:, -1, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cellulose_conversion = np.where(C0 > 0, (1 - final[:, 0]/C0) * 100, 0.0)
+        hemicellulose_conversion = np.where(H0 > 0, (1 - final[:, 3]/H0) * 100, 0.0)
+        glucose_yield = np.where(C0 > 0, final[:, 2] / (GLUCOSE_PER_CELLULOSE * C0) * 100, 0.0)
+
+    return {
+        "time": sol.t,
+        "concentrations": concentrations,
+        "states": STATES,
+        "free_enzyme": E_F,
+        "bound_enzyme": E_B,
+        "cellulose_conversion_percent": cellulose_conversion,
+        "hemicellulose_conversion_percent": hemicellulose_conversion,
+        "glucose_yield_percent": glucose_yield,
+        "n_rhs_evaluations": sol.nfev,
+        "n_jacobian_evaluations": sol.njev,
+    }
+
+def simulate_enzymatic_hydrolysis(cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading,
+                                  time_final=96.0, n_points=97, params=None):
+    """
+    Simula a hidrólise enzimática para uma condição.
+
+    Args:
+        cellulose_fraction (float): Fração mássica de celulose (0-1).
+        hemicellulose_fraction (float): Fração mássica de hemicelulose (0-1).
+        solid_loading (float): Carga de sólidos (g/L).
+        enzyme_loading (float): Carga de enzima (g/L).
+        time_final (float): Tempo final da simulação (h).
+        n_points (int): Número de pontos no tempo.
+        params (dict): Parâmetros do modelo (padrão: ANGARITA_2015_PARAMETERS).
+
+    Returns:
+        dict: Tempos, concentrações de cada estado e rendimentos finais.
+    """
+    batch = simulate_hydrolysis_batch(
+        cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading,
+        time_final=time_final, n_points=n_points, params=params
+    )
+    results = {"time": batch["time"]}
+    results.update({name: batch["concentrations"][0, :, i] for i, name in enumerate(STATES)})
+    results.update({
+        "free_enzyme": batch["free_enzyme"][0],
+        "bound_enzyme": batch["bound_enzyme"][0],
+        "cellulose_conversion_percent": batch["cellulose_conversion_percent"][0],
+        "hemicellulose_conversion_percent": batch["hemicellulose_conversion_percent"][0],
+        "glucose_yield_percent": batch["glucose_yield_percent"][0],
+        "time_final": time_final,
+    })
+    return results
+
+@instrumented("hydrolysis_endpoints")
+def simulate_hydrolysis_endpoints(cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading, time,
+                                  params=None, method="BDF", rtol=1e-6, atol=1e-9):
+    """
+    Estados da hidrólise de N condições, cada uma no seu próprio tempo.
+
+    O sistema é autônomo: com t = τ·time, cada condição integra
+    dy/dτ = time·f(y) para τ de 0 a 1. Todas chegam ao seu tempo no mesmo
+    instante τ = 1 de uma única integração, sem grade de tempo comum nem
+    interpolação (usado na geração de dados sintéticos).
+
+    Args:
+        cellulose_fraction (array): Frações mássicas de celulose (0-1).
+        hemicellulose_fraction (array): Frações mássicas de hemicelulose (0-1).
+        solid_loading (array): Cargas de sólidos (g/L).
+        enzyme_loading (array): Cargas de enzima (g/L).
+        time (array): Tempo de reação de cada condição (h, ≥ 0).
+        params (dict): Parâmetros do modelo (padrão: ANGARITA_2015_PARAMETERS).
+        method (str): Integrador do solve_ivp ("BDF", "Radau" ou "LSODA").
+        rtol (float): Tolerância relativa.
+        atol (float): Tolerância absoluta.
+
+    Returns:
+        np.ndarray: Estados com formato (N, 6), na ordem de STATES.
+    """
+    cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading, time = np.broadcast_arrays(
+        cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading, time
+    )
+    time = np.atleast_1d(time).astype(float)
+    if np.any(time < 0):
+        raise ValueError("Tempo de reação não pode ser negativo")
+
+    params, solid_loading, enzyme_loading, coefficients, y0 = _prepare_conditions(
+        cellulose_fraction, hemicellulose_fraction, solid_loading, enzyme_loading, params
+    )
+    scale = time[:, None]
+
+    def rhs(tau, y):
+        return scale * (hydrolysis_rates(y, coefficients, params) @ _STOICHIOMETRY.T)
+
+    def jac(tau, y):
+        return scale[:, :, None] * (_STOICHIOMETRY @ hydrolysis_rate_jacobian(y, coefficients, params))
+
+    concentrations, _ = solve_block_system(rhs, jac, y0, np.array([0.0, 1.0]), method=method, rtol=rtol, atol=atol)
+    return concentrations[:, -1, :]
@@ -0,0 +1,458 @@
+# BASE INDEXADA DOS DADOS EXPERIMENTAIS
+# Lê uma única vez as tabelas experimentais do repositório (CSV e, com
+# openpyxl instalado, XLSX), normaliza os nomes das colunas (snake_case,
+# frações em vez de porcentagens) e grava cada tabela como um array .npy
+# colunar, mapeado em memória, com um índice JSON das condições. Consultas
+# como "pontos medidos nesta condição" são uma busca em dict, sem ler nem
+# percorrer as tabelas; a base só é refeita quando alguma fonte muda.
+#
+# Uso:
+#   python Experimental_Data.py                      # (re)gera experimental_store/
+#   python Experimental_Data.py --match pretreatment "Sugarcane Straw" temperature=195 solid_loading=100
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Raiz do repositório (caminhos das fontes são relativos a ela)
+DATA_DIR = Path(__file__).resolve().parent
+
+# Diretório padrão da base (ao lado do app)
+DEFAULT_STORE_PATH = DATA_DIR / "experimental_store"
+
+# Versão do formato dos arquivos
+STORE_VERSION = 1
+
+# Resolução de cada condição no índice: valores que arredondam para o mesmo
+# múltiplo são a mesma condição (a precisão das entradas do app)
+CONDITION_RESOLUTION = {
+    "temperature": 1.0,
+    "solid_loading": 1.0,
+    "enzyme_loading": 0.01,
+    "ethanol_percent": 1.0,
+    "presaccharification_time": 0.1,
+}
+
+# Tabelas ingeridas. "columns" associa o cabeçalho da fonte (sem espaços nas
+# pontas) a (nome, unidade, fator); "time" é a coluna das séries no tempo
+# (None em tabelas de pontos finais) e "conditions", as colunas indexadas.
+# Processed Data.xlsx repete Experimental Data.csv e não é ingerida; as
+# demais planilhas (Pretreatment data.xlsx, OriginalSpreadsheet.xlsx,
+# Hydrothermal2.xlsx) são anotações de laboratório sem tabela regular.
+DATASETS = {
+    "hydrothermal_straw": {
+        "source": "BEPE FAPESP/Pretreatment/experimental_data.csv",
+        "stage": "pretreatment",
+        "process": "Hydrothermal",
+        "biomass": "Sugarcane Straw",
+        "time": "time",
+        "conditions": ("temperature", "solid_loading"),
+        # As composições já são frações, apesar do rótulo (%)
+        "columns": {
+            "Temperature [°C]": ("temperature", "°C", 1.0),
+            "Solid Loading [g/L]": ("solid_loading", "g/L", 1.0),
+            "Cellulose Composition (%)": ("cellulose_fraction", "-", 1.0),
+            "Hemicellulose Composition (%)": ("hemicellulose_fraction", "-", 1.0),
+            "Lignin Composition (%)": ("lignin_fraction", "-", 1.0),
+            "Extractives Composition (%)": ("extractives_fraction", "-", 1.0),
+            "Ashes Composition (%)": ("ashes_fraction", "-", 1.0),
+            "Time [min]": ("time", "min", 1.0),
+            # Nomes das espécies de Hydrothermal_Pretreatment.SPECIES quando existem
+            "Glucose + Celobiose [g/L]": ("glucose", "g/L", 1.0),
+            "Formic acid [g/L]": ("formic_acid", "g/L", 1.0),
+            "HMF [g/L]": ("hmf", "g/L", 1.0),
+            "Xylose [g/L]": ("xylose", "g/L", 1.0),
+            "Arabinose [g/L]": ("arabinose", "g/L", 1.0),
+            "Acetic acid [g/L]": ("acetic_acid", "g/L", 1.0),
+            "Glucuronic acid [g/L]": ("glucuronic_acid", "g/L", 1.0),
+            "Furfural [g/L]": ("furfural", "g/L", 1.0),
+            "Glucooligomers [g/L]": ("gos", "g/L", 1.0),
+            "Xylooligomers [g/L]": ("xos", "g/L", 1.0),
+            "Arabinooligomers [g/L]": ("arabinooligomers", "g/L", 1.0),
+        },
+    },
+    "hydrolysis_straw": {
+        "source": "BEPE FAPESP/Enzymatic Hydrolysis/Experimental Data.csv",
+        "stage": "hydrolysis",
+        "process": "Enzymatic",
+        "biomass": "Sugarcane Straw",
+        "time": "time",
+        "conditions": ("solid_loading", "enzyme_loading"),
+        "columns": {
+            "Cellulose": ("cellulose_fraction", "-", 1.0),
+            "Hemicellulose": ("hemicellulose_fraction", "-", 1.0),
+            "Lignin": ("lignin_fraction", "-", 1.0),
+            "Solids Loading [g/L]": ("solid_loading", "g/L", 1.0),
+            "Enzyme Loading [g/L]": ("enzyme_loading", "g/L", 1.0),
+            "Time [h]": ("time", "h", 1.0),
+            "Glucose Concentration [g/L]": ("glucose", "g/L", 1.0),
+            "Xylose Concentration [g/L]": ("xylose", "g/L", 1.0),
+            "Cellobiose Concentration [g/L]": ("cellobiose", "g/L", 1.0),
+        },
+    },
+    "organosolv_bagasse": {
+        "source": "Models/Bagaço da Cana-de-Açúcar/Pré-Tratamento/Organosolv1/Organosolv1.csv",
+        "stage": "pretreatment",
+        "process": "Organosolv",
+        "biomass": "Sugarcane Bagasse",
+        "time": "time",
+        "conditions": ("temperature", "ethanol_percent"),
+        "columns": {
+            "Experimento": ("experiment", "-", 1.0),
+            "Temperatura (°C)": ("temperature", "°C", 1.0),
+            "Tempo (min)": ("time", "min", 1.0),
+            "Porc Etanol (%)": ("ethanol_percent", "%", 1.0),
+            "Celulose": ("cellulose_fraction", "-", 0.01),
+            "Hemicelulose": ("hemicellulose_fraction", "-", 0.01),
+            "Lignina Total": ("lignin_fraction", "-", 0.01),
+            "Cinzas": ("ashes_fraction", "-", 0.01),
+            "Rendimento (%)": ("solid_yield_fraction", "-", 0.01),
+        },
+    },
+    "ssf_hydrothermal_straw": {
+        "source": "Models/Palha da Cana-de-Açúcar/Pré-Tratamento/Hidrotérmico/Hydrothermal1/Hydrothermal1.xlsx",
+        "stage": "saccharification_fermentation",
+        "process": "Hydrothermal",
+        "biomass": "Sugarcane Straw",
+        "time": None,
+        "conditions": ("enzyme_loading", "solid_loading", "presaccharification_time"),
+        # A planilha não informa as unidades das condições
+        "columns": {
+            "Concentração de enzimas": ("enzyme_loading", None, 1.0),
+            "Concentração de biomassa": ("solid_loading", None, 1.0),
+            "Tempo de pré-sacarificação": ("presaccharification_time", None, 1.0),
+            "Eficiência de hidrólise (%)": ("hydrolysis_efficiency", "-", 0.01),
+            "Eficiência de fermentação (%)": ("fermentation_efficiency", "-", 0.01),
+            "Eficiência global em etanol (%)": ("ethanol_efficiency", "-", 0.01),
+            "Produtividade global em etanol (g/(L.h))": ("ethanol_productivity", "g/(L.h)", 1.0),
+        },
+    },
+}
+
+# Leitores por extensão e o módulo opcional de que cada um depende
+_READER_MODULES = {".csv": None, ".xlsx": "openpyxl"}
+
+# =============================================================================
+# INGESTÃO
+# =============================================================================
+
+def _reader_available(path):
+    """Indica se o leitor da extensão do arquivo pode ser usado."""
+    module = _READER_MODULES.get(Path(path).suffix.lower())
+    return module is None or importlib.util.find_spec(module) is not None
+
+def _digest(path):
+    """Hash do conteúdo de uma fonte."""
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=16).hexdigest()
+
+def quantize(name, value):
+    """Chave inteira de um valor de condição na resolução do índice."""
+    # O arredondamento prévio evita que 0.175 / 0.01 = 17.4999... caia no múltiplo de baixo
+    return math.floor(round(float(value) / CONDITION_RESOLUTION[name], 6) + 0.5)
+
+def read_dataset(spec, data_dir=DATA_DIR):
+    """
+    Lê uma tabela de DATASETS com os nomes e escalas normalizados.
+
+    Linhas sem alguma condição (ou sem tempo) são descartadas e as demais
+    ordenadas por condição e tempo.
+
+    Args:
+        spec (dict): Entrada de DATASETS.
+        data_dir (Path): Raiz dos caminhos das fontes.
+
+    Returns:
+        pd.DataFrame: Colunas float64 com os nomes normalizados.
+    """
+    import pandas as pd
+
+    path = Path(data_dir) / spec["source"]
+    if path.suffix.lower() == ".xlsx":
+        data = pd.read_excel(path, sheet_name=spec.get("sheet", 0))
+    else:
+        data = pd.read_csv(path, skipinitialspace=True)
+    data.columns = [str(c).strip() for c in data.columns]
+
+    missing = [c for c in spec["columns"] if c not in data.columns]
+    if missing:
+        raise ValueError(f"Colunas ausentes em {spec['source']}: {missing}")
+    table = pd.DataFrame({
+        name: pd.to_numeric(data[column], errors="coerce").astype(float) * scale
+        for column, (name, _, scale) in spec["columns"].items()
+    })
+    keys = list(spec["conditions"]) + ([spec["time"]] if spec["time"] else [])
+    table = table.dropna(subset=keys)
+    return table.sort_values(keys, kind="stable").reset_index(drop=True)
+
+def _condition_groups(table, conditions):
+    """Faixas [início, fim) de linhas de cada condição (linhas já ordenadas)."""
+    quantized = np.array([[quantize(name, v) for v in table[name]] for name in conditions]).T
+    groups = []
+    start = 0
+    for i in range(1, len(table) + 1):
+        if i == len(table) or (quantized[i] != quantized[start]).any():
+            groups.append({
+                "key": quantized[start].tolist(),
+                "values": [float(table[name].iloc[start]) for name in conditions],
+                "rows": [start, i],
+            })
+            start = i
+    return groups
+
+def _save_array(path, array):
+    """Grava um .npy por substituição atômica (leitores com mmap mantêm o arquivo antigo)."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+def build_store(path=DEFAULT_STORE_PATH, data_dir=DATA_DIR, datasets=None):
+    """
+    Lê as tabelas experimentais e grava a base colunar.
+
+    Fontes XLSX exigem openpyxl; sem ele, a tabela é pulada e o motivo fica
+    registrado no índice (a base é refeita quando o leitor passa a existir).
+
+    Args:
+        path (str): Diretório de saída.
+        data_dir (Path): Raiz dos caminhos das fontes.
+        datasets (dict): Tabelas a ingerir (padrão: DATASETS).
+
+    Returns:
+        dict: Metadados gravados em index.json.
+    """
+    datasets = DATASETS if datasets is None else datasets
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+
+    index = {
+        "version": STORE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "data_dir": str(Path(data_dir).resolve()),
+        "sources": {},
+        "skipped": {},
+        "datasets": {},
+    }
+    for name, spec in datasets.items():
+        source = Path(data_dir) / spec["source"]
+        if not source.exists():
+            index["skipped"][name] = {"source": spec["source"], "reason": "arquivo não encontrado"}
+            continue
+        index["sources"][name] = {"path": spec["source"], "digest": _digest(source)}
+        if not _reader_available(source):
+            index["skipped"][name] = {"source": spec["source"],
+                                      "reason": f"leitor indisponível ({_READER_MODULES[source.suffix.lower()]})"}
+            continue
+        try:
+            table = read_dataset(spec, data_dir)
+        except (OSError, ValueError) as e:
+            index["skipped"][name] = {"source": spec["source"], "reason": str(e)}
+            continue
+
+        columns = list(table.columns)
+        # Colunar: cada coluna é uma linha contígua do array
+        _save_array(path / f"{name}.npy", np.ascontiguousarray(table.to_numpy(dtype=np.float64).T))
+        index["datasets"][name] = {
+            "file": f"{name}.npy",
+            "stage": spec["stage"],
+            "process": spec["process"],
+            "biomass": spec["biomass"],
+            "time": spec["time"],
+            "conditions": list(spec["conditions"]),
+            "columns": columns,
+            "units": {n: unit for n, unit, _ in spec["columns"].values()},
+            "n_rows": len(table),
+            "groups": _condition_groups(table, spec["conditions"]),
+        }
+    index["build_seconds"] = round(time.perf_counter() - start, 3)
+
+    # O índice é gravado por último: sua presença marca uma base completa
+    tmp = path / "index.json.tmp"
+    tmp.write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path / "index.json")
+    return index
+
+# =============================================================================
+# CONSULTA
+# =============================================================================
+
+class ExperimentalData:
+    """
+    Base gravada por build_store.
+
+    Os arrays são abertos com mmap_mode="r" e o índice das condições fica em
+    um dict por (etapa, biomassa), de modo que cada consulta custa uma busca
+    por tabela da etapa, independentemente do número de linhas.
+
+    Args:
+        path (str): Diretório com index.json e os arrays .npy.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.index = json.loads((self.path / "index.json").read_text(encoding="utf-8"))
+        if self.index["version"] != STORE_VERSION:
+            raise ValueError(f"Versão da base não suportada: {self.index['version']}")
+
+        self.arrays = {}
+        self._lookup = {}
+        for name, meta in self.index["datasets"].items():
+            self.arrays[name] = np.load(self.path / meta["file"], mmap_mode="r")
+            groups = {tuple(group["key"]): group for group in meta["groups"]}
+            self._lookup.setdefault((meta["stage"], meta["biomass"]), []).append((name, meta, groups))
+
+    def __repr__(self):
+        return f"ExperimentalData(path='{self.path}', datasets={list(self.index['datasets'])})"
+
+    @classmethod
+    def load(cls, path=DEFAULT_STORE_PATH):
+        """Abre a base, ou None se ela não existir ou estiver corrompida."""
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def open(cls, path=DEFAULT_STORE_PATH, data_dir=DATA_DIR):
+        """Abre a base, gerando-a antes se ela não existir ou estiver desatualizada."""
+        store = cls.load(path)
+        if store is None or store.is_stale(data_dir):
+            build_store(path, data_dir)
+            store = cls(path)
+        return store
+
+    def is_stale(self, data_dir=DATA_DIR):
+        """
+        Indica se alguma fonte mudou desde a ingestão.
+
+        Compara o hash de cada fonte com o registrado e também acusa tabelas
+        puladas por falta de leitor quando ele passa a estar disponível.
+        """
+        if Path(self.index["data_dir"]) != Path(data_dir).resolve():
+            return True
+        for name, spec in DATASETS.items():
+            source = Path(data_dir) / spec["source"]
+            recorded = self.index["sources"].get(name)
+            if recorded is None:
+                if source.exists():
+                    return True
+                continue
+            if not source.exists() or _digest(source) != recorded["digest"]:
+                return True
+            if name in self.index["skipped"] and _reader_available(source) and name not in self.index["datasets"]:
+                reason = self.index["skipped"][name]["reason"]
+                if reason.startswith("leitor indisponível"):
+                    return True
+        return False
+
+    def column(self, dataset, name):
+        """Coluna completa de uma tabela (visão do array mapeado)."""
+        return self.arrays[dataset][self.index["datasets"][dataset]["columns"].index(name)]
+
+    def table(self, dataset):
+        """Tabela completa como DataFrame (cópia)."""
+        import pandas as pd
+        meta = self.index["datasets"][dataset]
+        return pd.DataFrame(np.array(self.arrays[dataset]).T, columns=meta["columns"])
+
+    def matching(self, stage, biomass, **conditions):
+        """
+        Pontos medidos em uma condição.
+
+        Cada tabela da etapa e biomassa cujas condições indexadas estão todas
+        em conditions é consultada com uma busca em dict; condições extras
+        são ignoradas.
+
+        Args:
+            stage (str): Etapa ("pretreatment", "hydrolysis"...).
+            biomass (str): Biomassa ("Sugarcane Straw"...).
+            **conditions: Valores das condições (ex.: temperature=195,
+                solid_loading=100), comparados na resolução de
+                CONDITION_RESOLUTION.
+
+        Returns:
+            list: Um dict por tabela com pontos na condição, com "dataset",
+            "process", "condition" (valores medidos), "units", "time" (nome
+            da coluna de tempo ou None) e "values" (coluna -> array).
+        """
+        matches = []
+        for name, meta, groups in self._lookup.get((stage, biomass), ()):
+            if not all(c in conditions for c in meta["conditions"]):
+                continue
+            group = groups.get(tuple(quantize(c, conditions[c]) for c in meta["conditions"]))
+            if group is None:
+                continue
+            start, stop = group["rows"]
+            block = self.arrays[name][:, start:stop]
+            matches.append({
+                "dataset": name,
+                "process": meta["process"],
+                "condition": dict(zip(meta["conditions"], group["values"])),
+                "units": meta["units"],
+                "time": meta["time"],
+                "values": dict(zip(meta["columns"], block)),
+            })
+        return matches
+
+    def conditions(self, stage, biomass):
+        """Condições medidas de uma etapa e biomassa, por tabela."""
+        return {
+            name: [dict(zip(meta["conditions"], group["values"])) for group in groups.values()]
+            for name, meta, groups in self._lookup.get((stage, biomass), ())
+        }
+
+def _parse_condition(text):
+    name, _, value = text.partition("=")
+    if name not in CONDITION_RESOLUTION or not value:
+        raise argparse.ArgumentTypeError(f"Condição inválida: {text} (use nome=valor)")
+    return name, float(value)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera e consulta a base indexada dos dados experimentais.")
+    parser.add_argument("--output", default=str(DEFAULT_STORE_PATH), help="Diretório da base")
+    parser.add_argument("--force", action="store_true", help="Refaz a base mesmo sem mudanças nas fontes")
+    parser.add_argument("--match", nargs="+", metavar="ARG",
+                        help="Etapa, biomassa e condições nome=valor a consultar")
+    args = parser.parse_args(argv)
+
+    if args.force:
+        build_store(args.output)
+    store = ExperimentalData.open(args.output)
+
+    if args.match:
+        if len(args.match) < 2:
+            parser.error("--match requer etapa e biomassa")
+        try:
+            conditions = dict(_parse_condition(text) for text in args.match[2:])
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        matches = store.matching(args.match[0], args.match[1], **conditions)
+        if not matches:
+            print("Nenhum ponto medido nessa condição")
+            return 1
+        for match in matches:
+            values = match["values"]
+            print(f"{match['dataset']} ({match['process']}): {match['condition']}, "
+                  f"{len(next(iter(values.values())))} pontos")
+            for name, column in values.items():
+                print(f"  {name:>26}: {np.array2string(np.asarray(column), precision=3)}")
+        return 0
+
+    for name, meta in store.index["datasets"].items():
+        print(f"{name}: {meta['n_rows']} linhas, {len(meta['groups'])} condições "
+              f"({meta['stage']}, {meta['biomass']})")
+    for name, skipped in store.index["skipped"].items():
+        print(f"{name}: pulada ({skipped['reason']})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# MODELO DE FERMENTAÇÃO ALCOÓLICA (GLICOSE + XILOSE)
+# Extraído do notebook BEPE FAPESP/Fermentation/Fermentation Model.ipynb
+
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from Instrumentation import instrumented, record
+from Stiff_Solver import solve_block_system
+
+# Variáveis de estado: células, glicose, xilose, etanol (g/L)
+STATES = ("biomass", "glucose", "xylose", "ethanol")
+
+# =============================================================================
+# PARÂMETROS DO MODELO
+# =============================================================================
+
+# Faixas válidas dos parâmetros: (mínimo, mínimo incluído?). Velocidades,
+# constantes de Monod e os rendimentos que dividem as taxas devem ser
+# positivos; a inibição e os rendimentos em etanol podem ser nulos.
+PARAMETER_BOUNDS = {
+    "mimax_Glu": (0.0, False),
+    "k_Glu": (0.0, False),
+    "mimax_Xyl": (0.0, False),
+    "k_Xyl": (0.0, False),
+    "k_i": (0.0, True),
+    "Y_X_Glu": (0.0, False),
+    "Y_X_Xyl": (0.0, False),
+    "Y_P_Glu": (0.0, True),
+    "Y_P_Xyl": (0.0, True),
+    "Y_P_X": (0.0, False),
+}
+
+@dataclass(frozen=True)
+class FermentationParameters:
+    """
+    Conjunto de parâmetros cinéticos da fermentação.
+
+    Cada campo pode ser um escalar ou um array com um valor por condição,
+    o que permite simular vários conjuntos de parâmetros em uma só chamada.
+    Valores fora de PARAMETER_BOUNDS (ou não finitos) levantam ValueError.
+    """
+
+    mimax_Glu: float = 0.2    # Velocidade específica máxima de crescimento em glicose (1/h)
+    k_Glu: float = 10.0       # Constante de Monod para glicose (g/L)
+    mimax_Xyl: float = 0.05   # Velocidade específica máxima de crescimento em xilose (1/h)
+    k_Xyl: float = 20.0       # Constante de Monod para xilose (g/L)
+    k_i: float = 40.0         # Constante de inibição da glicose sobre o consumo de xilose (L/g)
+    Y_X_Glu: float = 0.1      # Rendimento células/glicose (g/g)
+    Y_X_Xyl: float = 0.08     # Rendimento células/xilose (g/g)
+    Y_P_Glu: float = 0.4      # Rendimento etanol/glicose (g/g)
+    Y_P_Xyl: float = 0.2      # Rendimento etanol/xilose (g/g)
+    Y_P_X: float = 0.1        # Rendimento etanol/células (g/g)
+
+    def __post_init__(self):
+        for name, (minimum, inclusive) in PARAMETER_BOUNDS.items():
+            value = np.asarray(getattr(self, name), dtype=float)
+            valid = np.isfinite(value) & (value >= minimum if inclusive else value > minimum)
+            if not valid.all():
+                relation = "maior ou igual a" if inclusive else "maior que"
+                raise ValueError(f"{name} deve ser um número finito {relation} {minimum:g}")
+
+    @classmethod
+    def stack(cls, parameter_sets):
+        """
+        Empilha vários conjuntos de parâmetros em um único objeto com arrays.
+
+        Args:
+            parameter_sets (list): Lista de FermentationParameters.
+
+        Returns:
+            FermentationParameters: Campos com formato (len(parameter_sets),).
+        """
+        return cls(**{
+            f.name: np.array([getattr(p, f.name) for p in parameter_sets], dtype=float)
+            for f in fields(cls)
+        })
+
+    def broadcast(self, n):
+        """Campos como arrays de formato (n,)."""
+        return {f.name: np.broadcast_to(np.asarray(getattr(self, f.name), dtype=float), (n,)) for f in fields(self)}
+
+DEFAULT_PARAMETERS = FermentationParameters()
+
+# =============================================================================
+# SISTEMA DE EQUAÇÕES DIFERENCIAIS
+# =============================================================================
+
+def fermentation_rhs(y, p):
+    """
+    Balanços de massa, vetorizados sobre condições.
+
+    Args:
+        y (np.ndarray): Estados com formato (N, 4), na ordem de STATES.
+        p (dict): Parâmetros com formato (N,) (FermentationParameters.broadcast).
+
+    Returns:
+        np.ndarray: Derivadas com formato (N, 4).
+    """
+    X, Glu, Xyl = y[:, 0], y[:, 1], y[:, 2]
+
+    # Velocidades específicas de crescimento (Monod; xilose inibida pela glicose)
+    r1 = p["mimax_Glu"] * Glu / (p["k_Glu"] + Glu)
+    r2 = p["mimax_Xyl"] * Xyl / (p["k_Xyl"] + Xyl) / (1 + Glu * p["k_i"])
+
+    return np.stack([
+        (r1 + r2) * X,
+        -r1 * X / p["Y_X_Glu"],
+        -r2 * X / p["Y_X_Xyl"],
+        (p["Y_P_Glu"] / p["Y_P_X"] * r1 + p["Y_P_Xyl"] / p["Y_P_X"] * r2) * X,
+    ], axis=1)
+
+def fermentation_jacobian(y, p):
+    """
+    Jacobiano analítico dos balanços de massa.
+
+    Args:
+        y (np.ndarray): Estados com formato (N, 4).
+        p (dict): Parâmetros com formato (N,).
+
+    Returns:
+        np.ndarray: Jacobianos com formato (N, 4, 4).
+    """
+    X, Glu, Xyl = y[:, 0], y[:, 1], y[:, 2]
+
+    inhibition = 1 / (1 + Glu * p["k_i"])
+    r1 = p["mimax_Glu"] * Glu / (p["k_Glu"] + Glu)
+    r2 = p["mimax_Xyl"] * Xyl / (p["k_Xyl"] + Xyl) * inhibition
+
+    dr1_dGlu = p["mimax_Glu"] * p["k_Glu"] / (p["k_Glu"] + Glu)**2
+    dr2_dGlu = -r2 * p["k_i"] * inhibition
+    dr2_dXyl = p["mimax_Xyl"] * p["k_Xyl"] / (p["k_Xyl"] + Xyl)**2 * inhibition
+
+    c1 = p["Y_P_Glu"] / p["Y_P_X"]
+    c2 = p["Y_P_Xyl"] / p["Y_P_X"]
+
+    J = np.zeros((y.shape[0], 4, 4))
+    # Células
+    J[:, 0, 0] = r1 + r2
+    J[:, 0, 1] = (dr1_dGlu + dr2_dGlu) * X
+    J[:, 0, 2] = dr2_dXyl * X
+    # Glicose
+    J[:, 1, 0] = -r1 / p["Y_X_Glu"]
+    J[:, 1, 1] = -dr1_dGlu * X / p["Y_X_Glu"]
+    # Xilose
+    J[:, 2, 0] = -r2 / p["Y_X_Xyl"]
+    J[:, 2, 1] = -dr2_dGlu * X / p["Y_X_Xyl"]
+    J[:, 2, 2] = -dr2_dXyl * X / p["Y_X_Xyl"]
+    # Etanol
+    J[:, 3, 0] = c1 * r1 + c2 * r2
+    J[:, 3, 1] = (c1 * dr1_dGlu + c2 * dr2_dGlu) * X
+    J[:, 3, 2] = c2 * dr2_dXyl * X
+    return J
+
+def _condition_system(p):
+    """
+    RHS escalar e Jacobiano de cada condição, para solve_each_system.
+
+    Mesmos balanços de fermentation_rhs, com floats do Python: em lotes
+    pequenos o custo de cada avaliação vetorizada domina a integração.
+
+    Args:
+        p (dict): Parâmetros com formato (N,) (FermentationParameters.broadcast).
+
+    Returns:
+        callable: i → (rhs(y, t), jac(y, t)) da condição i.
+    """
+    def system(i):
+        q = {name: float(values[i]) for name, values in p.items()}
+        mimax_Glu, k_Glu, mimax_Xyl, k_Xyl, k_i = (q[k] for k in ("mimax_Glu", "k_Glu", "mimax_Xyl", "k_Xyl", "k_i"))
+        i_X_Glu, i_X_Xyl = 1 / q["Y_X_Glu"], 1 / q["Y_X_Xyl"]
+        c1, c2 = q["Y_P_Glu"] / q["Y_P_X"], q["Y_P_Xyl"] / q["Y_P_X"]
+        condition = {name: values[i:i + 1] for name, values in p.items()}
+
+        def rhs(y, t):
+            X, Glu, Xyl, _ = y.tolist()
+            r1 = mimax_Glu * Glu / (k_Glu + Glu)
+            r2 = mimax_Xyl * Xyl / (k_Xyl + Xyl) / (1 + Glu * k_i)
+            return [(r1 + r2) * X, -r1 * X * i_X_Glu, -r2 * X * i_X_Xyl, (c1 * r1 + c2 * r2) * X]
+
+        def jac(y, t):
+            return fermentation_jacobian(y[None], condition)[0]
+
+        return rhs, jac
+    return system
+
+# =============================================================================
+# SIMULAÇÃO
+# =============================================================================
+
+@instrumented("fermentation")
+def simulate_fermentation_batch(biomass, glucose, xylose, ethanol=0.0, params=DEFAULT_PARAMETERS,
+                                time_final=72.0, n_points=73, method="auto", rtol=1e-6, atol=1e-9):
+    """
+    Simula a fermentação para N inóculos, cargas de açúcar e parâmetros.
+
+    As condições são empilhadas em um único sistema com Jacobiano analítico
+    bloco-diagonal, resolvido por um integrador implícito (stiff). Com
+    method="auto", lotes pequenos (até SMALL_BATCH_MAX) são integrados
+    condição a condição pelo LSODA do odeint, como no notebook.
+
+    Args:
+        biomass (array): Concentração inicial de células (g/L).
+        glucose (array): Concentração inicial de glicose (g/L).
+        xylose (array): Concentração inicial de xilose (g/L).
+        ethanol (array): Concentração inicial de etanol (g/L).
+        params (FermentationParameters ou list): Parâmetros, com campos
+            escalares ou arrays (N,), ou uma lista com um conjunto por condição.
+        time_final (float): Tempo final da simulação (h).
+        n_points (int): Número de pontos no tempo.
+        method (str): "auto" ou integrador do solve_ivp ("BDF", "Radau" ou
+            "LSODA").
+        rtol (float): Tolerância relativa.
+        atol (float): Tolerância absoluta.
+
+    Returns:
+        dict: "time" (T,), "concentrations" (N, T, 4) na ordem de STATES e
+        indicadores finais (N,): título, rendimento e produtividade de etanol.
+    """
+    if time_final <= 0:
+        raise ValueError("Tempo de fermentação deve ser maior que zero")
+
+    if not isinstance(params, FermentationParameters):
+        params = FermentationParameters.stack(params)
+
+    param_shape = np.broadcast_shapes(*(np.shape(getattr(params, f.name)) for f in fields(params)))
+    biomass, glucose, xylose, ethanol = (
+        np.atleast_1d(a).astype(float) for a in np.broadcast_arrays(
+            biomass, glucose, xylose, ethanol, np.zeros(param_shape)
+        )[:4]
+    )
+    n = biomass.shape[0]
+    p = params.broadcast(n)
+    record(n_conditions=n)
+
+    # Condições iniciais
+    y0 = np.column_stack([biomass, glucose, xylose, ethanol])
+
+    t = np.linspace(0, time_final, n_points)
+    concentrations, sol = solve_block_system(
+        lambda t, y: fermentation_rhs(y, p),
+        lambda t, y: fermentation_jacobian(y, p),
+        y0, t, method=method, rtol=rtol, atol=atol, condition_system=_condition_system(p)
+    )
+
+    final = concentrations[:, -1, :]
+    consumed = (glucose - final[:, 1]) + (xylose - final[:, 2])
+    titer = final[:, 3]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ethanol_yield = np.where(consumed > 0, (titer - ethanol) / consumed, 0.0)
+        glucose_conversion = np.where(glucose > 0, (1 - final[:, 1]/glucose) * 100, 0.0)
+        xylose_conversion = np.where(xylose > 0, (1 - final[:, 2]/xylose) * 100, 0.0)
+
+    return {
+        "time": sol.t,
+        "concentrations": concentrations,
+        "states": STATES,
+        "ethanol_titer": titer,
+        "ethanol_yield": ethanol_yield,
+        "ethanol_productivity": (titer - ethanol) / time_final,
+        "glucose_conversion_percent": glucose_conversion,
+        "xylose_conversion_percent": xylose_conversion,
+        "n_rhs_evaluations": sol.nfev,
+        "n_jacobian_evaluations": sol.njev,
+    }
+
+def simulate_fermentation(biomass, glucose, xylose, ethanol=0.0, params=DEFAULT_PARAMETERS,
+                          time_final=72.0, n_points=73):
+    """
+    Simula a fermentação para uma condição.
+
+    Args:
+        biomass (float): Concentração inicial de células (g/L).
+        glucose (float): Concentração inicial de glicose (g/L).
+        xylose (float): Concentração inicial de xilose (g/L).
+        ethanol (float): Concentração inicial de etanol (g/L).
+        params (FermentationParameters): Parâmetros cinéticos.
+        time_final (float): Tempo final da simulação (h).
+        n_points (int): Número de pontos no tempo.
+
+    Returns:
+        dict: Tempos, concentrações de cada estado e indicadores finais.
+    """
+    batch = simulate_fermentation_batch(
+        biomass, glucose, xylose, ethanol, params=params, time_final=time_final, n_points=n_points
+    )
+    results = {"time": batch["time"]}
+    results.update({name: batch["concentrations"][0, :, i] for i, name in enumerate(STATES)})
+    for key in ("ethanol_titer", "ethanol_yield", "ethanol_productivity",
+                "glucose_conversion_percent", "xylose_conversion_percent"):
+        results[key] = batch[key][0]
+    results["time_final"] = time_final
+    return results
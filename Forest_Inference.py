@@ -0,0 +1,340 @@
+# INFERÊNCIA DAS FLORESTAS ALEATÓRIAS EM ARRAYS NUMPY
+# Exporta os surrogates optimized_model_Random_Forest_*.pkl (pickles do
+# scikit-learn) para arrays contíguos gravados ao lado do pickle, em uma
+# pasta .forest com index.json e arquivos .npy abertos com mmap_mode="r".
+# A predição percorre todas as árvores de um lote de entradas ao mesmo
+# tempo, nível por nível, com os scalers incorporados: o de entrada nos
+# limiares e o de saída na própria predição. Abrir uma floresta exportada
+# não deserializa objetos do scikit-learn, e os processos que a usam
+# compartilham as mesmas páginas de memória.
+#
+# Uso:
+#   python Forest_Inference.py            # exporta todas as florestas de ARTIFACT_DIR
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from Model_Registry import ARTIFACT_DIR, INPUT_FEATURES, SURROGATE_SPECS, _affine_from_scaler, _glob_timestamped, \
+    _load_joblib, discover_artifacts
+
+FOREST_VERSION = 1
+
+# Surrogates que são florestas aleatórias
+FOREST_SURROGATES = ("random_forest",)
+
+# Profundidade máxima exportável: cada árvore é guardada como uma árvore
+# binária completa (2^profundidade folhas)
+MAX_DEPTH = 14
+
+# Linhas por passada: (árvores × linhas) índices cabem no cache
+_CHUNK = 256
+
+# Passos de nextafter permitidos ao incorporar o scaler nos limiares
+_MAX_ADJUST = 64
+
+def forest_path(model_path):
+    """Pasta da floresta exportada de um pickle (mesmo nome, sufixo .forest)."""
+    return Path(model_path).with_suffix(".forest")
+
+def _file_digest(path):
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=16).hexdigest()
+
+# =============================================================================
+# EXPORTAÇÃO
+# =============================================================================
+
+def _forests(model):
+    """
+    Florestas de um modelo e a primeira coluna de saída de cada uma.
+
+    Aceita RandomForestRegressor (uma ou várias saídas) e
+    MultiOutputRegressor de florestas (uma por saída).
+    """
+    if type(model).__name__ == "MultiOutputRegressor":
+        forests, column = [], 0
+        for estimator in model.estimators_:
+            forests.append((estimator, column))
+            column += estimator.n_outputs_
+        return forests
+    if hasattr(model, "estimators_") and hasattr(model, "n_outputs_"):
+        return [(model, 0)]
+    raise TypeError(f"Modelo não suportado: {type(model).__name__}")
+
+def _fuse_thresholds(threshold, scale, shift):
+    """
+    Limiares no espaço das entradas originais.
+
+    A árvore compara float32(x·a + b) <= t. Como essa expressão cresce com x
+    (a > 0), a condição equivale a x <= x*, com x* o maior float64 que ainda
+    vai para a esquerda: a fronteira é o ponto médio entre os float32
+    vizinhos de t, ajustada com nextafter até a comparação coincidir bit a
+    bit com a original.
+    """
+    fused = np.full_like(threshold, np.inf)
+    finite = np.isfinite(threshold)
+    t, a, b = threshold[finite], scale[finite], shift[finite]
+
+    def left(x):
+        return (x * a + b).astype(np.float32) <= t
+
+    t32 = t.astype(np.float32)
+    t_low = np.where(t32 > t, np.nextafter(t32, np.float32(-np.inf)), t32)
+    midpoint = (t_low.astype(float) + np.nextafter(t_low, np.float32(np.inf)).astype(float)) / 2
+    x = (midpoint - b) / a
+    for _ in range(_MAX_ADJUST):
+        wrong = ~left(x)
+        if not wrong.any():
+            break
+        x[wrong] = np.nextafter(x[wrong], -np.inf)
+    for _ in range(_MAX_ADJUST):
+        above = np.nextafter(x, np.inf)
+        wrong = left(above)
+        if not wrong.any():
+            break
+        x[wrong] = above[wrong]
+    if (~left(x)).any() or left(np.nextafter(x, np.inf)).any():
+        raise RuntimeError("Não foi possível incorporar o scaler de entrada nos limiares")
+    fused[finite] = x
+    return fused
+
+def export_forest(model_path, scaler_X_path, scaler_y_path, path=None, outputs=None):
+    """
+    Exporta uma floresta do scikit-learn e seus scalers para arrays NumPy.
+
+    Cada árvore vira uma árvore binária completa de profundidade D (a maior
+    das árvores), guardada nível por nível: no nível d, o nó na posição p
+    da árvore k fica no índice k·2^d + p, e seus filhos em 2·índice e
+    2·índice + 1. Folhas mais rasas são replicadas para baixo com limiar
+    +inf (sempre à esquerda).
+
+    Args:
+        model_path (str): Pickle do modelo (joblib).
+        scaler_X_path (str): Pickle do scaler das entradas.
+        scaler_y_path (str): Pickle do scaler das saídas.
+        path (str): Pasta de saída (padrão: forest_path(model_path)).
+        outputs (tuple): Nomes das saídas, gravados no índice.
+
+    Returns:
+        dict: Metadados gravados em index.json.
+    """
+    start = time.perf_counter()
+    model = _load_joblib(model_path)
+    scaler_X = _load_joblib(scaler_X_path)
+    x_scale, x_shift = _affine_from_scaler(scaler_X)
+    y_scale, y_shift = _affine_from_scaler(_load_joblib(scaler_y_path))
+    if np.any(x_scale <= 0):
+        raise ValueError("O scaler de entrada precisa ter escala positiva")
+
+    trees, tree_output = [], []
+    for forest, column in _forests(model):
+        for estimator in forest.estimators_:
+            trees.append(estimator.tree_)
+            tree_output.append(column)
+    n_trees = len(trees)
+    n_values = trees[0].value.shape[1]
+    depth = max(tree.max_depth for tree in trees)
+    if depth > MAX_DEPTH:
+        raise ValueError(f"Árvores com profundidade {depth} (máximo exportável: {MAX_DEPTH})")
+
+    # Nós internos de todos os níveis em sequência; folhas no nível D
+    n_internal = n_trees * (2 ** depth - 1)
+    feature = np.zeros(n_internal, dtype=np.int32)
+    threshold = np.full(n_internal, np.inf)
+    value = np.zeros((n_trees * 2 ** depth, n_values))
+    for k, tree in enumerate(trees):
+        left, right = tree.children_left, tree.children_right
+        stack = [(0, 0, 0)]
+        while stack:
+            node, position, level = stack.pop()
+            if left[node] == -1:
+                position <<= depth - level
+                value[k * 2 ** depth + position] = tree.value[node, :, 0]
+                continue
+            index = n_trees * (2 ** level - 1) + k * 2 ** level + position
+            feature[index] = tree.feature[node]
+            threshold[index] = tree.threshold[node]
+            stack.append((left[node], 2 * position, level + 1))
+            stack.append((right[node], 2 * position + 1, level + 1))
+
+    threshold = _fuse_thresholds(threshold, x_scale[feature], x_shift[feature])
+
+    path = Path(path or forest_path(model_path))
+    path.mkdir(parents=True, exist_ok=True)
+    arrays = {
+        "feature": feature,
+        "threshold": threshold,
+        "value": value,
+        "tree_output": np.array(tree_output, dtype=np.int32),
+        # Inversa de y·a + b, aplicada após a média das árvores
+        "output_scale": 1.0 / y_scale,
+        "output_shift": -y_shift / y_scale,
+    }
+    for name, array in arrays.items():
+        np.save(path / f"{name}.npy", array)
+
+    n_outputs = len(y_scale)
+    index = {
+        "version": FOREST_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "export_seconds": round(time.perf_counter() - start, 3),
+        "sources": {
+            key: {"file": Path(source).name, "blake2b": _file_digest(source)}
+            for key, source in (("model", model_path), ("scaler_X", scaler_X_path), ("scaler_y", scaler_y_path))
+        },
+        "features": list(getattr(scaler_X, "feature_names_in_", INPUT_FEATURES)),
+        "outputs": list(outputs or range(n_outputs)),
+        "n_trees": n_trees,
+        "depth": depth,
+        "n_outputs": n_outputs,
+        "arrays": {name: {"file": f"{name}.npy", "shape": list(array.shape), "dtype": str(array.dtype)}
+                   for name, array in arrays.items()},
+    }
+    # O índice é gravado por último: sua presença marca uma exportação completa
+    tmp = path / "index.json.tmp"
+    tmp.write_text(json.dumps(index, indent=2), encoding="utf-8")
+    os.replace(tmp, path / "index.json")
+    return index
+
+def export_random_forests(directory=ARTIFACT_DIR):
+    """
+    Exporta todas as florestas da pasta de artefatos (todos os carimbos).
+
+    Returns:
+        list: Pastas .forest gravadas.
+    """
+    exported = []
+    for name in FOREST_SURROGATES:
+        spec = SURROGATE_SPECS[name]
+        for timestamp, _ in _glob_timestamped(Path(directory), spec["model"]):
+            artifacts = discover_artifacts(name, directory, timestamp=timestamp)
+            export_forest(artifacts["model"], artifacts["scaler_X"], artifacts["scaler_y"],
+                          outputs=spec["outputs"])
+            exported.append(forest_path(artifacts["model"]))
+    return exported
+
+# =============================================================================
+# INFERÊNCIA
+# =============================================================================
+
+class ForestModel:
+    """
+    Floresta exportada por export_forest, pronta para predição em lote.
+
+    Recebe as entradas originais (sem escalonar) e devolve as saídas já na
+    escala original, com os mesmos resultados do pickle seguido dos
+    scalers.
+
+    Args:
+        path (str): Pasta .forest com index.json e os arrays .npy.
+        sources (dict): Caminhos de "model", "scaler_X" e "scaler_y" para
+            conferir se a exportação corresponde a esses arquivos.
+    """
+
+    def __init__(self, path, sources=None):
+        self.path = Path(path)
+        self.index = json.loads((self.path / "index.json").read_text(encoding="utf-8"))
+        if self.index["version"] != FOREST_VERSION:
+            raise ValueError(f"Versão da floresta não suportada: {self.index['version']}")
+        for key, source in (sources or {}).items():
+            if _file_digest(source) != self.index["sources"][key]["blake2b"]:
+                raise ValueError(f"Floresta exportada de outro {key}; exporte-a de novo")
+
+        arrays = {name: np.load(self.path / spec["file"], mmap_mode="r")
+                  for name, spec in self.index["arrays"].items()}
+        self.features = tuple(self.index["features"])
+        self.outputs = tuple(self.index["outputs"])
+        self.n_trees, self.depth = self.index["n_trees"], self.index["depth"]
+        self._value = arrays["value"]
+        self._output_scale = np.asarray(arrays["output_scale"])
+        self._output_shift = np.asarray(arrays["output_shift"])
+
+        # Visões de cada nível nos arrays mapeados
+        self._levels = []
+        for level in range(self.depth):
+            start = self.n_trees * (2 ** level - 1)
+            stop = start + self.n_trees * 2 ** level
+            self._levels.append((arrays["feature"][start:stop], arrays["threshold"][start:stop]))
+
+        # Árvores de cada saída (contíguas, na ordem do scikit-learn)
+        tree_output = np.asarray(arrays["tree_output"])
+        self._groups = [(column, np.flatnonzero(tree_output == column)) for column in np.unique(tree_output)]
+
+    def __repr__(self):
+        return f"ForestModel(path='{self.path}', trees={self.n_trees}, depth={self.depth})"
+
+    @classmethod
+    def load(cls, path, sources=None):
+        """Abre a floresta, ou None se ela não existir ou estiver desatualizada."""
+        try:
+            return cls(path, sources)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _leaves(self, X):
+        """Índice da folha de cada árvore para cada linha, formato (árvores, n)."""
+        n, n_features = X.shape
+        row = (np.arange(n, dtype=np.intp) * n_features)[None, :]
+        flat = X.ravel()
+        leaf = np.broadcast_to(np.arange(self.n_trees, dtype=np.intp)[:, None], (self.n_trees, n)).copy()
+        for feature, threshold in self._levels:
+            column = feature.take(leaf)
+            column += row
+            right = flat.take(column) > threshold.take(leaf)
+            leaf *= 2
+            leaf += right
+        return leaf
+
+    def predict(self, X):
+        """
+        Prediz as saídas para um lote de condições.
+
+        Args:
+            X (np.ndarray): Entradas originais com formato (n, features).
+
+        Returns:
+            np.ndarray: Predições com formato (n, saídas).
+        """
+        X = np.ascontiguousarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != len(self.features):
+            raise ValueError(f"Esperadas {len(self.features)} variáveis de entrada: {self.features}")
+        if not np.isfinite(X).all():
+            raise ValueError("Entradas não finitas")
+
+        n_values = self._value.shape[1]
+        y = np.empty((len(X), len(self._output_scale)))
+        for start in range(0, len(X), _CHUNK):
+            block = X[start:start + _CHUNK]
+            values = self._value[self._leaves(block)]
+            for column, trees in self._groups:
+                # Soma árvore a árvore (na ordem do scikit-learn) e média
+                y[start:start + len(block), column:column + n_values] = (
+                    values[trees].sum(axis=0) / len(trees)
+                )
+        return y * self._output_scale + self._output_shift
+
+# =============================================================================
+# EXECUÇÃO PELA LINHA DE COMANDO
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta as florestas aleatórias para arrays NumPy.")
+    parser.add_argument("directory", nargs="?", default=str(ARTIFACT_DIR), help="Pasta dos artefatos")
+    args = parser.parse_args(argv)
+
+    for path in export_random_forests(args.directory):
+        index = json.loads((path / "index.json").read_text(encoding="utf-8"))
+        print(f"{path.name}: {index['n_trees']} árvores, profundidade {index['depth']}, "
+              f"{index['export_seconds']:.1f} s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
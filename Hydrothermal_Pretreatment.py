@@ -1,54 +1,483 @@
 # MODELO DE DEGRADAÇÃO HIDROTÉRMICA
 # Extraído do notebook Hydrothermal Pretreatment.ipynb
 
-import pandas as pd
+from collections.abc import Mapping
+from functools import cached_property
+
 import numpy as np
 from scipy.integrate import odeint
+from scipy.linalg import expm
+
+from Instrumentation import instrumented, odeint_diagnostics, record
+
+# =============================================================================
+# PARÂMETROS CINÉTICOS
+# =============================================================================
+
+# Parâmetros para degradação da hemicelulose
+KINETIC_DATA_HEMICELLULOSE = {
+    'Temperature (°C)': [180, 195, 210],
+    'k1 (1/min)': [0.0037, 0.0041, 0.0105],
+    'k2 (1/min)': [0.0353, 0.0988, 0.2143],
+    'k3 (1/min)': [0.0073, 0.0662, 0.2739],
+    'k4 (1/min)': [0.0097, 0.0316, 0.0730],
+    'k5 (1/min)': [0.0139, 0.0655, 0.1546],
+    'k6 (1/min)': [0.0043, 0.0047, 0.0317]
+}
+
+# Parâmetros para degradação da celulose
+KINETIC_DATA_CELLULOSE = {
+    'Temperature (°C)': [180, 195, 210],
+    'k1 (1/min)': [0.0051, 0.0060, 0.0294],
+    'k2 (1/min)': [0.0002, 0.0084, 0.0080],
+    'k3 (1/min)': [0.0550, 0.2400, 0.3100],
+    'k4 (1/min)': [0.0023, 0.0070, 0.0460],
+    'k5 (1/min)': [0.0531, 0.1573, 0.3772],
+    'k6 (1/min)': [0.0007, 0.0010, 0.0588]
+}
+
+# Mesmas tabelas em forma de array: (temperatura, sistema [hemi, cell], k1-k6)
+_KINETIC_TEMPERATURES = np.array(KINETIC_DATA_HEMICELLULOSE['Temperature (°C)'], dtype=float)
+_KINETIC_TABLE = np.stack([
+    np.array([v for c, v in data.items() if c != 'Temperature (°C)']).T
+    for data in (KINETIC_DATA_HEMICELLULOSE, KINETIC_DATA_CELLULOSE)
+], axis=1)
+
+# Faixa de temperatura coberta pelos parâmetros ajustados (°C)
+TEMPERATURE_RANGE = (_KINETIC_TEMPERATURES[0], _KINETIC_TEMPERATURES[-1])
+
+# Constante dos gases (J/mol/K)
+R_GAS = 8.314
+
+# =============================================================================
+# MODELO DE ARRHENIUS
+# =============================================================================
+
+# Ajuste feito uma única vez, na importação: entre cada par de temperaturas
+# tabeladas, ln k varia linearmente com 1/T, com um fator pré-exponencial e
+# uma energia de ativação por constante. O modelo reproduz exatamente os
+# valores tabelados e interpola qualquer temperatura dentro da faixa.
+_T_KELVIN = _KINETIC_TEMPERATURES + 273.15
+_LN_K = np.log(_KINETIC_TABLE)
+
+# Energia de ativação (J/mol) e ln do fator pré-exponencial (ln 1/min)
+# por intervalo de temperatura, com formato (intervalo, sistema, k1-k6)
+ACTIVATION_ENERGY = -R_GAS * np.diff(_LN_K, axis=0) / np.diff(1 / _T_KELVIN)[:, None, None]
+LN_PRE_EXPONENTIAL = _LN_K[:-1] + ACTIVATION_ENERGY / (R_GAS * _T_KELVIN[:-1, None, None])
+
+def arrhenius_rate_constants(temperature):
+    """
+    Calcula as constantes cinéticas k1-k6 para qualquer temperatura da faixa.
+
+    Args:
+        temperature (array): Temperaturas em °C, entre 180 e 210.
+
+    Returns:
+        np.ndarray: Constantes em 1/min com formato (..., 2, 6); o eixo 2
+        separa hemicelulose (0) e celulose (1).
+    """
+    temperature = np.asarray(temperature, dtype=float)
+
+    # Validação de temperatura
+    if np.any(~((temperature >= TEMPERATURE_RANGE[0]) & (temperature <= TEMPERATURE_RANGE[1]))):
+        raise ValueError(
+            f"Temperatura deve estar entre {TEMPERATURE_RANGE[0]:.0f} e {TEMPERATURE_RANGE[1]:.0f}°C"
+        )
+
+    interval = np.searchsorted(_KINETIC_TEMPERATURES, temperature, side="right") - 1
+    interval = np.clip(interval, 0, len(ACTIVATION_ENERGY) - 1)
+    T = (temperature + 273.15)[..., None, None]
+    return np.exp(LN_PRE_EXPONENTIAL[interval] - ACTIVATION_ENERGY[interval] / (R_GAS * T))
+
+# Espécies na última dimensão de "concentrations" (simulate_hydrothermal_batch):
+# sistema da hemicelulose (H, XOS, MH, F, D) seguido do da celulose (C, GOS, MC, HMF, D)
+SPECIES = (
+    "hemicellulose", "xos", "xylose", "furfural", "hemicellulose_degradation",
+    "cellulose", "gos", "glucose", "hmf", "cellulose_degradation",
+)
+
+# Espécies somadas nas métricas derivadas (açúcares liberados e inibidores)
+SUGAR_SPECIES = ("xylose", "xos", "glucose", "gos")
+INHIBITOR_SPECIES = ("furfural", "hmf")
+
+# Métodos de solução disponíveis para simulate_hydrothermal_degradation
+SOLVER_METHODS = ("analytic", "odeint")
+
+# Número de condição máximo aceito para a matriz de autovetores; acima disso
+# (autovalores quase coincidentes) usa-se a exponencial de matriz diretamente
+_MAX_EIGVEC_COND = 1e8
+
+# =============================================================================
+# SOLUÇÃO ANALÍTICA DO SISTEMA LINEAR
+# =============================================================================
+
+def _rate_matrix(k):
+    """
+    Monta a matriz de taxas A do sistema linear dy/dt = A y.
+
+    A mesma estrutura vale para hemicelulose (H, XOS, MH, F, D) e celulose
+    (C, GOS, MC, HMF, D); a matriz é triangular inferior.
+
+    Args:
+        k (array): Constantes k1-k6 com formato (..., 6).
+
+    Returns:
+        np.ndarray: Matrizes de taxas com formato (..., 5, 5).
+    """
+    k = np.asarray(k, dtype=float)
+    k1, k2, k3, k4, k5, k6 = np.moveaxis(k, -1, 0)
+
+    A = np.zeros(k.shape[:-1] + (5, 5))
+    A[..., 0, 0] = -(k1 + k2)
+    A[..., 1, 0] = k2
+    A[..., 1, 1] = -k3
+    A[..., 2, 0] = k1
+    A[..., 2, 1] = k3
+    A[..., 2, 2] = -(k4 + k5)
+    A[..., 3, 2] = k4
+    A[..., 3, 3] = -k6
+    A[..., 4, 2] = k5
+    A[..., 4, 3] = k6
+    return A
+
+def _modal_decomposition(A, y0):
+    """
+    Decomposição modal de dy/dt = A y: y(t) = V exp(Λt) c, com c = V⁻¹ y0.
+
+    Args:
+        A (np.ndarray): Matrizes de taxas com formato (N, 5, 5).
+        y0 (np.ndarray): Condições iniciais com formato (N, 5).
+
+    Returns:
+        tuple: (autovalores (N, 5), autovetores (N, 5, 5), coeficientes
+        (N, 5), máscara (N,) das linhas com autovetores mal condicionados,
+        que devem ser resolvidas por exponencial de matriz).
+    """
+    # Matriz triangular: autovalores reais (a diagonal de A)
+    eigval, eigvec = np.linalg.eig(A)
+    eigval, eigvec = eigval.real, eigvec.real
+
+    cond = np.linalg.cond(eigvec)
+    bad = ~np.isfinite(cond) | (cond > _MAX_EIGVEC_COND)
+    eigvec[bad] = np.eye(A.shape[-1])
+
+    coef = np.linalg.solve(eigvec, y0[..., None])[..., 0]
+    record(n_expm_fallbacks=int(bad.sum()))
+    return eigval, eigvec, coef, bad
+
+def _evaluate_modes(A, y0, decomposition, t):
+    """
+    Avalia a solução decomposta em quaisquer tempos, sem resolver de novo.
+
+    Args:
+        A (np.ndarray): Matrizes de taxas com formato (N, 5, 5).
+        y0 (np.ndarray): Condições iniciais com formato (N, 5).
+        decomposition (tuple): Resultado de _modal_decomposition.
+        t (np.ndarray): Tempos com formato (N, T).
 
-def simulate_hydrothermal_degradation(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final):
+    Returns:
+        np.ndarray: Concentrações com formato (N, T, 5).
+    """
+    eigval, eigvec, coef, bad = decomposition
+    modes = np.exp(eigval[:, None, :] * t[:, :, None]) * coef[:, None, :]
+    y = modes @ np.swapaxes(eigvec, -1, -2)
+
+    if np.any(bad):
+        expAt = expm(t[bad][:, :, None, None] * A[bad][:, None])
+        y[bad] = (expAt @ y0[bad][:, None, :, None])[..., 0]
+
+    # O arredondamento da combinação dos modos deixa resíduos da ordem de
+    # -1e-14 onde a concentração é nula: t=0 recebe exatamente y0 e a
+    # solução (não negativa para y0 ≥ 0) é limitada a zero
+    start = t == 0
+    y[start] = np.broadcast_to(y0[:, None, :], y.shape)[start]
+    np.maximum(y, 0.0, out=y)
+    return y
+
+def _solve_linear_kinetics(A, y0, t):
+    """
+    Resolve dy/dt = A y exatamente, y(t) = V exp(Λt) V⁻¹ y0.
+
+    Todos os tempos são avaliados em uma única expressão vetorizada. Quando a
+    matriz de autovetores é mal condicionada (autovalores quase repetidos),
+    a solução daquela linha é obtida por exponencial de matriz.
+
+    Args:
+        A (np.ndarray): Matrizes de taxas com formato (N, 5, 5).
+        y0 (np.ndarray): Condições iniciais com formato (N, 5).
+        t (np.ndarray): Tempos com formato (N, T).
+
+    Returns:
+        np.ndarray: Concentrações com formato (N, T, 5).
+    """
+    return _evaluate_modes(A, y0, _modal_decomposition(A, y0), t)
+
+# =============================================================================
+# RESULTADO ESTRUTURADO
+# =============================================================================
+
+class HydrothermalResult(Mapping):
+    """
+    Resultado de uma simulação hidrotérmica.
+
+    Todos os dados ficam em um único bloco float64 contíguo com formato
+    (11, T): a linha 0 é o tempo e as demais são as espécies na ordem de
+    SPECIES. Cada espécie é acessada como atributo (result.xylose) ou chave
+    (result["xylose"]) e é uma visão do bloco, sem cópia. Métricas derivadas
+    são calculadas apenas no primeiro acesso.
+
+    O objeto também se comporta como o dict retornado anteriormente por
+    simulate_hydrothermal_degradation ("time", "cellulose",
+    "cellulose_degraded_percent", ...).
+    """
+
+    _ROWS = {"time": 0, **{name: i + 1 for i, name in enumerate(SPECIES)}}
+    _METRICS = (
+        "initial_cellulose", "initial_hemicellulose", "final_cellulose", "final_hemicellulose",
+        "cellulose_degraded_percent", "hemicellulose_degraded_percent",
+        "temperature", "solid_loading", "time_final",
+        "sugar_release", "inhibitor_load", "sugar_yield_percent",
+    )
+
+    def __init__(self, block, temperature, solid_loading, time_final, initial_cellulose, initial_hemicellulose,
+                 trajectory=None):
+        self.block = block
+        self.temperature = temperature
+        self.solid_loading = solid_loading
+        self.time_final = time_final
+        self.initial_cellulose = initial_cellulose
+        self.initial_hemicellulose = initial_hemicellulose
+        self.trajectory = trajectory
+
+    def __getattr__(self, name):
+        rows = type(self)._ROWS
+        if name in rows:
+            return self.block[rows[name]]
+        raise AttributeError(name)
+
+    def __getitem__(self, key):
+        if key in self._ROWS or key in self._METRICS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from self._ROWS
+        yield from self._METRICS
+
+    def __len__(self):
+        return len(self._ROWS) + len(self._METRICS)
+
+    def __repr__(self):
+        return (f"HydrothermalResult(temperature={self.temperature}, solid_loading={self.solid_loading}, "
+                f"time_final={self.time_final}, points={self.block.shape[1]})")
+
+    @property
+    def nbytes(self):
+        return self.block.nbytes
+
+    @property
+    def species(self):
+        """Visão (10, T) com todas as espécies, na ordem de SPECIES."""
+        return self.block[1:]
+
+    def at(self, times):
+        """
+        Mesma simulação avaliada em outros tempos, sem resolver de novo.
+
+        Args:
+            times (array): Tempos em minutos (qualquer ordem ou horizonte).
+
+        Returns:
+            HydrothermalResult: Resultado nos tempos pedidos.
+        """
+        if self.trajectory is None:
+            raise ValueError("Resultado sem trajetória contínua (método 'odeint')")
+        return self.trajectory.result(times)
+
+    @property
+    def final_cellulose(self):
+        return self.cellulose[-1]
+
+    @property
+    def final_hemicellulose(self):
+        return self.hemicellulose[-1]
+
+    @cached_property
+    def cellulose_degraded_percent(self):
+        C0 = self.initial_cellulose
+        return (1 - self.final_cellulose/C0) * 100 if C0 > 0 else 0
+
+    @cached_property
+    def hemicellulose_degraded_percent(self):
+        H0 = self.initial_hemicellulose
+        return (1 - self.final_hemicellulose/H0) * 100 if H0 > 0 else 0
+
+    @cached_property
+    def sugar_release(self):
+        """Açúcares e oligômeros liberados ao longo do tempo (g/L)."""
+        return self.block[[self._ROWS[name] for name in SUGAR_SPECIES]].sum(axis=0)
+
+    @cached_property
+    def inhibitor_load(self):
+        """Furfural + HMF ao longo do tempo (g/L)."""
+        return self.block[[self._ROWS[name] for name in INHIBITOR_SPECIES]].sum(axis=0)
+
+    @cached_property
+    def sugar_yield_percent(self):
+        """Açúcares liberados ao final em relação aos polissacarídeos iniciais (%)."""
+        total = self.initial_cellulose + self.initial_hemicellulose
+        return self.sugar_release[-1] / total * 100 if total > 0 else 0
+
+class HydrothermalTrajectory:
+    """
+    Solução contínua (forma fechada) de uma condição hidrotérmica.
+
+    A decomposição modal é calculada uma única vez; depois, as
+    concentrações podem ser avaliadas em quaisquer tempos, inclusive além
+    do horizonte original, sem resolver o sistema de novo.
+
+    Args:
+        temperature (float): Temperatura em °C (180-210).
+        solid_loading (float): Carga de sólidos em g/L.
+        cellulose_fraction (float): Fração mássica de celulose (0-1).
+        hemicellulose_fraction (float): Fração mássica de hemicelulose (0-1).
+    """
+
+    def __init__(self, temperature, solid_loading, cellulose_fraction, hemicellulose_fraction):
+        self.temperature = temperature
+        self.solid_loading = solid_loading
+        self.initial_cellulose = solid_loading * cellulose_fraction
+        self.initial_hemicellulose = solid_loading * hemicellulose_fraction
+
+        # Sistemas da hemicelulose e da celulose, resolvidos juntos
+        self._A = _rate_matrix(arrhenius_rate_constants(temperature))
+        self._y0 = np.zeros((2, 5))
+        self._y0[0, 0] = self.initial_hemicellulose
+        self._y0[1, 0] = self.initial_cellulose
+        self._decomposition = _modal_decomposition(self._A, self._y0)
+
+    def __repr__(self):
+        return f"HydrothermalTrajectory(temperature={self.temperature}, solid_loading={self.solid_loading})"
+
+    @property
+    def nbytes(self):
+        return self._A.nbytes + self._y0.nbytes + sum(a.nbytes for a in self._decomposition)
+
+    def __call__(self, times):
+        """
+        Concentrações de todas as espécies nos tempos pedidos.
+
+        Args:
+            times (array): Tempos em minutos, formato (T,).
+
+        Returns:
+            np.ndarray: Concentrações com formato (10, T), na ordem de SPECIES.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        sol = _evaluate_modes(self._A, self._y0, self._decomposition, np.stack([times, times]))
+        return sol.transpose(0, 2, 1).reshape(len(SPECIES), times.size)
+
+    def result(self, times, time_final=None):
+        """
+        Resultado estruturado nos tempos pedidos.
+
+        Args:
+            times (array): Tempos em minutos.
+            time_final (float): Tempo final informado no resultado (padrão:
+                o último tempo).
+
+        Returns:
+            HydrothermalResult: Tempos e concentrações, com esta trajetória.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        block = np.empty((1 + len(SPECIES), times.size))
+        block[0] = times
+        block[1:] = self(times)
+        return HydrothermalResult(
+            block,
+            temperature=self.temperature,
+            solid_loading=self.solid_loading,
+            time_final=times[-1] if time_final is None else time_final,
+            initial_cellulose=self.initial_cellulose,
+            initial_hemicellulose=self.initial_hemicellulose,
+            trajectory=self
+        )
+
+    def adaptive_times(self, time_final, rtol=1e-3, initial_points=17, max_points=1000):
+        """
+        Tempos de amostragem adaptados à curvatura das concentrações.
+
+        Partindo de uma malha uniforme, cada intervalo é dividido ao meio
+        enquanto a interpolação linear no ponto médio errar mais que rtol
+        (relativo à maior concentração de cada espécie). Trechos quase
+        retos ficam com poucos pontos e transientes rápidos, com muitos.
+
+        Args:
+            time_final (float): Tempo final em minutos.
+            rtol (float): Erro relativo tolerado da interpolação linear.
+            initial_points (int): Pontos da malha inicial.
+            max_points (int): Limite de pontos.
+
+        Returns:
+            np.ndarray: Tempos crescentes, de 0 a time_final.
+        """
+        times = np.linspace(0, time_final, initial_points)
+        values = self(times)
+        scale = np.maximum(np.abs(values).max(axis=1, keepdims=True), 1e-12)
+
+        while times.size < max_points:
+            mid = (times[:-1] + times[1:]) / 2
+            mid_values = self(mid)
+            error = np.abs(mid_values - (values[:, :-1] + values[:, 1:]) / 2) / scale
+            refine = np.flatnonzero(error.max(axis=0) > rtol)[:max_points - times.size]
+            if refine.size == 0:
+                break
+            times = np.insert(times, refine + 1, mid[refine])
+            values = np.insert(values, refine + 1, mid_values[:, refine], axis=1)
+        return times
+
+    def sample(self, time_final, n_points=200, adaptive=False, rtol=1e-3):
+        """
+        Resultado até time_final em uma malha uniforme ou adaptativa.
+
+        Args:
+            time_final (float): Tempo final em minutos.
+            n_points (int): Pontos da malha uniforme (ou limite da adaptativa).
+            adaptive (bool): Usa adaptive_times em vez da malha uniforme.
+            rtol (float): Tolerância da malha adaptativa.
+
+        Returns:
+            HydrothermalResult: Resultado amostrado.
+        """
+        if adaptive:
+            times = self.adaptive_times(time_final, rtol=rtol, max_points=max(n_points, 17))
+        else:
+            times = np.linspace(0, time_final, n_points)
+        return self.result(times, time_final=time_final)
+
+@instrumented("hydrothermal")
+def simulate_hydrothermal_degradation(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final,
+                                      method="analytic", n_points=200, adaptive=False):
     """
     Simula a degradação hidrotérmica de celulose e hemicelulose.
     
     Args:
-        temperature (int): Temperatura em °C (180, 195, 210).
+        temperature (float): Temperatura em °C (180-210).
         solid_loading (float): Carga de sólidos em g/L.
         cellulose_fraction (float): Fração mássica de celulose (0-1).
         hemicellulose_fraction (float): Fração mássica de hemicelulose (0-1).
         time_final (int): Tempo final da simulação em minutos.
+        method (str): "analytic" (solução exata por autodecomposição) ou
+            "odeint" (integração numérica, mantida como referência).
+        n_points (int): Pontos no tempo (limite de pontos se adaptive).
+        adaptive (bool): Amostragem adaptada à curvatura (apenas "analytic").
     
     Returns:
-        dict: Resultados da simulação contendo os tempos e concentrações.
+        HydrothermalResult: Tempos e concentrações de todas as espécies. No
+        método "analytic" o resultado carrega a trajetória contínua
+        (result.at(tempos) avalia outros tempos sem resolver de novo).
     """
     
-    # =============================================================================
-    # PARÂMETROS CINÉTICOS
-    # =============================================================================
-    
-    # Parâmetros para degradação da hemicelulose
-    data_hemi = {
-        'Temperature (°C)': [180, 195, 210],
-        'k1 (1/min)': [0.0037, 0.0041, 0.0105],
-        'k2 (1/min)': [0.0353, 0.0988, 0.2143],
-        'k3 (1/min)': [0.0073, 0.0662, 0.2739],
-        'k4 (1/min)': [0.0097, 0.0316, 0.0730],
-        'k5 (1/min)': [0.0139, 0.0655, 0.1546],
-        'k6 (1/min)': [0.0043, 0.0047, 0.0317]
-    }
-
-    # Parâmetros para degradação da celulose
-    data_cell = {
-        'Temperature (°C)': [180, 195, 210],
-        'k1 (1/min)': [0.0051, 0.0060, 0.0294],
-        'k2 (1/min)': [0.0002, 0.0084, 0.0080],
-        'k3 (1/min)': [0.0550, 0.2400, 0.3100],
-        'k4 (1/min)': [0.0023, 0.0070, 0.0460],
-        'k5 (1/min)': [0.0531, 0.1573, 0.3772],
-        'k6 (1/min)': [0.0007, 0.0010, 0.0588]
-    }
-
-    df_kn_hemicellulose = pd.DataFrame(data_hemi)
-    df_kn_cellulose = pd.DataFrame(data_cell)
-
     # =============================================================================
     # EQUAÇÕES DIFERENCIAIS
     # =============================================================================
@@ -91,9 +520,16 @@ def simulate_hydrothermal_degradation(temperature, solid_loading, cellulose_frac
     # CONFIGURAÇÃO DA SIMULAÇÃO
     # =============================================================================
 
-    # Validação de temperatura
-    if temperature not in [180, 195, 210]:
-        raise ValueError("Temperatura deve ser 180, 195 ou 210°C")
+    if method not in SOLVER_METHODS:
+        raise ValueError(f"Método deve ser um de {SOLVER_METHODS}")
+
+    if method == "analytic":
+        # Os dois sistemas são lineares: solução exata, avaliável em qualquer tempo
+        record(method=method)
+        trajectory = HydrothermalTrajectory(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction)
+        return trajectory.sample(time_final, n_points=n_points, adaptive=adaptive)
+    if adaptive:
+        raise ValueError("Amostragem adaptativa disponível apenas no método 'analytic'")
 
     # Concentrações iniciais
     C0 = solid_loading * cellulose_fraction
@@ -104,33 +540,105 @@ def simulate_hydrothermal_degradation(temperature, solid_loading, cellulose_frac
     y0_cell = [C0, 0.0, 0.0, 0.0, 0.0]  # C, GOS, MC, HMF, D
 
     # Vetor de tempo
-    t = np.linspace(0, time_final, 200)
+    t = np.linspace(0, time_final, n_points)
 
     # Obter parâmetros cinéticos para a temperatura escolhida
-    temp_idx = df_kn_hemicellulose[df_kn_hemicellulose['Temperature (°C)'] == temperature].index[0]
-    k_hemi = df_kn_hemicellulose.iloc[temp_idx, 1:].values
-    k_cell = df_kn_cellulose.iloc[temp_idx, 1:].values
+    k_hemi, k_cell = arrhenius_rate_constants(temperature)
 
     # =============================================================================
     # SIMULAÇÃO
     # =============================================================================
 
-    # Resolver as EDOs
-    sol_hemi = odeint(hemicellulose_kinetics, y0_hemi, t, args=(k_hemi,))
-    sol_cell = odeint(cellulose_kinetics, y0_cell, t, args=(k_cell,))
+    # Bloco único: tempo seguido das 10 espécies
+    block = np.empty((1 + len(SPECIES), t.size))
+    block[0] = t
+    record(method=method)
+
+    # Resolver as EDOs (full_output traz as estatísticas do LSODA)
+    for rows, kinetics, y0, k in ((slice(1, 6), hemicellulose_kinetics, y0_hemi, k_hemi),
+                                  (slice(6, 11), cellulose_kinetics, y0_cell, k_cell)):
+        sol, info = odeint(kinetics, y0, t, args=(k,), full_output=True)
+        block[rows] = sol.T
+        record(**odeint_diagnostics(info))
+        if info["message"] != "Integration successful.":
+            record(solver_message=info["message"])
 
-    # Concentrações de celulose e hemicelulose ao longo do tempo
-    cellulose_conc = sol_cell[:, 0]
-    hemicellulose_conc = sol_hemi[:, 0]
+    return HydrothermalResult(
+        block,
+        temperature=temperature,
+        solid_loading=solid_loading,
+        time_final=time_final,
+        initial_cellulose=C0,
+        initial_hemicellulose=H0
+    )
+
+@instrumented("hydrothermal_batch")
+def simulate_hydrothermal_batch(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final, n_points=200,
+                                rate_multipliers=None):
+    """
+    Simula a degradação hidrotérmica para N condições de uma só vez.
+
+    Os argumentos aceitam escalares ou arrays (com broadcasting para N
+    condições). Todas as condições são resolvidas em uma única passagem
+    vetorizada, sem laço em Python por linha. Para N=1 os resultados são
+    os mesmos de simulate_hydrothermal_degradation.
+
+    Args:
+        temperature (array): Temperaturas em °C (180-210).
+        solid_loading (array): Cargas de sólidos em g/L.
+        cellulose_fraction (array): Frações mássicas de celulose (0-1).
+        hemicellulose_fraction (array): Frações mássicas de hemicelulose (0-1).
+        time_final (array): Tempos finais da simulação em minutos.
+        n_points (int): Número de pontos no tempo por condição.
+        rate_multipliers (array): Fatores aplicados às constantes k1-k6,
+            com formato compatível com (N, 2, 6) (análise de incerteza).
+
+    Returns:
+        dict: Arrays densos; "concentrations" tem formato (N, T, 10), com as
+        espécies na ordem de SPECIES, e "time" tem formato (N, T).
+    """
+    temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final = (
+        np.atleast_1d(a).astype(float) for a in np.broadcast_arrays(
+            temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final
+        )
+    )
+
+    # Constantes cinéticas (valida a faixa de temperatura)
+    k = arrhenius_rate_constants(temperature)
+    if rate_multipliers is not None:
+        k = k * rate_multipliers
+
+    n = temperature.shape[0]
+
+    # Concentrações iniciais
+    C0 = solid_loading * cellulose_fraction
+    H0 = solid_loading * hemicellulose_fraction
+    y0 = np.zeros((n, 2, 5))
+    y0[:, 0, 0] = H0
+    y0[:, 1, 0] = C0
+
+    # Vetor de tempo por condição
+    t = np.linspace(0, time_final, n_points, axis=1)
+
+    # Sistemas da hemicelulose e da celulose empilhados como 2N sistemas
+    A = _rate_matrix(k).reshape(2 * n, 5, 5)
+    sol = _solve_linear_kinetics(A, y0.reshape(2 * n, 5), np.repeat(t, 2, axis=0))
+    concentrations = sol.reshape(n, 2, n_points, 5).transpose(0, 2, 1, 3).reshape(n, n_points, 10)
+
+    cellulose_conc = concentrations[:, :, SPECIES.index("cellulose")]
+    hemicellulose_conc = concentrations[:, :, SPECIES.index("hemicellulose")]
+    cellulose_final = cellulose_conc[:, -1]
+    hemicellulose_final = hemicellulose_conc[:, -1]
 
     # Calcular porcentagens de degradação
-    cellulose_final = cellulose_conc[-1]
-    hemicellulose_final = hemicellulose_conc[-1]
-    cellulose_degraded = (1 - cellulose_final/C0) * 100 if C0 > 0 else 0
-    hemicellulose_degraded = (1 - hemicellulose_final/H0) * 100 if H0 > 0 else 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cellulose_degraded = np.where(C0 > 0, (1 - cellulose_final/C0) * 100, 0.0)
+        hemicellulose_degraded = np.where(H0 > 0, (1 - hemicellulose_final/H0) * 100, 0.0)
 
     return {
         "time": t,
+        "concentrations": concentrations,
+        "species": SPECIES,
         "cellulose": cellulose_conc,
         "hemicellulose": hemicellulose_conc,
         "initial_cellulose": C0,
@@ -148,17 +656,20 @@ def create_hydrothermal_plot_data(results):
     """
     Prepara os dados da degradação hidrotérmica para plotagem.
     
+    Os arrays são visões dos resultados, sem conversão para listas.
+
     Args:
-        results (dict): Resultados da simulação
+        results (HydrothermalResult): Resultados da simulação
     
     Returns:
         dict: Dados formatados para plotagem
     """
     
     return {
-        "time": results["time"].tolist(),
-        "cellulose": results["cellulose"].tolist(),
-        "hemicellulose": results["hemicellulose"].tolist(),
+        "time": results["time"],
+        "cellulose": results["cellulose"],
+        "hemicellulose": results["hemicellulose"],
+        "species": {name: results[name] for name in SPECIES},
         "title": f'Degradação Hidrotérmica a {results["temperature"]}°C',
         "subtitle": f'Carga de sólidos: {results["solid_loading"]} g/L',
         "degradation_info": {
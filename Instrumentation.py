@@ -0,0 +1,213 @@
+# INSTRUMENTAÇÃO DAS SIMULAÇÕES
+# Tempo de cada etapa, avaliações de RHS/Jacobiano, passos do integrador,
+# trocas de método (rigidez) e acertos de cache. A coleta é opcional: sem um
+# Trace ativo, as funções instrumentadas rodam sem custo adicional.
+#
+# Uso:
+#   trace = Trace(sink=JsonLinesSink("metrics.jsonl"))
+#   with tracing(trace):
+#       simulate_enzymatic_hydrolysis(...)
+#   trace.stages  # uma entrada por etapa
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Trace ativo no contexto atual (thread ou sessão do app)
+_current_trace = ContextVar("simulation_trace", default=None)
+
+class JsonLinesSink:
+    """
+    Grava cada etapa concluída como uma linha JSON (formato JSON Lines).
+
+    O arquivo é aberto em modo de acréscimo a cada gravação, de modo que um
+    coletor local pode lê-lo (ou rotacioná-lo) a qualquer momento.
+
+    Args:
+        path (str): Caminho do arquivo .jsonl.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+class Trace:
+    """
+    Coleta as métricas das etapas executadas enquanto está ativo.
+
+    Cada etapa vira um dict com nome, etapa-mãe, tempo de parede (ms),
+    situação ("ok" ou "error") e os campos registrados pelo simulador
+    (avaliações, passos, acertos de cache...).
+
+    Seguro para múltiplas threads: cada thread tem sua pilha de etapas em
+    andamento (a etapa-mãe é sempre da mesma thread) e as etapas concluídas
+    são acrescentadas sob um lock.
+
+    Args:
+        sink (callable): Recebe cada etapa concluída (ex.: JsonLinesSink).
+        **labels: Campos acrescentados a todas as etapas (ex.: session).
+    """
+
+    def __init__(self, sink=None, **labels):
+        self.sink = sink
+        self.labels = labels
+        self.stages = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self):
+        """Etapas em andamento na thread atual."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def stage(self, name, **fields):
+        """Mede uma etapa; exceções são registradas e repassadas."""
+        stack = self._stack
+        record = {
+            **self.labels,
+            "stage": name,
+            "parent": stack[-1]["stage"] if stack else None,
+            "timestamp": time.time(),
+            "pid": os.getpid(),
+            **fields,
+        }
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+            record["status"] = "ok"
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["wall_time_ms"] = (time.perf_counter() - start) * 1e3
+            stack.pop()
+            with self._lock:
+                self.stages.append(record)
+            if self.sink is not None:
+                self.sink(record)
+
+    def record(self, **fields):
+        """Acrescenta campos à etapa em andamento; contagens são somadas."""
+        stack = self._stack
+        if not stack:
+            return
+        current = stack[-1]
+        for key, value in fields.items():
+            if key.startswith("n_") and key in current:
+                current[key] += value
+            else:
+                current[key] = value
+
+    def summary(self):
+        """
+        Totais por etapa.
+
+        Returns:
+            dict: Nome da etapa → chamadas, erros, tempo total (ms) e somas
+            dos contadores "n_*".
+        """
+        totals = {}
+        with self._lock:
+            stages = list(self.stages)
+        for record in stages:
+            entry = totals.setdefault(record["stage"], {"calls": 0, "errors": 0, "wall_time_ms": 0.0})
+            entry["calls"] += 1
+            entry["errors"] += record["status"] == "error"
+            entry["wall_time_ms"] += record["wall_time_ms"]
+            for key, value in record.items():
+                if key.startswith("n_") and isinstance(value, (int, float)):
+                    entry[key] = entry.get(key, 0) + value
+        return totals
+
+@contextmanager
+def tracing(trace):
+    """Ativa um Trace no contexto atual durante o bloco."""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+def activate(trace):
+    """
+    Ativa um Trace no contexto atual até deactivate(token).
+
+    Útil em scripts que não cabem em um bloco with (como o app).
+    """
+    return _current_trace.set(trace)
+
+def deactivate(token):
+    """Restaura o Trace anterior a activate."""
+    _current_trace.reset(token)
+
+def current_trace():
+    """Trace ativo ou None."""
+    return _current_trace.get()
+
+@contextmanager
+def stage(name, **fields):
+    """Mede uma etapa no Trace ativo (sem efeito quando não há Trace)."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    with trace.stage(name, **fields) as record:
+        yield record
+
+def record(**fields):
+    """Registra campos na etapa em andamento do Trace ativo, se houver."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record(**fields)
+
+def instrumented(name):
+    """
+    Decorador que mede cada chamada da função como uma etapa.
+
+    Sem Trace ativo a função é chamada diretamente.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is None:
+                return func(*args, **kwargs)
+            with trace.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def odeint_diagnostics(infodict):
+    """
+    Resume o full_output do odeint (LSODA).
+
+    Args:
+        infodict (dict): Segundo valor retornado por odeint(..., full_output=True).
+
+    Returns:
+        dict: Avaliações de RHS e Jacobiano, passos e trocas entre os
+        métodos não rígido (Adams) e rígido (BDF).
+    """
+    used = infodict["mused"]
+    return {
+        "n_rhs_evaluations": int(infodict["nfe"][-1]),
+        "n_jacobian_evaluations": int(infodict["nje"][-1]),
+        "n_steps": int(infodict["nst"][-1]),
+        "n_stiffness_switches": int((used[1:] != used[:-1]).sum()),
+    }
@@ -0,0 +1,351 @@
+# AJUSTE DAS CONSTANTES CINÉTICAS DO PRÉ-TRATAMENTO HIDROTÉRMICO
+# Reestima k1-k6 de cada sistema (hemicelulose e celulose) e temperatura a
+# partir de BEPE FAPESP/Pretreatment/experimental_data.csv, com resíduos
+# vetorizados, sensibilidades analíticas, múltiplos pontos de partida em
+# paralelo e intervalos de confiança
+#
+# Uso:
+#   python Kinetic_Fitting.py [experimental_data.csv] [--starts 16] [--workers 4]
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import expm
+from scipy.optimize import least_squares
+from scipy.stats import qmc, t as student_t
+
+from Hydrothermal_Pretreatment import (
+    _MAX_EIGVEC_COND, KINETIC_DATA_CELLULOSE, KINETIC_DATA_HEMICELLULOSE, _rate_matrix
+)
+
+EXPERIMENTAL_DATA = Path(__file__).resolve().parent / "BEPE FAPESP" / "Pretreatment" / "experimental_data.csv"
+
+# Espécies medidas de cada sistema: (índice no estado do sistema, coluna da tabela).
+# Estados: hemicelulose (H, XOS, MH, F, D) e celulose (C, GOS, MC, HMF, D).
+OBSERVED_SPECIES = {
+    "hemicellulose": ((1, "Xylooligomers [g/L]"), (2, "Xylose [g/L]"), (3, "Furfural [g/L]")),
+    "cellulose": ((1, "Glucooligomers [g/L]"), (2, "Glucose + Celobiose [g/L]"), (3, "HMF [g/L]")),
+}
+
+# Fração mássica do polímero de cada sistema na biomassa
+COMPOSITION_COLUMNS = {
+    "hemicellulose": "Hemicellulose Composition (%)",
+    "cellulose": "Cellulose Composition (%)",
+}
+
+# Constantes atuais do simulador, usadas como um dos pontos de partida
+CURRENT_PARAMETERS = {
+    "hemicellulose": KINETIC_DATA_HEMICELLULOSE,
+    "cellulose": KINETIC_DATA_CELLULOSE,
+}
+
+N_RATES = 6
+
+# Limites de busca das constantes (1/min)
+RATE_BOUNDS = (1e-5, 5.0)
+
+# ∂A/∂k_j: a matriz de taxas é linear em k
+_RATE_MATRIX_DERIVATIVES = _rate_matrix(np.eye(N_RATES))
+
+# =============================================================================
+# DADOS EXPERIMENTAIS
+# =============================================================================
+
+def load_experimental_data(path=EXPERIMENTAL_DATA):
+    """
+    Organiza os dados experimentais em problemas de ajuste independentes.
+
+    Cada temperatura e sistema forma um problema com 6 constantes. O estado
+    inicial usa o polímero da composição da biomassa e os produtos medidos
+    no tempo zero (o hidrolisado já contém açúcares antes do aquecimento).
+
+    Args:
+        path (Path): Tabela no formato de experimental_data.csv.
+
+    Returns:
+        list: Problemas (dict) com "system", "temperature", "time" (T,),
+        "observed" (T, 3), "observed_index" (3,) e "y0" (5,).
+    """
+    data = pd.read_csv(path, skipinitialspace=True)
+    data.columns = [c.strip() for c in data.columns]
+
+    problems = []
+    for temperature, group in data.groupby("Temperature [°C]", sort=True):
+        group = group.sort_values("Time [min]")
+        solid_loading = group["Solid Loading [g/L]"].iloc[0]
+        for system, observed in OBSERVED_SPECIES.items():
+            index = np.array([i for i, _ in observed])
+            values = group[[column for _, column in observed]].to_numpy(dtype=float)
+            y0 = np.zeros(5)
+            y0[0] = solid_loading * group[COMPOSITION_COLUMNS[system]].iloc[0]
+            y0[index] = values[0]
+            problems.append({
+                "system": system,
+                "temperature": float(temperature),
+                "time": group["Time [min]"].to_numpy(dtype=float),
+                "observed": values,
+                "observed_index": index,
+                "y0": y0,
+            })
+    return problems
+
+# =============================================================================
+# MODELO E SENSIBILIDADES
+# =============================================================================
+
+def simulate_with_sensitivities(log_k, y0, time):
+    """
+    Resolve o sistema linear e as sensibilidades em relação a ln k, exatamente.
+
+    Com A = V Λ V⁻¹, y(t) = V e^{Λt} V⁻¹ y0 e a derivada de e^{At} na
+    direção B_j = k_j ∂A/∂k_j é V (Φ(t) ∘ V⁻¹ B_j V) V⁻¹, com Φ as
+    diferenças divididas de e^{λt}. Todos os tempos e parâmetros são
+    avaliados em uma única expressão vetorizada. Quando a matriz de
+    autovetores é mal condicionada (autovalores quase repetidos), usa-se o
+    sistema aumentado com exponencial de matriz.
+
+    Args:
+        log_k (np.ndarray): ln das constantes k1-k6.
+        y0 (np.ndarray): Estado inicial (5,).
+        time (np.ndarray): Tempos (T,).
+
+    Returns:
+        tuple: (y, S) com formatos (T, 5) e (T, 6, 5), S_j = ∂y/∂ln k_j.
+    """
+    k = np.exp(log_k)
+    A = _rate_matrix(k)
+    B = k[:, None, None] * _RATE_MATRIX_DERIVATIVES
+
+    eigval, eigvec = np.linalg.eig(A)
+    eigval, eigvec = eigval.real, eigvec.real
+    if not np.linalg.cond(eigvec) < _MAX_EIGVEC_COND:
+        return _augmented_sensitivities(A, B, y0, time)
+
+    eigvec_inv = np.linalg.inv(eigvec)
+    coef = eigvec_inv @ y0
+    growth = np.exp(eigval[None, :] * time[:, None])                    # (T, 5)
+    y = (growth * coef) @ eigvec.T
+
+    # Φ[t, i, l] = (e^{λi t} - e^{λl t}) / (λi - λl), na forma estável
+    # e^{λl t} · t · expm1(x)/x, x = (λi - λl) t (→ t e^{λt} para λi = λl)
+    x = (eigval[:, None] - eigval[None, :]) * time[:, None, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(x == 0, 1.0, np.expm1(x) / x)
+    phi = growth[:, None, :] * time[:, None, None] * ratio             # (T, 5, 5)
+
+    B_modal = eigvec_inv @ B @ eigvec                                    # (6, 5, 5)
+    S_modal = (phi[:, None] * B_modal[None]) @ coef                      # (T, 6, 5)
+    return y, S_modal @ eigvec.T
+
+def _augmented_sensitivities(A, B, y0, time):
+    """
+    Estado e sensibilidades pelo sistema linear aumentado (5 + 6·5 estados),
+    S_j' = A S_j + B_j y, resolvido por exponencial de matriz.
+    """
+    size = 5 * (N_RATES + 1)
+
+    M = np.zeros((size, size))
+    for block in range(N_RATES + 1):
+        M[5 * block:5 * block + 5, 5 * block:5 * block + 5] = A
+    for j in range(N_RATES):
+        M[5 * (j + 1):5 * (j + 2), :5] = B[j]
+
+    z0 = np.zeros(size)
+    z0[:5] = y0
+    z = expm(time[:, None, None] * M) @ z0
+    return z[:, :5], z[:, 5:].reshape(len(time), N_RATES, 5)
+
+def _residual_scale(problem):
+    """Escala de cada espécie medida (resíduos adimensionais e comparáveis)."""
+    return np.maximum(np.abs(problem["observed"]).max(axis=0), 1e-3)
+
+def _residuals_from_solution(y, problem):
+    r = (y[:, problem["observed_index"]] - problem["observed"]) / _residual_scale(problem)
+    return r.reshape(-1)
+
+def _jacobian_from_sensitivities(S, problem):
+    J = S[:, :, problem["observed_index"]] / _residual_scale(problem)
+    return J.transpose(0, 2, 1).reshape(-1, N_RATES)
+
+def residuals(log_k, problem):
+    """
+    Resíduos (modelo - medida) de todas as espécies e tempos, vetorizados.
+
+    Returns:
+        np.ndarray: Resíduos escalados com formato (T·3,).
+    """
+    y, _ = simulate_with_sensitivities(log_k, problem["y0"], problem["time"])
+    return _residuals_from_solution(y, problem)
+
+def residual_jacobian(log_k, problem):
+    """
+    Jacobiano analítico dos resíduos em relação a ln k.
+
+    Returns:
+        np.ndarray: Jacobiano com formato (T·3, 6).
+    """
+    _, S = simulate_with_sensitivities(log_k, problem["y0"], problem["time"])
+    return _jacobian_from_sensitivities(S, problem)
+
+# =============================================================================
+# AJUSTE
+# =============================================================================
+
+def _fit_start(args):
+    """Um ajuste local a partir de um ponto inicial (executado nos processos do pool)."""
+    problem, log_k0 = args
+    lower, upper = np.log(RATE_BOUNDS)
+
+    # O least_squares pede resíduos e Jacobiano no mesmo ponto: uma única
+    # solução (estado + sensibilidades) atende os dois
+    last = {}
+
+    def solve(log_k):
+        if last.get("x") is None or not np.array_equal(last["x"], log_k):
+            last["x"] = np.array(log_k, copy=True)
+            last["y"], last["S"] = simulate_with_sensitivities(log_k, problem["y0"], problem["time"])
+        return last["y"], last["S"]
+
+    result = least_squares(
+        lambda log_k: _residuals_from_solution(solve(log_k)[0], problem),
+        np.clip(log_k0, lower, upper),
+        jac=lambda log_k: _jacobian_from_sensitivities(solve(log_k)[1], problem),
+        bounds=(lower, upper), method="trf", x_scale="jac"
+    )
+    return result.x, result.cost, result.nfev, result.njev
+
+def confidence_intervals(log_k, problem, level=0.95):
+    """
+    Intervalos de confiança das constantes pela aproximação linear.
+
+    Cov(ln k) = s² (JᵀJ)⁻¹, com s² a variância residual; o intervalo é
+    simétrico em ln k e, portanto, multiplicativo em k. Constantes que o
+    ajuste não consegue determinar (em geral as que ficam no limite de
+    busca) recebem intervalos muito largos, até [0, inf].
+
+    Returns:
+        tuple: (inferior, superior, erro padrão de ln k), arrays (6,).
+    """
+    r = residuals(log_k, problem)
+    J = residual_jacobian(log_k, problem)
+    dof = r.size - log_k.size
+    if dof <= 0:
+        nan = np.full(log_k.size, np.nan)
+        return nan, nan, nan
+    s2 = r @ r / dof
+    cov = s2 * np.linalg.pinv(J.T @ J)
+    se = np.sqrt(np.clip(np.diag(cov), 0, None))
+    half = student_t.ppf(0.5 + level / 2, dof) * se
+    with np.errstate(over="ignore"):
+        return np.exp(log_k - half), np.exp(log_k + half), se
+
+def _current_log_k(problem):
+    """ln das constantes atuais do simulador para o problema, se tabeladas."""
+    table = CURRENT_PARAMETERS[problem["system"]]
+    temperatures = table["Temperature (°C)"]
+    if problem["temperature"] not in temperatures:
+        return None
+    i = temperatures.index(problem["temperature"])
+    return np.log([table[f"k{j + 1} (1/min)"][i] for j in range(N_RATES)])
+
+def fit_kinetic_parameters(path=EXPERIMENTAL_DATA, n_starts=16, n_workers=None, level=0.95, seed=0):
+    """
+    Reestima k1-k6 para cada sistema e temperatura dos dados experimentais.
+
+    Cada problema é resolvido por mínimos quadrados (região de confiança)
+    a partir de vários pontos iniciais: as constantes atuais do simulador e
+    uma amostra de Sobol em ln k. Todos os ajustes locais são distribuídos
+    em um pool de processos e o de menor custo é mantido.
+
+    Args:
+        path (Path): Tabela no formato de experimental_data.csv.
+        n_starts (int): Pontos iniciais aleatórios por problema.
+        n_workers (int): Processos do pool (padrão: número de CPUs; 1
+            ajusta no próprio processo).
+        level (float): Nível de confiança dos intervalos.
+        seed (int): Semente para reprodutibilidade.
+
+    Returns:
+        dict: Por sistema ("hemicellulose", "cellulose"), tabelas no formato
+        de KINETIC_DATA_* com as constantes ajustadas ("parameters") e os
+        limites inferior/superior ("lower", "upper"), e o R² e a soma dos
+        quadrados dos resíduos por temperatura.
+    """
+    problems = load_experimental_data(path)
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    lower, upper = np.log(RATE_BOUNDS)
+    sampler = qmc.Sobol(d=N_RATES, seed=seed)
+    random_starts = qmc.scale(sampler.random(n_starts), [lower] * N_RATES, [upper] * N_RATES)
+
+    tasks, owners = [], []
+    for p, problem in enumerate(problems):
+        current = _current_log_k(problem)
+        starts = random_starts if current is None else np.vstack([current, random_starts])
+        tasks.extend((problem, start) for start in starts)
+        owners.extend([p] * len(starts))
+
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            fits = list(executor.map(_fit_start, tasks, chunksize=max(1, len(tasks) // (4 * n_workers))))
+    else:
+        fits = [_fit_start(task) for task in tasks]
+
+    best = {}
+    for p, fit in zip(owners, fits):
+        if p not in best or fit[1] < best[p][1]:
+            best[p] = fit
+
+    output = {}
+    for p, problem in enumerate(problems):
+        log_k, cost, _, _ = best[p]
+        low, high, _ = confidence_intervals(log_k, problem, level)
+        observed = problem["observed"]
+        y, _ = simulate_with_sensitivities(log_k, problem["y0"], problem["time"])
+        ss_res = float(((y[:, problem["observed_index"]] - observed) ** 2).sum())
+        ss_tot = float(((observed - observed.mean(axis=0)) ** 2).sum())
+
+        system = output.setdefault(problem["system"], {
+            key: {"Temperature (°C)": []} for key in ("parameters", "lower", "upper")
+        } | {"r_squared": [], "sum_squared_residuals": []})
+        for key, values in (("parameters", np.exp(log_k)), ("lower", low), ("upper", high)):
+            system[key]["Temperature (°C)"].append(problem["temperature"])
+            for j in range(N_RATES):
+                system[key].setdefault(f"k{j + 1} (1/min)", []).append(float(values[j]))
+        system["r_squared"].append(1 - ss_res / ss_tot if ss_tot > 0 else np.nan)
+        system["sum_squared_residuals"].append(ss_res)
+
+    output["n_local_fits"] = len(tasks)
+    output["n_residual_evaluations"] = int(sum(f[2] for f in fits))
+    return output
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reajusta as constantes cinéticas do pré-tratamento hidrotérmico.")
+    parser.add_argument("data", nargs="?", default=str(EXPERIMENTAL_DATA), help="Tabela de dados experimentais")
+    parser.add_argument("--starts", type=int, default=16, help="Pontos iniciais aleatórios por problema")
+    parser.add_argument("--workers", type=int, default=None, help="Processos do pool (padrão: número de CPUs)")
+    parser.add_argument("--level", type=float, default=0.95, help="Nível de confiança (padrão: 0.95)")
+    args = parser.parse_args(argv)
+
+    fitted = fit_kinetic_parameters(args.data, n_starts=args.starts, n_workers=args.workers, level=args.level)
+    pd.set_option("display.float_format", "{:.4g}".format)
+    for system in OBSERVED_SPECIES:
+        result = fitted[system]
+        table = pd.DataFrame(result["parameters"]).set_index("Temperature (°C)")
+        lower = pd.DataFrame(result["lower"]).set_index("Temperature (°C)")
+        upper = pd.DataFrame(result["upper"]).set_index("Temperature (°C)")
+        print(f"\n{system.capitalize()} (IC {args.level:.0%}):")
+        print(table.combine(lower, lambda k, lo: k.map("{:.4g}".format) + " [" + lo.map("{:.3g}".format))
+              .combine(upper, lambda s, hi: s + ", " + hi.map("{:.3g}".format) + "]").to_string())
+        print("R²: " + ", ".join(f"{r:.3f}" for r in result["r_squared"]))
+    print(f"\n{fitted['n_local_fits']} ajustes locais, {fitted['n_residual_evaluations']} avaliações de resíduos")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+# REGISTRO DOS MODELOS SUBSTITUTOS (SURROGATES) TREINADOS
+# Localiza os artefatos em BEPE FAPESP/Enzymatic Hydrolysis/, carrega cada um
+# apenas uma vez por processo e atende predições em lote
+
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from Instrumentation import instrumented, record
+
+# Pasta com os artefatos gerados pelos notebooks de hidrólise enzimática
+ARTIFACT_DIR = Path(__file__).resolve().parent / "BEPE FAPESP" / "Enzymatic Hydrolysis"
+
+# Entradas dos modelos, na ordem usada no treinamento
+INPUT_FEATURES = ("Cellulose", "Hemicellulose", "Lignin", "Solids_Loading", "Enzyme_Loading", "Time")
+
+# Artefatos de cada surrogate. "{ts}" é o carimbo de data/hora (AAAAMMDD_HHMMSS)
+# do arquivo; os scalers são pareados pelo mesmo carimbo do modelo quando
+# existe, senão pelo mais recente do mesmo tipo.
+SURROGATE_SPECS = {
+    "random_forest": {
+        "model": "optimized_model_Random_Forest_{ts}.pkl",
+        "scaler_X": "scaler_X_{ts}.pkl",
+        "scaler_y": "scaler_y_{ts}.pkl",
+        "outputs": ("Glucose", "Xylose", "Cellobiose"),
+    },
+    "ann_glucose": {
+        "model": "ann_glucose_final_{ts}.keras",
+        "scaler_X": "scaler_X_ann_{ts}.pkl",
+        "scaler_y": "scaler_y_ann_{ts}.pkl",
+        "outputs": ("Glucose", "Xylose"),
+    },
+}
+
+# Surrogate usado por padrão para cada alvo. As redes best_*_model.keras do
+# notebook Tensorflow Solution dependem de variáveis derivadas e de um
+# RobustScaler que não foram salvos, por isso não são servidas aqui; a rede
+# ann_glucose tem R² negativo nos dados reais (ann_report_*.json) e fica
+# disponível apenas pelo nome.
+TARGET_SURROGATES = {
+    "multioutput": "random_forest",
+    "glucose": "random_forest",
+    "xylose": "random_forest",
+    "cellobiose": "random_forest",
+}
+
+_TIMESTAMP = r"(?P<ts>\d{8}_\d{6})"
+
+def _glob_timestamped(directory, pattern):
+    """
+    Lista os arquivos que seguem um padrão com "{ts}", do mais novo ao mais antigo.
+
+    Returns:
+        list: Pares (carimbo, caminho) ordenados por carimbo decrescente.
+    """
+    regex = re.compile(re.escape(pattern).replace(re.escape("{ts}"), _TIMESTAMP) + "$")
+    found = []
+    for path in directory.glob(pattern.replace("{ts}", "*")):
+        match = regex.match(path.name)
+        if match:
+            found.append((match.group("ts"), path))
+    return sorted(found, reverse=True)
+
+def discover_artifacts(name, directory=ARTIFACT_DIR, timestamp=None):
+    """
+    Encontra o conjunto de artefatos mais recente de um surrogate.
+
+    Args:
+        name (str): Nome do surrogate em SURROGATE_SPECS.
+        directory (Path): Pasta dos artefatos.
+        timestamp (str): Carimbo de um modelo específico (padrão: o mais recente).
+
+    Returns:
+        dict: Caminhos de "model", "scaler_X" e "scaler_y" e o carimbo do modelo.
+    """
+    spec = SURROGATE_SPECS[name]
+    models = [(ts, path) for ts, path in _glob_timestamped(Path(directory), spec["model"])
+              if timestamp is None or ts == timestamp]
+    if not models:
+        raise FileNotFoundError(f"Nenhum artefato encontrado para o modelo '{name}' em {directory}")
+    timestamp, model_path = models[0]
+
+    artifacts = {"model": model_path, "timestamp": timestamp}
+    for key in ("scaler_X", "scaler_y"):
+        candidates = dict(_glob_timestamped(Path(directory), spec[key]))
+        if not candidates:
+            raise FileNotFoundError(f"Scaler '{key}' não encontrado para o modelo '{name}' em {directory}")
+        artifacts[key] = candidates.get(timestamp, candidates[max(candidates)])
+    return artifacts
+
+def _affine_from_scaler(scaler):
+    """
+    Converte um scaler do scikit-learn em transformação afim x·a + b.
+
+    Returns:
+        tuple: (a, b) arrays por coluna.
+    """
+    kind = type(scaler).__name__
+    if kind == "StandardScaler":
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones_like(scaler.mean_)
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros_like(scale)
+        return 1.0 / scale, -mean / scale
+    if kind == "MinMaxScaler":
+        return scaler.scale_, scaler.min_
+    raise TypeError(f"Scaler não suportado: {kind}")
+
+class Surrogate:
+    """
+    Modelo treinado com seus scalers, pronto para predição em lote.
+
+    Os scalers são aplicados como transformações afins em NumPy, sem
+    passar pelo scikit-learn a cada chamada. Sem scalers (None), o modelo
+    já os incorpora (ForestModel) e recebe as entradas originais.
+    """
+
+    def __init__(self, name, model, scaler_X, scaler_y, outputs, artifacts):
+        self.name = name
+        self.model = model
+        self.outputs = outputs
+        self.artifacts = artifacts
+        if scaler_X is None:
+            self.features = model.features
+            self._x_scale, self._x_shift = 1.0, 0.0
+            self._y_scale, self._y_shift = 1.0, 0.0
+            return
+        self.features = tuple(getattr(scaler_X, "feature_names_in_", INPUT_FEATURES))
+        self._x_scale, self._x_shift = _affine_from_scaler(scaler_X)
+        y_scale, y_shift = _affine_from_scaler(scaler_y)
+        # Inversa de y·a + b
+        self._y_scale, self._y_shift = 1.0 / y_scale, -y_shift / y_scale
+
+    def __repr__(self):
+        return f"Surrogate(name={self.name!r}, outputs={self.outputs}, timestamp={self.artifacts['timestamp']!r})"
+
+    def _as_array(self, X):
+        """Aceita DataFrame (reordenado pelas colunas de treino) ou array (n, 6)."""
+        if hasattr(X, "columns"):
+            X = X[list(self.features)].to_numpy()
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != len(self.features):
+            raise ValueError(f"Esperadas {len(self.features)} variáveis de entrada: {self.features}")
+        return X
+
+    def predict(self, X):
+        """
+        Prediz as saídas para um lote de condições.
+
+        Args:
+            X (array ou DataFrame): Entradas com formato (n, 6), na ordem de
+                INPUT_FEATURES (ou DataFrame com essas colunas).
+
+        Returns:
+            np.ndarray: Predições com formato (n, len(outputs)), em g/L.
+        """
+        X_scaled = self._as_array(X) * self._x_scale + self._x_shift
+        y_scaled = np.asarray(self.model.predict(X_scaled), dtype=float).reshape(len(X_scaled), -1)
+        return y_scaled * self._y_scale + self._y_shift
+
+def _load_joblib(path):
+    import joblib
+
+    return joblib.load(path)
+
+def _load_keras(path):
+    # TensorFlow só é importado quando uma rede é de fato usada
+    from tensorflow import keras
+
+    model = keras.models.load_model(path, compile=False)
+
+    class _KerasPredictor:
+        def predict(self, X):
+            return model.predict(X, verbose=0)
+
+    return _KerasPredictor()
+
+_LOADERS = {".pkl": _load_joblib, ".keras": _load_keras, ".h5": _load_keras}
+
+def _load_forest(artifacts):
+    """Floresta exportada do pickle (Forest_Inference.py), se existir e corresponder aos artefatos."""
+    from Forest_Inference import ForestModel, forest_path
+
+    return ForestModel.load(
+        forest_path(artifacts["model"]), sources={key: artifacts[key] for key in ("model", "scaler_X", "scaler_y")}
+    )
+
+class ModelRegistry:
+    """
+    Registro de surrogates com carregamento preguiçoso e único por processo.
+
+    Nada é lido do disco na criação; cada surrogate é carregado no primeiro
+    uso (com joblib ou keras importados apenas nesse momento) e reutilizado
+    nas chamadas seguintes.
+
+    Args:
+        directory (Path): Pasta dos artefatos.
+    """
+
+    def __init__(self, directory=ARTIFACT_DIR):
+        self.directory = Path(directory)
+        self._surrogates = {}
+        self._lock = threading.Lock()
+
+    def available(self):
+        """
+        Surrogates cujos artefatos existem na pasta.
+
+        Returns:
+            dict: Nome do surrogate → artefatos mais recentes.
+        """
+        found = {}
+        for name in SURROGATE_SPECS:
+            try:
+                found[name] = discover_artifacts(name, self.directory)
+            except FileNotFoundError:
+                continue
+        return found
+
+    def get(self, name):
+        """
+        Retorna um surrogate pelo nome, carregando-o se necessário.
+
+        Args:
+            name (str): Nome em SURROGATE_SPECS ou alvo em TARGET_SURROGATES.
+
+        Returns:
+            Surrogate: Modelo pronto para predição.
+        """
+        name = TARGET_SURROGATES.get(name, name)
+        if name not in SURROGATE_SPECS:
+            raise KeyError(f"Modelo desconhecido: {name}")
+
+        surrogate = self._surrogates.get(name)
+        if surrogate is not None:
+            return surrogate
+
+        with self._lock:
+            if name not in self._surrogates:
+                artifacts = discover_artifacts(name, self.directory)
+                outputs = SURROGATE_SPECS[name]["outputs"]
+                # Florestas exportadas abrem sem deserializar o scikit-learn
+                forest = _load_forest(artifacts) if artifacts["model"].suffix == ".pkl" else None
+                if forest is not None:
+                    surrogate = Surrogate(name, forest, None, None, outputs, {**artifacts, "forest": forest.path})
+                else:
+                    surrogate = Surrogate(
+                        name,
+                        _LOADERS[artifacts["model"].suffix](artifacts["model"]),
+                        _load_joblib(artifacts["scaler_X"]),
+                        _load_joblib(artifacts["scaler_y"]),
+                        outputs,
+                        artifacts,
+                    )
+                self._surrogates[name] = surrogate
+            return self._surrogates[name]
+
+    @instrumented("surrogate")
+    def predict(self, X, target="multioutput"):
+        """
+        Predição em lote para um alvo.
+
+        Args:
+            X (array ou DataFrame): Entradas com formato (n, 6).
+            target (str): "glucose", "xylose", "cellobiose", "multioutput" ou
+                o nome de um surrogate.
+
+        Returns:
+            np.ndarray: (n,) para um alvo único ou (n, saídas) para os demais.
+        """
+        surrogate = self.get(target)
+        y = surrogate.predict(X)
+        record(model=surrogate.name, n_rows=len(y))
+        column = target.capitalize()
+        if column in surrogate.outputs and target in TARGET_SURROGATES:
+            return y[:, surrogate.outputs.index(column)]
+        return y
+
+@lru_cache(maxsize=None)
+def get_registry():
+    """Registro compartilhado do processo."""
+    return ModelRegistry()
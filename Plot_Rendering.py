@@ -0,0 +1,356 @@
+# GRÁFICOS LEVES DOS RESULTADOS DE SIMULAÇÃO
+# Monta especificações de figura (dicts no formato do plotly) com curvas
+# reduzidas por LTTB, arrays float32 e traços WebGL para sobreposições
+# grandes. As especificações não dependem do plotly e podem ser guardadas
+# no cache de simulação; o plotly só é importado em to_figure.
+#
+# Com plotly >= 6, arrays NumPy são enviados ao navegador como arrays
+# tipados em base64: float32 ocupa metade de float64 e nada vira lista.
+
+import numpy as np
+
+# Pontos máximos por curva depois da redução
+DEFAULT_MAX_POINTS = 400
+
+# Total de pontos de uma sobreposição; com muitos traços, cada um recebe
+# uma fração deste orçamento (mas nunca menos que MIN_POINTS_PER_TRACE)
+DEFAULT_POINT_BUDGET = 20_000
+MIN_POINTS_PER_TRACE = 50
+
+# A partir deste total de pontos na figura os traços usam WebGL (scattergl)
+WEBGL_MIN_POINTS = 2_000
+
+# Com mais traços que isso, o hover passa a mostrar só a curva mais próxima
+UNIFIED_HOVER_MAX_TRACES = 12
+
+# Paleta qualitativa padrão do plotly
+PALETTE = (
+    "#636EFA", "#EF553B", "#00CC96", "#AB63FA", "#FFA15A",
+    "#19D3F3", "#FF6692", "#B6E880", "#FF97FF", "#FECB52",
+)
+
+# Estilos de linha disponíveis no plotly (ciclados entre espécies)
+DASHES = ("solid", "dash", "dot", "dashdot", "longdash", "longdashdot")
+
+# Símbolos dos pontos medidos (ciclados entre espécies, como DASHES)
+SYMBOLS = ("circle", "diamond", "square", "triangle-up", "x", "cross")
+
+# Rótulos das espécies do pré-tratamento hidrotérmico
+SPECIES_LABELS = {
+    "hemicellulose": "Hemicellulose",
+    "xos": "XOS",
+    "xylose": "Xylose",
+    "furfural": "Furfural",
+    "hemicellulose_degradation": "Hemicellulose degradation",
+    "cellulose": "Cellulose",
+    "gos": "GOS",
+    "glucose": "Glucose",
+    "hmf": "HMF",
+    "cellulose_degradation": "Cellulose degradation",
+}
+
+# =============================================================================
+# REDUÇÃO DE PONTOS (LTTB)
+# =============================================================================
+
+def lttb_indices(x, y, n_out):
+    """
+    Índices escolhidos pelo Largest-Triangle-Three-Buckets.
+
+    Mantém o primeiro e o último ponto e, em cada um dos n_out - 2 baldes
+    intermediários, o ponto que forma o maior triângulo com o ponto já
+    escolhido no balde anterior e a média do balde seguinte. Picos, vales e
+    mudanças de inclinação são preservados.
+
+    Várias séries sobre as mesmas abscissas (linhas de y) são reduzidas
+    juntas: o laço percorre os baldes uma única vez para todas elas.
+
+    Args:
+        x (array): Abscissas crescentes, shape (n,).
+        y (array): Ordenadas, shape (n,) ou (n_series, n).
+        n_out (int): Número de pontos desejado.
+
+    Returns:
+        ndarray: Índices crescentes dos pontos mantidos, com o mesmo número
+        de dimensões de y.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    rows = np.atleast_2d(y)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        indices = np.broadcast_to(np.arange(n), rows.shape)
+        return indices.reshape(y.shape[:-1] + (n,)).copy()
+
+    # Limites dos baldes intermediários; o último "balde seguinte" é o ponto final
+    edges = np.append(np.linspace(1, n - 1, n_out - 1).astype(int), n)
+    # Médias de cada balde (o balde seguinte do balde i é o i + 1)
+    x_mean = np.add.reduceat(x, edges[:-1]) / np.diff(edges)
+    y_mean = np.add.reduceat(rows, edges[:-1], axis=1) / np.diff(edges)
+
+    indices = np.empty((len(rows), n_out), dtype=int)
+    indices[:, 0], indices[:, -1] = 0, n - 1
+    selected = np.zeros(len(rows), dtype=int)
+    series = np.arange(len(rows))
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        xa = x[selected][:, None]
+        ya = rows[series, selected][:, None]
+        area = np.abs((xa - x_mean[i + 1]) * (rows[:, start:stop] - ya)
+                      - (xa - x[start:stop]) * (y_mean[:, i + 1, None] - ya))
+        selected = start + area.argmax(axis=1)
+        indices[:, i + 1] = selected
+    return indices if y.ndim > 1 else indices[0]
+
+def downsample(x, y, max_points=DEFAULT_MAX_POINTS):
+    """
+    Reduz curvas a no máximo max_points pontos preservando sua forma.
+
+    Args:
+        x (array): Abscissas crescentes, shape (n,).
+        y (array): Ordenadas, shape (n,) ou (n_series, n).
+        max_points (int): Pontos máximos na saída.
+
+    Returns:
+        tuple: (x, y) em float32, com o shape de y (cada série tem suas
+        próprias abscissas mantidas).
+    """
+    indices = lttb_indices(x, y, max_points)
+    y = np.asarray(y)
+    kept = np.take_along_axis(y, indices, axis=-1) if y.ndim > 1 else y[indices]
+    return np.asarray(x)[indices].astype(np.float32), kept.astype(np.float32)
+
+# =============================================================================
+# ESPECIFICAÇÕES DE FIGURA
+# =============================================================================
+
+def _trace(x, y, name, color=None, width=3, dash=None, **extra):
+    """Dict de um traço de linha com a curva já reduzida."""
+    line = {"width": width}
+    if color is not None:
+        line["color"] = color
+    if dash is not None:
+        line["dash"] = dash
+    return {"x": x, "y": y, "mode": "lines", "name": name, "line": line, **extra}
+
+def line_trace(x, y, name, color=None, width=3, dash=None, max_points=DEFAULT_MAX_POINTS, **extra):
+    """
+    Traço de linha reduzido, com arrays float32.
+
+    Args:
+        x, y (array): Curva completa.
+        name (str): Nome na legenda.
+        color (str): Cor da linha.
+        width (float): Espessura da linha.
+        dash (str): Estilo da linha ("dash", "dot"...).
+        max_points (int): Pontos máximos após a redução.
+        **extra: Demais atributos do traço (ex.: legendgroup).
+
+    Returns:
+        dict: Traço no formato do plotly (o tipo é definido em figure_spec).
+    """
+    x, y = downsample(x, y, max_points)
+    return _trace(x, y, name, color=color, width=width, dash=dash, **extra)
+
+def line_traces(x, curves, max_points=DEFAULT_MAX_POINTS):
+    """
+    Vários traços sobre as mesmas abscissas, reduzidos em uma só passada.
+
+    Args:
+        x (array): Abscissas compartilhadas.
+        curves (list): Dicts com "y" e os argumentos de line_trace (name,
+            color, width, dash...).
+        max_points (int): Pontos máximos por curva.
+
+    Returns:
+        list: Traços no formato do plotly.
+    """
+    if not curves:
+        return []
+    xs, ys = downsample(x, np.stack([curve["y"] for curve in curves]), max_points)
+    return [
+        _trace(x_row, y_row, **{k: v for k, v in curve.items() if k != "y"})
+        for x_row, y_row, curve in zip(xs, ys, curves)
+    ]
+
+def marker_trace(x, y, name, color=None, symbol="circle", size=8, **extra):
+    """
+    Traço de pontos medidos, sem redução (as tabelas experimentais são
+    pequenas), com arrays float32.
+
+    Args:
+        x, y (array): Pontos medidos.
+        name (str): Nome na legenda.
+        color (str): Cor dos marcadores.
+        symbol (str): Símbolo do plotly ("circle", "diamond"...).
+        size (float): Tamanho dos marcadores.
+        **extra: Demais atributos do traço (ex.: legendgroup).
+
+    Returns:
+        dict: Traço no formato do plotly.
+    """
+    marker = {"size": size, "symbol": symbol}
+    if color is not None:
+        marker["color"] = color
+    return {"x": np.asarray(x, dtype=np.float32), "y": np.asarray(y, dtype=np.float32), "mode": "markers",
+            "name": name, "marker": marker, **extra}
+
+def _with_alpha(color, alpha):
+    """Cor hexadecimal (#RRGGBB) com transparência, no formato rgba."""
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgba({r}, {g}, {b}, {alpha})"
+
+def band_trace(x, lower, upper, name, color, opacity=0.2, max_points=DEFAULT_MAX_POINTS, **extra):
+    """
+    Faixa sombreada entre duas curvas (ex.: faixa de predição).
+
+    A faixa é um único polígono (limite inferior seguido do superior ao
+    contrário), com cada limite reduzido separadamente.
+
+    Args:
+        x (array): Abscissas crescentes.
+        lower, upper (array): Limites inferior e superior.
+        name (str): Nome na legenda.
+        color (str): Cor hexadecimal (#RRGGBB).
+        opacity (float): Opacidade do preenchimento.
+        max_points (int): Pontos máximos por limite.
+        **extra: Demais atributos do traço (ex.: legendgroup).
+
+    Returns:
+        dict: Traço no formato do plotly.
+    """
+    xs, ys = downsample(x, np.stack([lower, upper]), max_points)
+    return {
+        "x": np.concatenate([xs[0], xs[1][::-1]]),
+        "y": np.concatenate([ys[0], ys[1][::-1]]),
+        "mode": "lines",
+        "fill": "toself",
+        "fillcolor": _with_alpha(color, opacity),
+        "line": {"width": 0},
+        "hoverinfo": "skip",
+        "name": name,
+        **extra,
+    }
+
+def figure_spec(traces, title, x_title, y_title, hovermode=None):
+    """
+    Especificação de figura a partir de traços de line_trace.
+
+    Figuras com WEBGL_MIN_POINTS pontos ou mais usam scattergl; o hover
+    unificado por x é trocado pelo ponto mais próximo quando há muitos
+    traços.
+
+    Args:
+        traces (list): Traços de line_trace.
+        title (str): Título do gráfico.
+        x_title, y_title (str): Títulos dos eixos.
+        hovermode (str): Modo de hover (padrão: automático).
+
+    Returns:
+        dict: {"data": [...], "layout": {...}}, aceito por go.Figure e
+        st.plotly_chart.
+    """
+    n_points = sum(len(trace["x"]) for trace in traces)
+    trace_type = "scattergl" if n_points >= WEBGL_MIN_POINTS else "scatter"
+    if hovermode is None:
+        hovermode = "x unified" if len(traces) <= UNIFIED_HOVER_MAX_TRACES else "closest"
+    return {
+        "data": [{"type": trace_type, **trace} for trace in traces],
+        "layout": {
+            "title": {"text": title},
+            "xaxis": {"title": {"text": x_title}},
+            "yaxis": {"title": {"text": y_title}},
+            "hovermode": hovermode,
+        },
+    }
+
+def points_per_trace(n_traces, max_points=DEFAULT_MAX_POINTS, point_budget=DEFAULT_POINT_BUDGET):
+    """Pontos por traço para que a figura caiba no orçamento total."""
+    return max(min(max_points, point_budget // max(n_traces, 1)), MIN_POINTS_PER_TRACE)
+
+def timecourse_spec(result, series, title, x_title="Time", y_title="Concentration (g/L)", width=3,
+                    max_points=DEFAULT_MAX_POINTS):
+    """
+    Curvas no tempo de um único resultado.
+
+    Args:
+        result (Mapping): Resultado de simulação com "time" e as séries.
+        series (list): Tuplas (chave, rótulo, cor); cor pode ser None.
+        title, x_title, y_title (str): Títulos.
+        width (float): Espessura das linhas.
+        max_points (int): Pontos máximos por curva.
+
+    Returns:
+        dict: Especificação de figura.
+    """
+    curves = [{"y": result[key], "name": label, "color": color, "width": width} for key, label, color in series]
+    return figure_spec(line_traces(result["time"], curves, max_points), title, x_title, y_title)
+
+def scenario_overlay_spec(scenarios, species, title, x_title="Time (min)", y_title="Concentration (g/L)",
+                          max_points=DEFAULT_MAX_POINTS, point_budget=DEFAULT_POINT_BUDGET, bands=None,
+                          measured=None):
+    """
+    Sobreposição de vários cenários e espécies em uma única figura.
+
+    Com um só cenário, cada espécie tem sua cor. Com vários, a cor
+    identifica o cenário e o estilo de linha a espécie; os traços de um
+    cenário compartilham o grupo da legenda. Cada traço é reduzido para que
+    o total caiba em point_budget.
+
+    Args:
+        scenarios (list): Tuplas (rótulo, resultado).
+        species (list): Chaves das séries a mostrar (ex.: SPECIES).
+        title, x_title, y_title (str): Títulos.
+        max_points (int): Pontos máximos por curva.
+        point_budget (int): Total de pontos da figura.
+        bands (list): Faixas de predição por cenário (resultado de
+            prediction_bands ou None), desenhadas sob as curvas.
+        measured (list): Pontos experimentais por cenário (dict com "time"
+            e as espécies medidas, ou None), desenhados como marcadores na
+            cor da curva.
+
+    Returns:
+        dict: Especificação de figura.
+    """
+    n_traces = len(scenarios) * len(species)
+    per_trace = points_per_trace(n_traces, max_points, point_budget)
+    width = 3 if n_traces <= UNIFIED_HOVER_MAX_TRACES else 1.5
+    traces = []
+    for i, (label, result) in enumerate(scenarios):
+        curves = []
+        for j, name in enumerate(species):
+            species_label = SPECIES_LABELS.get(name, name)
+            if len(scenarios) == 1:
+                style = {"name": species_label, "color": PALETTE[j % len(PALETTE)]}
+            else:
+                style = {
+                    "name": f"{label} · {species_label}" if len(species) > 1 else label,
+                    "color": PALETTE[i % len(PALETTE)],
+                    "dash": DASHES[j % len(DASHES)],
+                }
+            curves.append({"y": result[name], "width": width, "legendgroup": label, **style})
+            band = bands[i] if bands else None
+            if band is not None and name in band["lower"]:
+                traces.append(band_trace(
+                    band["time"], band["lower"][name], band["upper"][name],
+                    f"{style['name']} ({band['level']:.0%} band)", style["color"],
+                    max_points=per_trace, legendgroup=label
+                ))
+        traces.extend(line_traces(result["time"], curves, per_trace))
+        points = measured[i] if measured else None
+        if points is not None:
+            traces.extend(
+                marker_trace(points["time"], points[name], f"{curve['name']} (measured)", curve["color"],
+                             symbol=SYMBOLS[j % len(SYMBOLS)], legendgroup=label)
+                for j, (name, curve) in enumerate(zip(species, curves)) if name in points
+            )
+    return figure_spec(traces, title, x_title, y_title)
+
+def spec_nbytes(spec):
+    """Bytes dos arrays de uma especificação (o que vai ao navegador)."""
+    return sum(trace["x"].nbytes + trace["y"].nbytes for trace in spec["data"])
+
+def to_figure(spec):
+    """Converte uma especificação em go.Figure (requer plotly)."""
+    from plotly import graph_objs as go
+    return go.Figure(spec)
@@ -0,0 +1,258 @@
+# PIPELINE INCREMENTAL PRÉ-TRATAMENTO → HIDRÓLISE → FERMENTAÇÃO
+# Cada etapa guarda a impressão digital (fingerprint) das suas entradas e da
+# etapa anterior; apenas as etapas a jusante de uma mudança são recalculadas
+
+import hashlib
+import json
+from dataclasses import asdict, is_dataclass
+
+import numpy as np
+
+from Enzymatic_Hydrolysis import simulate_enzymatic_hydrolysis
+from Fermentation import DEFAULT_PARAMETERS, simulate_fermentation
+from Hydrothermal_Pretreatment import simulate_hydrothermal_degradation
+from Instrumentation import stage as trace_stage
+from Simulation_Cache import cached_hydrothermal_degradation
+
+# Etapas na ordem do processo
+PIPELINE_STAGES = ("pretreatment", "hydrolysis", "fermentation")
+
+def _jsonable(value):
+    """Converte entradas de etapa (dataclasses, arrays, escalares NumPy) para JSON."""
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Entrada não suportada no fingerprint: {type(value).__name__}")
+
+def fingerprint(stage, inputs, upstream=None):
+    """
+    Impressão digital das entradas de uma etapa.
+
+    Args:
+        stage (str): Nome da etapa.
+        inputs (dict): Entradas próprias da etapa.
+        upstream (str): Fingerprint da etapa anterior (None na primeira).
+
+    Returns:
+        str: Hash hexadecimal; muda sempre que a etapa ou qualquer etapa a
+        montante muda.
+    """
+    payload = json.dumps([stage, upstream, inputs], sort_keys=True, default=_jsonable)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+def pretreated_solid_composition(pretreatment, lignin_fraction):
+    """
+    Composição do sólido pré-tratado que alimenta a hidrólise.
+
+    A celulose e a hemicelulose remanescentes vêm da simulação; lignina e
+    demais componentes (cinzas, extrativos) são considerados inertes no
+    pré-tratamento hidrotérmico.
+
+    Args:
+        pretreatment (HydrothermalResult): Resultado do pré-tratamento.
+        lignin_fraction (float): Fração mássica de lignina na biomassa (0-1).
+
+    Returns:
+        dict: Frações mássicas (0-1) de "cellulose", "hemicellulose",
+        "lignin" e "other" no sólido, e a massa de sólido remanescente
+        "solid_recovery" (fração da carga inicial).
+    """
+    solid_loading = pretreatment.solid_loading
+    cellulose = pretreatment.final_cellulose
+    hemicellulose = pretreatment.final_hemicellulose
+    lignin = lignin_fraction * solid_loading
+    other = max(solid_loading - pretreatment.initial_cellulose - pretreatment.initial_hemicellulose - lignin, 0.0)
+
+    total = cellulose + hemicellulose + lignin + other
+    if total <= 0:
+        raise ValueError("Não há sólido remanescente após o pré-tratamento")
+    return {
+        "cellulose": float(cellulose / total),
+        "hemicellulose": float(hemicellulose / total),
+        "lignin": float(lignin / total),
+        "other": float(other / total),
+        "solid_recovery": float(total / solid_loading),
+    }
+
+class ProcessPipeline:
+    """
+    Cadeia pré-tratamento hidrotérmico → hidrólise enzimática → fermentação.
+
+    Cada etapa memoriza o último resultado junto com o fingerprint das suas
+    entradas, que inclui o fingerprint da etapa anterior. Ao chamar uma
+    etapa com as mesmas entradas e o mesmo montante, o resultado é
+    reutilizado; mudar um parâmetro da fermentação, por exemplo, não
+    resolve de novo o pré-tratamento nem a hidrólise.
+
+    Um objeto por sessão do app. O pré-tratamento também pode usar o cache
+    compartilhado do processo (SimulationCache), reaproveitando resultados
+    entre sessões.
+
+    Args:
+        cache (SimulationCache): Cache compartilhado para o pré-tratamento
+            (opcional).
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._stages = {}
+        self.computations = dict.fromkeys(PIPELINE_STAGES, 0)
+        self.reuses = dict.fromkeys(PIPELINE_STAGES, 0)
+
+    def _run_stage(self, stage, inputs, upstream, compute):
+        """Retorna o resultado memorizado da etapa ou o recalcula."""
+        key = fingerprint(stage, inputs, upstream)
+        memo = self._stages.get(stage)
+        if memo is not None and memo["fingerprint"] == key:
+            self.reuses[stage] += 1
+            return memo["result"]
+
+        with trace_stage(f"pipeline.{stage}", fingerprint=key):
+            result = compute()
+        self._stages[stage] = {"fingerprint": key, "result": result}
+        self.computations[stage] += 1
+        # Resultados a jusante calculados sobre o montante antigo deixam de valer
+        for downstream in PIPELINE_STAGES[PIPELINE_STAGES.index(stage) + 1:]:
+            self._stages.pop(downstream, None)
+        return result
+
+    def _upstream(self, stage):
+        """Fingerprint e resultado memorizados da etapa anterior."""
+        previous = PIPELINE_STAGES[PIPELINE_STAGES.index(stage) - 1]
+        memo = self._stages.get(previous)
+        if memo is None:
+            raise RuntimeError(f"Etapa '{previous}' deve ser executada antes de '{stage}'")
+        return memo["fingerprint"], memo["result"]
+
+    def pretreatment(self, temperature, solid_loading, cellulose_fraction, hemicellulose_fraction,
+                     lignin_fraction, time_final):
+        """
+        Etapa de pré-tratamento hidrotérmico.
+
+        Args:
+            temperature (float): Temperatura em °C (180-210).
+            solid_loading (float): Carga de sólidos em g/L.
+            cellulose_fraction (float): Fração mássica de celulose (0-1).
+            hemicellulose_fraction (float): Fração mássica de hemicelulose (0-1).
+            lignin_fraction (float): Fração mássica de lignina (0-1).
+            time_final (float): Tempo de pré-tratamento em minutos.
+
+        Returns:
+            dict: "result" (HydrothermalResult) e "composition" do sólido
+            pré-tratado (pretreated_solid_composition).
+        """
+        inputs = {
+            "temperature": float(temperature),
+            "solid_loading": float(solid_loading),
+            "cellulose_fraction": float(cellulose_fraction),
+            "hemicellulose_fraction": float(hemicellulose_fraction),
+            "lignin_fraction": float(lignin_fraction),
+            "time_final": float(time_final),
+        }
+
+        def compute():
+            simulation_inputs = {k: v for k, v in inputs.items() if k != "lignin_fraction"}
+            if self.cache is not None:
+                result = cached_hydrothermal_degradation(self.cache, **simulation_inputs)
+            else:
+                result = simulate_hydrothermal_degradation(**simulation_inputs)
+            return {"result": result, "composition": pretreated_solid_composition(result, lignin_fraction)}
+
+        return self._run_stage("pretreatment", inputs, None, compute)
+
+    def hydrolysis(self, solid_loading, enzyme_loading, time_final=96.0, n_points=97, params=None):
+        """
+        Etapa de hidrólise enzimática do sólido pré-tratado.
+
+        A composição do sólido vem da etapa de pré-tratamento.
+
+        Args:
+            solid_loading (float): Carga de sólido pré-tratado (g/L).
+            enzyme_loading (float): Carga de enzima (g/L).
+            time_final (float): Tempo de reação (h).
+            n_points (int): Número de pontos no tempo.
+            params (dict): Parâmetros do modelo (padrão: ANGARITA_2015_PARAMETERS).
+
+        Returns:
+            dict: Resultado de simulate_enzymatic_hydrolysis.
+        """
+        upstream, pretreated = self._upstream("hydrolysis")
+        inputs = {
+            "solid_loading": float(solid_loading),
+            "enzyme_loading": float(enzyme_loading),
+            "time_final": float(time_final),
+            "n_points": int(n_points),
+            "params": params,
+        }
+        composition = pretreated["composition"]
+        return self._run_stage("hydrolysis", inputs, upstream, lambda: simulate_enzymatic_hydrolysis(
+            cellulose_fraction=composition["cellulose"],
+            hemicellulose_fraction=composition["hemicellulose"],
+            solid_loading=solid_loading,
+            enzyme_loading=enzyme_loading,
+            time_final=time_final,
+            n_points=n_points,
+            params=params
+        ))
+
+    def fermentation(self, biomass, params=DEFAULT_PARAMETERS, time_final=72.0, n_points=73):
+        """
+        Etapa de fermentação do hidrolisado.
+
+        Glicose e xilose iniciais são as concentrações finais da hidrólise.
+
+        Args:
+            biomass (float): Concentração inicial de células (g/L).
+            params (FermentationParameters): Parâmetros cinéticos.
+            time_final (float): Tempo de fermentação (h).
+            n_points (int): Número de pontos no tempo.
+
+        Returns:
+            dict: Resultado de simulate_fermentation.
+        """
+        upstream, hydrolysate = self._upstream("fermentation")
+        inputs = {
+            "biomass": float(biomass),
+            "params": params,
+            "time_final": float(time_final),
+            "n_points": int(n_points),
+        }
+        return self._run_stage("fermentation", inputs, upstream, lambda: simulate_fermentation(
+            biomass=biomass,
+            glucose=hydrolysate["glucose"][-1],
+            xylose=hydrolysate["xylose"][-1],
+            params=params,
+            time_final=time_final,
+            n_points=n_points
+        ))
+
+    def run(self, pretreatment, hydrolysis, fermentation):
+        """
+        Executa a cadeia completa, recalculando só o necessário.
+
+        Args:
+            pretreatment (dict): Argumentos de ProcessPipeline.pretreatment.
+            hydrolysis (dict): Argumentos de ProcessPipeline.hydrolysis.
+            fermentation (dict): Argumentos de ProcessPipeline.fermentation.
+
+        Returns:
+            dict: Resultado de cada etapa e "recomputed", a lista das etapas
+            recalculadas nesta chamada.
+        """
+        before = dict(self.computations)
+        results = {
+            "pretreatment": self.pretreatment(**pretreatment),
+            "hydrolysis": self.hydrolysis(**hydrolysis),
+            "fermentation": self.fermentation(**fermentation),
+        }
+        results["recomputed"] = [s for s in PIPELINE_STAGES if self.computations[s] > before[s]]
+        return results
+
+    def invalidate(self, stage=None):
+        """Descarta o resultado de uma etapa (e das seguintes) ou de todas."""
+        start = 0 if stage is None else PIPELINE_STAGES.index(stage)
+        for name in PIPELINE_STAGES[start:]:
+            self._stages.pop(name, None)
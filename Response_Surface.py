@@ -0,0 +1,282 @@
+# SUPERFÍCIE DE RESPOSTA PRÉ-CALCULADA DO PRÉ-TRATAMENTO HIDROTÉRMICO
+# Tabela do simulador em uma grade (temperatura × tempo) gravada como arrays
+# .npy mapeados em memória, com um índice JSON de metadados. Consultas são
+# respondidas por interpolação bilinear na grade, com limite de erro
+# estimado, sem chamar o solver; fora da grade, resolve-se o modelo.
+#
+# Os sistemas da hemicelulose e da celulose são lineares na condição
+# inicial: as concentrações são a carga inicial do polímero vezes a
+# resposta unitária do sistema. Por isso carga de sólidos e frações de
+# celulose e hemicelulose são tratadas exatamente, sem eixo na grade.
+#
+# Uso:
+#   python Response_Surface.py                       # grava em response_surface/
+#   python Response_Surface.py --temperature-step 0.1 --time-step 0.1
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from Hydrothermal_Pretreatment import (
+    ACTIVATION_ENERGY, KINETIC_DATA_HEMICELLULOSE, LN_PRE_EXPONENTIAL, SPECIES, TEMPERATURE_RANGE,
+    HydrothermalResult, simulate_hydrothermal_batch
+)
+from Instrumentation import instrumented, record
+
+# Diretório padrão da superfície (ao lado do app)
+DEFAULT_SURFACE_PATH = Path(__file__).resolve().parent / "response_surface"
+
+# Versão do formato dos arquivos
+SURFACE_VERSION = 1
+
+# Espaçamento padrão da grade e horizonte de tempo (min)
+DEFAULT_TEMPERATURE_STEP = 0.25
+DEFAULT_TIME_STEP = 0.25
+DEFAULT_TIME_MAX = 120.0
+
+# Folga aplicada ao erro medido nos pontos médios das células
+_ERROR_SAFETY = 1.25
+
+# Espécies multiplicadas pela carga de hemicelulose (as demais, pela de celulose)
+_HEMICELLULOSE_ROWS = slice(0, 5)
+
+def model_fingerprint():
+    """Hash dos parâmetros de Arrhenius (uma grade antiga não é usada após reajustes)."""
+    payload = np.concatenate([ACTIVATION_ENERGY.ravel(), LN_PRE_EXPONENTIAL.ravel()]).tobytes()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def _unit_response(temperature, time_final, n_points):
+    """Respostas às cargas unitárias de polímero, formato (temperaturas, tempos, espécies)."""
+    return simulate_hydrothermal_batch(
+        temperature, solid_loading=1.0, cellulose_fraction=1.0, hemicellulose_fraction=1.0,
+        time_final=time_final, n_points=n_points
+    )["concentrations"]
+
+def _midpoint_errors(coarse, fine):
+    """
+    Maior erro da interpolação bilinear em cada célula e nas vizinhas.
+
+    Args:
+        coarse (np.ndarray): Valores nos nós, formato (nT, nt, S).
+        fine (np.ndarray): Valores na grade refinada duas vezes, formato
+            (2nT - 1, 2nt - 1, S).
+
+    Returns:
+        np.ndarray: Erro por célula e espécie, formato (nT - 1, nt - 1, S).
+    """
+    interp = np.empty_like(fine)
+    interp[::2, ::2] = coarse
+    interp[1::2, ::2] = (coarse[:-1] + coarse[1:]) / 2
+    interp[::2, 1::2] = (coarse[:, :-1] + coarse[:, 1:]) / 2
+    interp[1::2, 1::2] = (coarse[:-1, :-1] + coarse[1:, :-1] + coarse[:-1, 1:] + coarse[1:, 1:]) / 4
+    error = np.abs(fine - interp)
+    # Pontos médios das quatro arestas e centro de cada célula
+    cell = np.maximum.reduce([
+        error[1::2, 0:-1:2], error[1::2, 2::2], error[0:-1:2, 1::2], error[2::2, 1::2], error[1::2, 1::2],
+    ])
+    # Máximo com as células vizinhas: perto de uma inflexão o erro no ponto
+    # médio se anula, mas não no resto da célula
+    padded = np.pad(cell, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    return np.maximum.reduce([
+        padded[a:a + cell.shape[0], b:b + cell.shape[1]] for a in range(3) for b in range(3)
+    ])
+
+def build_response_surface(path=DEFAULT_SURFACE_PATH, temperature_step=DEFAULT_TEMPERATURE_STEP,
+                           time_step=DEFAULT_TIME_STEP, time_max=DEFAULT_TIME_MAX):
+    """
+    Tabela o simulador e grava a superfície de resposta.
+
+    Também avalia o modelo nos pontos médios de cada célula para estimar o
+    erro máximo da interpolação, gravado junto com a tabela.
+
+    Args:
+        path (str): Diretório de saída.
+        temperature_step (float): Espaçamento em temperatura (°C); deve
+            dividir os intervalos da tabela cinética (180-195-210).
+        time_step (float): Espaçamento em tempo (min).
+        time_max (float): Maior tempo tabelado (min).
+
+    Returns:
+        dict: Metadados gravados em index.json.
+    """
+    t_min, t_max = TEMPERATURE_RANGE
+    n_temperature = int(round((t_max - t_min) / temperature_step)) + 1
+    n_time = int(round(time_max / time_step)) + 1
+    temperatures = np.linspace(t_min, t_max, n_temperature)
+    # As mudanças de intervalo de Arrhenius precisam cair sobre nós da grade
+    tabulated = KINETIC_DATA_HEMICELLULOSE['Temperature (°C)']
+    if not np.isclose(temperatures[:, None], tabulated).any(axis=0).all():
+        raise ValueError("temperature_step deve dividir os intervalos da tabela cinética")
+
+    start = time.perf_counter()
+    values = _unit_response(temperatures, time_max, n_time)
+    fine = _unit_response(np.linspace(t_min, t_max, 2 * n_temperature - 1), time_max, 2 * n_time - 1)
+    error = _midpoint_errors(values, fine) * _ERROR_SAFETY
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / "unit_response.npy", values)
+    np.save(path / "error_bound.npy", error.astype(np.float32))
+    index = {
+        "version": SURFACE_VERSION,
+        "model": model_fingerprint(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "build_seconds": round(time.perf_counter() - start, 3),
+        "species": list(SPECIES),
+        "axes": {
+            "temperature": {"start": float(t_min), "step": float(temperatures[1] - temperatures[0]),
+                            "count": n_temperature},
+            "time": {"start": 0.0, "step": float(time_max / (n_time - 1)), "count": n_time},
+        },
+        "arrays": {
+            "unit_response": {"file": "unit_response.npy", "shape": list(values.shape), "dtype": "float64"},
+            "error_bound": {"file": "error_bound.npy", "shape": list(error.shape), "dtype": "float32"},
+        },
+        "max_unit_error": float(error.max()),
+    }
+    # O índice é gravado por último: sua presença marca uma superfície completa
+    tmp = path / "index.json.tmp"
+    tmp.write_text(json.dumps(index, indent=2), encoding="utf-8")
+    os.replace(tmp, path / "index.json")
+    return index
+
+class ResponseSurface:
+    """
+    Superfície de resposta gravada por build_response_surface.
+
+    Os arrays são abertos com mmap_mode="r": processos que carregam a mesma
+    superfície compartilham as páginas do sistema operacional, sem cópia.
+
+    Args:
+        path (str): Diretório com index.json e os arrays .npy.
+    """
+
+    def __init__(self, path=DEFAULT_SURFACE_PATH):
+        self.path = Path(path)
+        self.index = json.loads((self.path / "index.json").read_text(encoding="utf-8"))
+        if self.index["version"] != SURFACE_VERSION:
+            raise ValueError(f"Versão da superfície não suportada: {self.index['version']}")
+        if self.index["model"] != model_fingerprint():
+            raise ValueError("Superfície gerada com outros parâmetros cinéticos; gere-a de novo")
+        if self.index["species"] != list(SPECIES):
+            raise ValueError("Superfície gerada com outra ordem de espécies")
+
+        arrays = self.index["arrays"]
+        self.values = np.load(self.path / arrays["unit_response"]["file"], mmap_mode="r")
+        self.error = np.load(self.path / arrays["error_bound"]["file"], mmap_mode="r")
+        axes = self.index["axes"]
+        self._t0, self._dt, self._nt = (axes["temperature"][k] for k in ("start", "step", "count"))
+        self._time_step, self._n_time = axes["time"]["step"], axes["time"]["count"]
+        self.temperature_range = (self._t0, self._t0 + self._dt * (self._nt - 1))
+        self.time_max = self._time_step * (self._n_time - 1)
+
+    def __repr__(self):
+        return (f"ResponseSurface(path='{self.path}', temperature={self.temperature_range}, "
+                f"time_max={self.time_max})")
+
+    @classmethod
+    def load(cls, path=DEFAULT_SURFACE_PATH):
+        """Abre a superfície, ou None se ela não existir ou estiver desatualizada."""
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def contains(self, temperature, time_final):
+        """Indica se a condição está dentro da grade."""
+        low, high = self.temperature_range
+        return bool(low <= temperature <= high and 0 <= time_final <= self.time_max)
+
+    def query(self, temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, times):
+        """
+        Interpola as concentrações em uma temperatura e vários tempos.
+
+        Args:
+            temperature (float): Temperatura em °C (dentro da grade).
+            solid_loading (float): Carga de sólidos em g/L.
+            cellulose_fraction (float): Fração mássica de celulose (0-1).
+            hemicellulose_fraction (float): Fração mássica de hemicelulose (0-1).
+            times (array): Tempos em minutos (dentro da grade).
+
+        Returns:
+            tuple: Concentrações (10, T), na ordem de SPECIES, e o limite de
+            erro estimado (10, T) em g/L.
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        if not (self.contains(temperature, times.max()) and times.min() >= 0):
+            raise ValueError("Condição fora da superfície de resposta")
+
+        # Célula e pesos em temperatura (escalar) e em tempo (vetor)
+        position = (temperature - self._t0) / self._dt
+        i = min(int(position), self._nt - 2)
+        w = position - i
+        position = times / self._time_step
+        j = np.minimum(position.astype(int), self._n_time - 2)
+        v = (position - j)[:, None]
+
+        rows = self.values[i:i + 2]
+        unit = ((1 - w) * ((1 - v) * rows[0, j] + v * rows[0, j + 1])
+                + w * ((1 - v) * rows[1, j] + v * rows[1, j + 1]))
+        error = np.asarray(self.error[i, j], dtype=float)
+
+        # Escala exata pelas cargas iniciais de cada polímero
+        load = np.empty(len(SPECIES))
+        load[_HEMICELLULOSE_ROWS] = solid_loading * hemicellulose_fraction
+        load[5:] = solid_loading * cellulose_fraction
+        return (unit * load).T, (error * load).T
+
+    @instrumented("hydrothermal_surface")
+    def result(self, temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final,
+               n_points=200):
+        """
+        Resultado interpolado no formato de simulate_hydrothermal_degradation.
+
+        Args:
+            temperature, solid_loading, cellulose_fraction, hemicellulose_fraction,
+                time_final: Condição (como em simulate_hydrothermal_degradation).
+            n_points (int): Pontos no tempo.
+
+        Returns:
+            tuple: HydrothermalResult interpolado e o maior erro estimado por
+            espécie (dict, g/L).
+        """
+        times = np.linspace(0, time_final, n_points)
+        block = np.empty((1 + len(SPECIES), n_points))
+        block[0] = times
+        block[1:], error = self.query(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, times)
+        record(n_interpolated_points=n_points)
+        result = HydrothermalResult(
+            block,
+            temperature=temperature,
+            solid_loading=solid_loading,
+            time_final=time_final,
+            initial_cellulose=solid_loading * cellulose_fraction,
+            initial_hemicellulose=solid_loading * hemicellulose_fraction
+        )
+        return result, dict(zip(SPECIES, error.max(axis=1)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera a superfície de resposta do pré-tratamento hidrotérmico.")
+    parser.add_argument("output", nargs="?", default=str(DEFAULT_SURFACE_PATH), help="Diretório de saída")
+    parser.add_argument("--temperature-step", type=float, default=DEFAULT_TEMPERATURE_STEP,
+                        help="Espaçamento em temperatura (°C, padrão: 0.25)")
+    parser.add_argument("--time-step", type=float, default=DEFAULT_TIME_STEP,
+                        help="Espaçamento em tempo (min, padrão: 0.25)")
+    parser.add_argument("--time-max", type=float, default=DEFAULT_TIME_MAX, help="Maior tempo (min, padrão: 120)")
+    args = parser.parse_args(argv)
+
+    index = build_response_surface(args.output, args.temperature_step, args.time_step, args.time_max)
+    shape = index["arrays"]["unit_response"]["shape"]
+    print(f"Superfície {shape[0]} temperaturas × {shape[1]} tempos gravada em {args.output} "
+          f"({index['build_seconds']:.1f} s)")
+    print(f"Maior erro estimado por g/L de polímero: {index['max_unit_error']:.2e}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
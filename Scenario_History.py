@@ -0,0 +1,342 @@
+# HISTÓRICO DE CENÁRIOS DE UMA SESSÃO
+# Guarda entradas, trajetórias e métricas das simulações de cada etapa em
+# tabelas de arrays: entradas e métricas ficam em matrizes float64 (uma
+# linha por cenário), para ordenar e filtrar de forma vetorizada, e as
+# trajetórias em um bloco float32 por cenário. Um orçamento de memória por
+# sessão descarta os cenários usados há mais tempo (LRU).
+#
+# Uso:
+#   history = ScenarioHistory(max_bytes=8 * 1024 ** 2)
+#   history.add(key, "pretreatment", inputs, result, SPECIES, metrics, label="195 °C")
+#   history.compare(history.rank("pretreatment", "sugar_yield_percent", top=3))
+
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+# Orçamento padrão de memória por sessão
+DEFAULT_MAX_BYTES = 8 * 1024 ** 2
+
+# Linhas alocadas na criação de uma tabela (a capacidade dobra quando enche)
+_INITIAL_CAPACITY = 16
+
+class _StageTable:
+    """Cenários de uma etapa: linhas de entradas e métricas e blocos de trajetórias."""
+
+    def __init__(self, input_names, metric_names, series_names):
+        self.input_names = input_names
+        self.metric_names = metric_names
+        self.series_names = series_names
+        self.inputs = np.empty((_INITIAL_CAPACITY, len(input_names)))
+        self.metrics = np.empty((_INITIAL_CAPACITY, len(metric_names)))
+        self.sequence = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self.used = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+        self.blocks = [None] * _INITIAL_CAPACITY
+        self.keys = [None] * _INITIAL_CAPACITY
+        self.labels = [None] * _INITIAL_CAPACITY
+        self.block_bytes = 0
+        self._free = list(range(_INITIAL_CAPACITY - 1, -1, -1))
+
+    @property
+    def nbytes(self):
+        return (self.inputs.nbytes + self.metrics.nbytes + self.sequence.nbytes + self.used.nbytes
+                + self.block_bytes)
+
+    def _grow(self):
+        capacity = len(self.used)
+        self.inputs = np.concatenate([self.inputs, np.empty_like(self.inputs)])
+        self.metrics = np.concatenate([self.metrics, np.empty_like(self.metrics)])
+        self.sequence = np.concatenate([self.sequence, np.zeros_like(self.sequence)])
+        self.used = np.concatenate([self.used, np.zeros_like(self.used)])
+        for column in (self.blocks, self.keys, self.labels):
+            column.extend([None] * capacity)
+        self._free = list(range(2 * capacity - 1, capacity - 1, -1))
+
+    def insert(self, key, label, inputs, metrics, block, sequence):
+        if not self._free:
+            self._grow()
+        row = self._free.pop()
+        self.inputs[row] = inputs
+        self.metrics[row] = metrics
+        self.sequence[row] = sequence
+        self.used[row] = True
+        self.blocks[row], self.keys[row], self.labels[row] = block, key, label
+        self.block_bytes += block.nbytes
+        return row
+
+    def release(self, row):
+        self.block_bytes -= self.blocks[row].nbytes
+        self.used[row] = False
+        self.blocks[row] = self.keys[row] = self.labels[row] = None
+        self._free.append(row)
+
+    def column(self, name):
+        """Coluna de entradas ou de métricas (todas as linhas)."""
+        if name in self.metric_names:
+            return self.metrics[:, self.metric_names.index(name)]
+        if name in self.input_names:
+            return self.inputs[:, self.input_names.index(name)]
+        raise KeyError(name)
+
+class StoredScenario(Mapping):
+    """
+    Cenário guardado no histórico.
+
+    Como HydrothermalResult, é um Mapping: "time" e as séries são visões
+    (float32) do bloco de trajetórias e as métricas são escalares, de modo
+    que pode ser passado diretamente a scenario_overlay_spec.
+    """
+
+    def __init__(self, key, stage, label, inputs, metrics, series_names, block):
+        self.key = key
+        self.stage = stage
+        self.label = label
+        self.inputs = inputs
+        self.metrics = metrics
+        self.block = block
+        self._rows = {"time": 0, **{name: i + 1 for i, name in enumerate(series_names)}}
+
+    def __getitem__(self, name):
+        if name in self._rows:
+            return self.block[self._rows[name]]
+        if name in self.metrics:
+            return self.metrics[name]
+        raise KeyError(name)
+
+    def __iter__(self):
+        yield from self._rows
+        yield from self.metrics
+
+    def __len__(self):
+        return len(self._rows) + len(self.metrics)
+
+    def __repr__(self):
+        return f"StoredScenario(stage='{self.stage}', label='{self.label}', points={self.block.shape[1]})"
+
+class ScenarioHistory:
+    """
+    Histórico compacto dos cenários simulados em uma sessão.
+
+    Cada etapa tem uma tabela com colunas fixas (as do primeiro cenário
+    guardado). Guardar de novo uma chave existente só a marca como usada e
+    a torna a mais recente em keys(): os modelos são determinísticos. Quando
+    a memória passa de max_bytes, os cenários usados há mais tempo são
+    descartados (o mais recente sempre fica). Ler um cenário para desenhá-lo
+    (peek) não conta como uso.
+
+    Args:
+        max_bytes (int): Orçamento de memória da sessão em bytes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._tables = {}
+        self._entries = OrderedDict()
+        self._sequence = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def nbytes(self):
+        return sum(table.nbytes for table in self._tables.values())
+
+    def add(self, key, stage, inputs, result, series, metrics, label=None):
+        """
+        Guarda um cenário (ou marca como usado e mais recente, se a chave já
+        existe).
+
+        Args:
+            key (tuple): Chave do cenário (ex.: hydrothermal_cache_key).
+            stage (str): Etapa ("pretreatment", "hydrolysis"...).
+            inputs (dict): Entradas numéricas da simulação.
+            result (Mapping): Resultado com "time" e as séries.
+            series (tuple): Séries de result a guardar.
+            metrics (dict): Métricas escalares do cenário.
+            label (str): Rótulo para tabelas e legendas (padrão: a chave).
+
+        Returns:
+            tuple: A chave.
+        """
+        if key in self._entries:
+            stage, row = self._entries[key]
+            self._entries.move_to_end(key)
+            self._sequence += 1
+            self._tables[stage].sequence[row] = self._sequence
+            return key
+
+        names = (tuple(inputs), tuple(metrics), tuple(series))
+        table = self._tables.get(stage)
+        if table is None:
+            table = self._tables[stage] = _StageTable(*names)
+        elif names != (table.input_names, table.metric_names, table.series_names):
+            raise ValueError(f"Cenário com colunas diferentes das já guardadas na etapa '{stage}'")
+
+        time = np.asarray(result["time"])
+        block = np.empty((1 + len(series), len(time)), dtype=np.float32)
+        block[0] = time
+        for i, name in enumerate(series):
+            block[i + 1] = result[name]
+        block.setflags(write=False)
+
+        self._sequence += 1
+        row = table.insert(
+            key, label if label is not None else str(key),
+            [float(value) for value in inputs.values()], [float(value) for value in metrics.values()],
+            block, self._sequence
+        )
+        self._entries[key] = (stage, row)
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return key
+
+    def _remove(self, key):
+        stage, row = self._entries.pop(key)
+        self._tables[stage].release(row)
+
+    def remove(self, key):
+        """Descarta um cenário (chaves ausentes são ignoradas)."""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self):
+        """Esvazia o histórico."""
+        self._tables.clear()
+        self._entries.clear()
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Cenário guardado, marcado como usado.
+
+        Returns:
+            StoredScenario: Entradas, métricas e trajetórias (KeyError se a
+            chave não está no histórico).
+        """
+        self._entries.move_to_end(key)
+        return self.peek(key)
+
+    def peek(self, key):
+        """
+        Cenário guardado, sem marcá-lo como usado (para desenhar gráficos a
+        cada execução da página sem alterar a ordem de descarte).
+
+        Returns:
+            StoredScenario: Como em get.
+        """
+        stage, row = self._entries[key]
+        table = self._tables[stage]
+        return StoredScenario(
+            key, stage, table.labels[row],
+            dict(zip(table.input_names, table.inputs[row].tolist())),
+            dict(zip(table.metric_names, table.metrics[row].tolist())),
+            table.series_names, table.blocks[row]
+        )
+
+    def label(self, key):
+        """Rótulo de um cenário (sem marcá-lo como usado)."""
+        stage, row = self._entries[key]
+        return self._tables[stage].labels[row]
+
+    def stages(self):
+        """Etapas com ao menos um cenário guardado."""
+        return [stage for stage, table in self._tables.items() if table.used.any()]
+
+    def columns(self, stage):
+        """Nomes das entradas, métricas e séries de uma etapa."""
+        table = self._tables[stage]
+        return {"inputs": table.input_names, "metrics": table.metric_names, "series": table.series_names}
+
+    def keys(self, stage):
+        """Chaves dos cenários de uma etapa, da guardada (ou guardada de novo) há mais tempo à mais recente."""
+        table = self._tables.get(stage)
+        if table is None:
+            return []
+        rows = np.flatnonzero(table.used)
+        return [table.keys[row] for row in rows[np.argsort(table.sequence[rows])]]
+
+    def rank(self, stage, metric, descending=True, top=None, **bounds):
+        """
+        Cenários de uma etapa ordenados por uma métrica (ou entrada).
+
+        Args:
+            stage (str): Etapa.
+            metric (str): Métrica ou entrada usada na ordenação.
+            descending (bool): Maiores valores primeiro.
+            top (int): Quantidade máxima de cenários.
+            **bounds: Faixas (mínimo, máximo) de entradas ou métricas que os
+                cenários devem respeitar (None deixa o lado aberto), ex.:
+                temperature=(180, 200).
+
+        Returns:
+            list: Chaves ordenadas (empates na ordem em que foram guardados).
+        """
+        table = self._tables.get(stage)
+        if table is None:
+            return []
+        mask = table.used.copy()
+        for name, (low, high) in bounds.items():
+            values = table.column(name)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(table.sequence[rows], kind="stable")]
+        values = table.column(metric)[rows]
+        order = np.argsort(-values if descending else values, kind="stable")
+        return [table.keys[row] for row in rows[order][:top]]
+
+    def table(self, keys):
+        """
+        Entradas e métricas de cenários de uma mesma etapa.
+
+        Returns:
+            pd.DataFrame: Uma linha por cenário (índice: rótulos), na ordem
+            de keys.
+        """
+        if not keys:
+            return pd.DataFrame()
+        located = [self._entries[key] for key in keys]
+        stages = {stage for stage, _ in located}
+        if len(stages) > 1:
+            raise ValueError(f"Cenários de etapas diferentes: {sorted(stages)}")
+        table = self._tables[stages.pop()]
+        rows = np.array([row for _, row in located])
+        return pd.DataFrame(
+            np.hstack([table.inputs[rows], table.metrics[rows]]),
+            index=[table.labels[row] for row in rows],
+            columns=list(table.input_names + table.metric_names),
+        )
+
+    def compare(self, keys):
+        """
+        Comparação lado a lado de cenários de uma mesma etapa.
+
+        Returns:
+            pd.DataFrame: Entradas e métricas nas linhas e um cenário por
+            coluna, na ordem de keys.
+        """
+        return self.table(keys).T
+
+    def stats(self):
+        """
+        Estatísticas do histórico para exibição no app.
+
+        Returns:
+            dict: Cenários por etapa, memória usada e descartes.
+        """
+        return {
+            "scenarios": len(self._entries),
+            "per_stage": {stage: int(table.used.sum()) for stage, table in self._tables.items()},
+            "nbytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,459 @@
+# ANÁLISE GLOBAL DE SENSIBILIDADE E INCERTEZA DO PRÉ-TRATAMENTO HIDROTÉRMICO
+# Índices de Sobol (primeira ordem e totais) das doze constantes cinéticas e
+# das condições de operação, e faixas de predição das curvas no tempo.
+#
+# As amostras quasi-Monte Carlo (Sobol' embaralhado) são geradas e avaliadas
+# em blocos vetorizados nos processos de um pool. Cada bloco devolve apenas
+# acumuladores (somas e histogramas), de modo que a memória não cresce com o
+# número de amostras (10⁵-10⁶).
+#
+# Uso:
+#   python Sensitivity_Analysis.py                   # 2¹⁴ amostras, condições na faixa padrão
+#   python Sensitivity_Analysis.py --samples 131072 --fix temperature=195 --fix time_final=40
+
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm, qmc
+
+from Hydrothermal_Pretreatment import SPECIES, TEMPERATURE_RANGE, simulate_hydrothermal_batch
+from Instrumentation import instrumented, record
+from Yield_Optimizer import evaluate_conditions
+
+# Constantes cinéticas na ordem de arrhenius_rate_constants (sistema, k1-k6)
+RATE_PARAMETERS = tuple(f"{system}_k{i}" for system in ("hemicellulose", "cellulose") for i in range(1, 7))
+
+# Desvio-padrão padrão de ln k (incerteza relativa de cerca de 20%)
+DEFAULT_RATE_UNCERTAINTY = 0.2
+
+# Condições de operação e composição: faixa (mín, máx) amostrada
+# uniformemente ou um valor fixo
+DEFAULT_INPUTS = {
+    "temperature": TEMPERATURE_RANGE,       # °C
+    "time_final": (1.0, 120.0),             # min
+    "solid_loading": (50.0, 200.0),         # g/L
+    "cellulose_fraction": (0.30, 0.45),
+    "hemicellulose_fraction": (0.20, 0.30),
+}
+
+# Respostas analisadas (estado final)
+OUTPUTS = ("cellulose_degraded_percent", "hemicellulose_degraded_percent", "sugar_release", "inhibitors")
+
+# Avaliações do modelo por bloco (limita a memória de cada processo)
+_EVALUATIONS_PER_CHUNK = 32_768
+
+# Evita ppf(0) = -inf nas transformações das amostras uniformes
+_U_EPS = 1e-12
+
+# =============================================================================
+# ESPAÇO DE FATORES
+# =============================================================================
+
+def factor_space(rate_uncertainty=DEFAULT_RATE_UNCERTAINTY, inputs=None):
+    """
+    Define os fatores incertos da análise.
+
+    Cada constante cinética é multiplicada por um fator log-normal,
+    exp(σ z), com z normal padrão; constantes com σ = 0 ficam fixas. As
+    condições de operação com faixa são amostradas uniformemente.
+
+    Args:
+        rate_uncertainty (float | array | dict): Desvio-padrão de ln k, único,
+            por constante (12 valores na ordem de RATE_PARAMETERS) ou por nome.
+        inputs (dict): Faixas (mín, máx) ou valores fixos das condições; usa
+            DEFAULT_INPUTS para as chaves ausentes.
+
+    Returns:
+        dict: Nomes dos fatores variados, índices e σ das constantes,
+        condições fixas e faixas das variadas.
+    """
+    if isinstance(rate_uncertainty, dict):
+        unknown = set(rate_uncertainty) - set(RATE_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Constantes desconhecidas: {', '.join(sorted(unknown))}")
+        sigma = np.array([rate_uncertainty.get(name, 0.0) for name in RATE_PARAMETERS], dtype=float)
+    else:
+        sigma = np.broadcast_to(np.asarray(rate_uncertainty, dtype=float), (len(RATE_PARAMETERS),)).copy()
+    if np.any(sigma < 0):
+        raise ValueError("As incertezas das constantes devem ser não negativas")
+
+    inputs = {**DEFAULT_INPUTS, **(inputs or {})}
+    unknown = set(inputs) - set(DEFAULT_INPUTS)
+    if unknown:
+        raise ValueError(f"Condições desconhecidas: {', '.join(sorted(unknown))}")
+    ranges = {name: tuple(map(float, value)) for name, value in inputs.items() if np.ndim(value) == 1}
+    fixed = {name: float(value) for name, value in inputs.items() if np.ndim(value) == 0}
+
+    rate_index = np.flatnonzero(sigma > 0)
+    names = [RATE_PARAMETERS[i] for i in rate_index] + list(ranges)
+    if not names:
+        raise ValueError("Nenhum fator variado: defina incertezas ou faixas de entrada")
+    return {
+        "names": names,
+        "rate_index": rate_index,
+        "rate_sigma": sigma[rate_index],
+        "ranges": ranges,
+        "fixed": fixed,
+    }
+
+def _rate_multipliers(u, space):
+    """Fatores log-normais das constantes a partir de amostras uniformes."""
+    multipliers = np.ones((len(u), len(RATE_PARAMETERS)))
+    z = norm.ppf(np.clip(u[:, :len(space["rate_index"])], _U_EPS, 1 - _U_EPS))
+    multipliers[:, space["rate_index"]] = np.exp(space["rate_sigma"] * z)
+    return multipliers.reshape(len(u), 2, 6)
+
+def evaluate_factors(u, space):
+    """
+    Avalia as respostas para amostras no hipercubo unitário.
+
+    Args:
+        u (np.ndarray): Amostras uniformes com formato (n, fatores).
+        space (dict): Espaço de fatores (factor_space).
+
+    Returns:
+        np.ndarray: Respostas com formato (n, len(OUTPUTS)).
+    """
+    n_rates = len(space["rate_index"])
+    conditions = {name: np.full(len(u), value) for name, value in space["fixed"].items()}
+    for j, (name, (low, high)) in enumerate(space["ranges"].items()):
+        conditions[name] = low + (high - low) * u[:, n_rates + j]
+    metrics = evaluate_conditions(rate_multipliers=_rate_multipliers(u, space), **conditions)
+    return np.column_stack([metrics[name] for name in OUTPUTS])
+
+def _sobol_points(dimension, seed, start, n):
+    """Pontos [start, start + n) da sequência de Sobol' embaralhada."""
+    sampler = qmc.Sobol(d=dimension, scramble=True, seed=seed)
+    if start:
+        sampler.fast_forward(start)
+    return sampler.random(n)
+
+def _map_reduce(function, tasks, n_workers, reduce):
+    """
+    Aplica function aos blocos, no pool, combinando os resultados em ordem.
+
+    Mantém no máximo 2 × n_workers blocos em andamento.
+    """
+    total = None
+    executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    try:
+        pending = deque()
+        for task in tasks:
+            if executor is None:
+                total = reduce(total, function(task))
+                continue
+            pending.append(executor.submit(function, task))
+            while len(pending) >= 2 * n_workers:
+                total = reduce(total, pending.popleft().result())
+        while pending:
+            total = reduce(total, pending.popleft().result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return total
+
+def _chunk_size(n_samples, evaluations_per_sample):
+    """Maior potência de 2 (≤ n_samples) que respeita _EVALUATIONS_PER_CHUNK."""
+    size = 1 << max(int(np.log2(max(_EVALUATIONS_PER_CHUNK // evaluations_per_sample, 1))), 0)
+    return min(size, n_samples)
+
+def _check_power_of_two(n_samples):
+    if n_samples < 2 or n_samples & (n_samples - 1):
+        raise ValueError("n_samples deve ser uma potência de 2 (equilíbrio da sequência de Sobol')")
+
+# =============================================================================
+# ÍNDICES DE SOBOL
+# =============================================================================
+
+def _sobol_chunk(args):
+    """
+    Acumuladores dos estimadores de Jansen para um bloco de amostras.
+
+    As matrizes A e B são as duas metades de uma amostra de Sobol' com 2d
+    dimensões; AB_i é A com a coluna i trocada pela de B. Os estimadores
+    usam apenas diferenças entre respostas e não perdem precisão quando a
+    média é grande frente à variância.
+    """
+    space, seed, start, n = args
+    d = len(space["names"])
+    u = _sobol_points(2 * d, seed, start, n)
+    A, B = u[:, :d], u[:, d:]
+    AB = np.repeat(A[None], d, axis=0)
+    AB[np.arange(d), :, np.arange(d)] = B.T
+
+    y = evaluate_factors(np.concatenate([A, B, AB.reshape(d * n, d)]), space)
+    f_A, f_B, f_AB = y[:n], y[n:2 * n], y[2 * n:].reshape(d, n, -1)
+
+    first = 0.5 * (f_B - f_AB) ** 2            # V - V_i (só x_i em comum)
+    total = 0.5 * (f_A - f_AB) ** 2            # V_Ti (tudo menos x_i em comum)
+    f_AB_pooled = np.concatenate([f_A, f_B])
+    mean = f_AB_pooled.mean(axis=0)
+    return {
+        "count": 2 * n,
+        "mean": mean,
+        "m2": ((f_AB_pooled - mean) ** 2).sum(axis=0),
+        "n": n,
+        "first": first.sum(axis=1),
+        "first_sq": (first ** 2).sum(axis=1),
+        "total": total.sum(axis=1),
+        "total_sq": (total ** 2).sum(axis=1),
+    }
+
+def _combine_sobol(a, b):
+    """Combina acumuladores de dois blocos (média e variância por Chan et al.)."""
+    if a is None:
+        return b
+    count = a["count"] + b["count"]
+    delta = b["mean"] - a["mean"]
+    combined = {
+        "count": count,
+        "mean": a["mean"] + delta * b["count"] / count,
+        "m2": a["m2"] + b["m2"] + delta ** 2 * a["count"] * b["count"] / count,
+    }
+    for key in ("n", "first", "first_sq", "total", "total_sq"):
+        combined[key] = a[key] + b[key]
+    return combined
+
+@instrumented("sensitivity.sobol")
+def sobol_indices(n_samples=2 ** 14, rate_uncertainty=DEFAULT_RATE_UNCERTAINTY, inputs=None, n_workers=None,
+                  seed=0, level=0.95):
+    """
+    Índices de Sobol de primeira ordem e totais das respostas do modelo.
+
+    Usa o esquema de Saltelli com os estimadores de Jansen (1999):
+    n_samples × (d + 2) avaliações do modelo, em blocos distribuídos em um
+    pool de processos. Os intervalos de confiança vêm do erro-padrão dos
+    estimadores, acumulado junto com as somas.
+
+    Args:
+        n_samples (int): Amostras base (potência de 2).
+        rate_uncertainty (float | array | dict): Desvio-padrão de ln k
+            (factor_space).
+        inputs (dict): Faixas ou valores fixos das condições (factor_space).
+        n_workers (int): Processos do pool (padrão: número de CPUs; 1 avalia
+            no próprio processo).
+        seed (int): Semente do embaralhamento da sequência.
+        level (float): Nível de confiança dos intervalos.
+
+    Returns:
+        dict: "factors", "outputs", índices "first_order" e "total_order"
+        com formato (fatores, respostas), suas meias-larguras de confiança
+        ("first_order_conf", "total_order_conf"), "mean" e "variance" das
+        respostas e o número de avaliações.
+    """
+    _check_power_of_two(n_samples)
+    space = factor_space(rate_uncertainty, inputs)
+    d = len(space["names"])
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    chunk = _chunk_size(n_samples, d + 2)
+    tasks = ((space, seed, start, chunk) for start in range(0, n_samples, chunk))
+    acc = _map_reduce(_sobol_chunk, tasks, n_workers, _combine_sobol)
+
+    n = acc["n"]
+    variance = acc["m2"] / (acc["count"] - 1)
+    z = norm.ppf(0.5 + level / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = 1 - acc["first"] / n / variance
+        total = acc["total"] / n / variance
+        first_se = np.sqrt(np.maximum(acc["first_sq"] / n - (acc["first"] / n) ** 2, 0) / n)
+        total_se = np.sqrt(np.maximum(acc["total_sq"] / n - (acc["total"] / n) ** 2, 0) / n)
+        first_conf = z * first_se / variance
+        total_conf = z * total_se / variance
+
+    n_evaluations = n * (d + 2)
+    record(n_evaluations=n_evaluations, n_workers=n_workers)
+    return {
+        "factors": list(space["names"]),
+        "outputs": list(OUTPUTS),
+        "first_order": first,
+        "total_order": total,
+        "first_order_conf": first_conf,
+        "total_order_conf": total_conf,
+        "mean": acc["mean"],
+        "variance": variance,
+        "n_samples": n,
+        "n_evaluations": n_evaluations,
+        "level": level,
+    }
+
+def sobol_table(indices):
+    """
+    Índices de Sobol em formato de tabela.
+
+    Args:
+        indices (dict): Resultado de sobol_indices.
+
+    Returns:
+        pd.DataFrame: Uma linha por resposta e fator, com S1, ST e as
+        meias-larguras de confiança, ordenada por ST decrescente.
+    """
+    rows = []
+    for j, output in enumerate(indices["outputs"]):
+        for i, factor in enumerate(indices["factors"]):
+            rows.append({
+                "output": output,
+                "factor": factor,
+                "S1": indices["first_order"][i, j],
+                "S1_conf": indices["first_order_conf"][i, j],
+                "ST": indices["total_order"][i, j],
+                "ST_conf": indices["total_order_conf"][i, j],
+            })
+    table = pd.DataFrame(rows)
+    return table.sort_values(["output", "ST"], ascending=[True, False], ignore_index=True)
+
+# =============================================================================
+# FAIXAS DE PREDIÇÃO
+# =============================================================================
+
+def _bands_chunk(args):
+    """Histogramas (tempo, espécie, classe) das curvas de um bloco de amostras."""
+    space, condition, species_index, n_points, n_bins, upper_bound, seed, start, n = args
+    u = _sobol_points(len(space["rate_index"]), seed, start, n)
+    results = simulate_hydrothermal_batch(
+        n_points=n_points, rate_multipliers=_rate_multipliers(u, space),
+        **{name: np.full(n, value) for name, value in condition.items()}
+    )
+    y = results["concentrations"][:, :, species_index]            # (n, T, S)
+    bins = np.clip((y / upper_bound * n_bins).astype(np.int64), 0, n_bins - 1)
+    cells = (np.arange(n_points)[:, None] * len(species_index) + np.arange(len(species_index))) * n_bins
+    counts = np.bincount((cells + bins).ravel(), minlength=n_points * len(species_index) * n_bins)
+    return {
+        "counts": counts.reshape(n_points, len(species_index), n_bins),
+        "sum": y.sum(axis=0),
+        "min": y.min(axis=0),
+        "max": y.max(axis=0),
+    }
+
+def _combine_bands(a, b):
+    if a is None:
+        return b
+    return {
+        "counts": a["counts"] + b["counts"],
+        "sum": a["sum"] + b["sum"],
+        "min": np.minimum(a["min"], b["min"]),
+        "max": np.maximum(a["max"], b["max"]),
+    }
+
+def _histogram_quantile(counts, upper_bound, q):
+    """Quantil q por interpolação linear dentro da classe do histograma."""
+    n_bins = counts.shape[-1]
+    cumulative = np.cumsum(counts, axis=-1)
+    target = q * cumulative[..., -1:]
+    index = np.minimum((cumulative < target).sum(axis=-1), n_bins - 1)
+    below = np.take_along_axis(cumulative, index[..., None], axis=-1)[..., 0]
+    inside = np.take_along_axis(counts, index[..., None], axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(inside > 0, (target[..., 0] - (below - inside)) / inside, 0.5)
+    return (index + np.clip(fraction, 0, 1)) * upper_bound / n_bins
+
+@instrumented("sensitivity.bands")
+def prediction_bands(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final,
+                     n_samples=2 ** 12, level=0.90, rate_uncertainty=DEFAULT_RATE_UNCERTAINTY, n_points=100,
+                     species=SPECIES, n_bins=512, n_workers=1, seed=0):
+    """
+    Faixas de predição das curvas no tempo sob incerteza das constantes.
+
+    As condições de operação são fixas; as constantes cinéticas variam como
+    em factor_space. Cada bloco de amostras é reduzido a histogramas por
+    tempo e espécie; como cada sistema conserva massa, as concentrações
+    ficam entre 0 e a carga inicial do polímero, e a resolução dos quantis
+    é essa carga dividida por n_bins.
+
+    Args:
+        temperature, solid_loading, cellulose_fraction, hemicellulose_fraction,
+            time_final: Condição simulada (como em simulate_hydrothermal_degradation).
+        n_samples (int): Amostras das constantes (potência de 2).
+        level (float): Probabilidade coberta pela faixa (ex.: 0.90).
+        rate_uncertainty (float | array | dict): Desvio-padrão de ln k.
+        n_points (int): Pontos no tempo.
+        species (tuple): Espécies com faixa (subconjunto de SPECIES).
+        n_bins (int): Classes dos histogramas.
+        n_workers (int): Processos do pool (1 avalia no próprio processo).
+        seed (int): Semente do embaralhamento da sequência.
+
+    Returns:
+        dict: "time", "level", "n_samples" e, por espécie, as curvas
+        "lower", "upper", "median" e "mean".
+    """
+    _check_power_of_two(n_samples)
+    space = factor_space(rate_uncertainty, {name: 0.0 for name in DEFAULT_INPUTS})
+    condition = {
+        "temperature": float(temperature),
+        "solid_loading": float(solid_loading),
+        "cellulose_fraction": float(cellulose_fraction),
+        "hemicellulose_fraction": float(hemicellulose_fraction),
+        "time_final": float(time_final),
+    }
+    species_index = np.array([SPECIES.index(name) for name in species])
+    # Limite superior de cada espécie: carga inicial do polímero do seu sistema
+    loads = (solid_loading * hemicellulose_fraction, solid_loading * cellulose_fraction)
+    upper_bound = np.maximum(np.array([loads[i // 5] for i in species_index], dtype=float), 1e-12)
+
+    chunk = _chunk_size(n_samples, n_points * len(species_index) // 8 + 1)
+    tasks = ((space, condition, species_index, n_points, n_bins, upper_bound, seed, start, chunk)
+             for start in range(0, n_samples, chunk))
+    acc = _map_reduce(_bands_chunk, tasks, n_workers, _combine_bands)
+
+    # Quantis limitados aos extremos observados (exatos quando não há dispersão)
+    alpha = (1 - level) / 2
+    lower, upper, median = (
+        np.clip(_histogram_quantile(acc["counts"], upper_bound, q), acc["min"], acc["max"])
+        for q in (alpha, 1 - alpha, 0.5)
+    )
+    mean = acc["sum"] / n_samples
+    record(n_evaluations=n_samples, n_workers=n_workers)
+    return {
+        "time": np.linspace(0, time_final, n_points),
+        "level": level,
+        "n_samples": n_samples,
+        "lower": {name: lower[:, j] for j, name in enumerate(species)},
+        "upper": {name: upper[:, j] for j, name in enumerate(species)},
+        "median": {name: median[:, j] for j, name in enumerate(species)},
+        "mean": {name: mean[:, j] for j, name in enumerate(species)},
+    }
+
+def _parse_fixed(items):
+    """Converte argumentos "nome=valor" em condições fixas."""
+    fixed = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        if name not in DEFAULT_INPUTS or not value:
+            raise argparse.ArgumentTypeError(f"Condição inválida: {item} (use, p.ex., temperature=195)")
+        fixed[name] = float(value)
+    return fixed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Índices de Sobol das constantes cinéticas e condições do pré-tratamento hidrotérmico."
+    )
+    parser.add_argument("--samples", type=int, default=2 ** 14, help="Amostras base, potência de 2 (padrão: 16384)")
+    parser.add_argument("--uncertainty", type=float, default=DEFAULT_RATE_UNCERTAINTY,
+                        help="Desvio-padrão de ln k (padrão: 0.2)")
+    parser.add_argument("--fix", action="append", default=[], metavar="NOME=VALOR",
+                        help="Fixa uma condição (temperature, time_final, solid_loading, ...)")
+    parser.add_argument("--workers", type=int, default=None, help="Processos do pool (padrão: número de CPUs)")
+    parser.add_argument("--seed", type=int, default=0, help="Semente (padrão: 0)")
+    parser.add_argument("--output", help="Grava a tabela de índices em CSV")
+    args = parser.parse_args(argv)
+
+    indices = sobol_indices(n_samples=args.samples, rate_uncertainty=args.uncertainty,
+                            inputs=_parse_fixed(args.fix), n_workers=args.workers, seed=args.seed)
+    table = sobol_table(indices)
+    pd.set_option("display.float_format", "{:.3f}".format)
+    for output, rows in table.groupby("output", sort=False):
+        print(f"\n{output}:")
+        print(rows.drop(columns="output").to_string(index=False))
+    print(f"\n{indices['n_evaluations']} avaliações do modelo")
+    if args.output:
+        table.to_csv(args.output, index=False)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
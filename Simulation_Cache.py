@@ -0,0 +1,243 @@
+# CACHE DE RESULTADOS DE SIMULAÇÃO
+# Compartilhado por todas as sessões do processo, com limite de memória (LRU)
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from Hydrothermal_Pretreatment import HydrothermalResult, HydrothermalTrajectory
+from Instrumentation import instrumented, record
+
+# Passos de quantização das entradas do simulador hidrotérmico: entradas que
+# diferem menos que isso compartilham a mesma entrada no cache
+HYDROTHERMAL_KEY_STEPS = {
+    "temperature": 0.1,            # °C
+    "solid_loading": 0.01,         # g/L
+    "cellulose_fraction": 1e-4,    # fração mássica
+    "hemicellulose_fraction": 1e-4,
+    "time_final": 0.01,            # min
+}
+
+def quantize(value, step):
+    """
+    Arredonda um valor para o múltiplo mais próximo de step.
+
+    Args:
+        value (float): Valor de entrada.
+        step (float): Passo de quantização.
+
+    Returns:
+        int: Índice inteiro do múltiplo (estável para uso em chaves).
+    """
+    return int(round(float(value) / step))
+
+def hydrothermal_cache_key(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final,
+                           adaptive=False):
+    """
+    Monta a chave de cache para simulate_hydrothermal_degradation.
+
+    Returns:
+        tuple: Chave com as entradas quantizadas.
+    """
+    values = {
+        "temperature": temperature,
+        "solid_loading": solid_loading,
+        "cellulose_fraction": cellulose_fraction,
+        "hemicellulose_fraction": hemicellulose_fraction,
+        "time_final": time_final,
+    }
+    return ("hydrothermal",) + tuple(
+        quantize(values[name], step) for name, step in HYDROTHERMAL_KEY_STEPS.items()
+    ) + (bool(adaptive),)
+
+def hydrothermal_trajectory_key(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction):
+    """
+    Monta a chave de cache da trajetória contínua (independe do tempo final).
+
+    Returns:
+        tuple: Chave com as entradas quantizadas.
+    """
+    values = {
+        "temperature": temperature,
+        "solid_loading": solid_loading,
+        "cellulose_fraction": cellulose_fraction,
+        "hemicellulose_fraction": hemicellulose_fraction,
+    }
+    return ("hydrothermal_trajectory",) + tuple(
+        quantize(value, HYDROTHERMAL_KEY_STEPS[name]) for name, value in values.items()
+    )
+
+def result_nbytes(result):
+    """
+    Estima a memória ocupada por um resultado (arrays NumPy e escalares).
+
+    Args:
+        result: Resultado de simulação (dict, array ou objeto com nbytes).
+
+    Returns:
+        int: Tamanho aproximado em bytes.
+    """
+    if isinstance(result, dict):
+        return sum(result_nbytes(v) for v in result.values()) + 64 * len(result)
+    if isinstance(result, (list, tuple)):
+        return sum(result_nbytes(v) for v in result) + 8 * len(result)
+    nbytes = getattr(result, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return 32
+
+def _freeze(result):
+    """Marca os arrays do resultado como somente leitura (são compartilhados)."""
+    if isinstance(result, np.ndarray):
+        result.setflags(write=False)
+    elif isinstance(result, HydrothermalResult):
+        result.block.setflags(write=False)
+    elif isinstance(result, dict):
+        for value in result.values():
+            _freeze(value)
+    return result
+
+class SimulationCache:
+    """
+    Cache LRU de resultados de simulação, seguro para múltiplas threads.
+
+    Um único objeto é compartilhado por todas as sessões do app. Quando a
+    memória total ultrapassa max_bytes, as entradas menos usadas
+    recentemente são descartadas.
+
+    Args:
+        max_bytes (int): Limite de memória do cache em bytes.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 ** 2):
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None, count=True):
+        """
+        Retorna o resultado em cache (atualizando o uso) ou default.
+
+        Com count=False a consulta não entra nos acertos e falhas (consultas
+        internas de outra consulta já contada).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += count
+                return default
+            self._entries.move_to_end(key)
+            self.hits += count
+            return entry[0]
+
+    def put(self, key, result):
+        """Armazena um resultado, descartando entradas antigas se necessário."""
+        size = result_nbytes(result)
+        _freeze(result)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            if size > self.max_bytes:
+                return result
+            self._entries[key] = (result, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+                self.evictions += 1
+        return result
+
+    def get_or_compute(self, key, compute, count=True):
+        """
+        Retorna o resultado em cache ou calcula e armazena com compute().
+
+        Args:
+            key (tuple): Chave de cache (entradas quantizadas).
+            compute (callable): Função sem argumentos que produz o resultado.
+            count (bool): Conta a consulta nas estatísticas e no rastreamento
+                (ver get).
+
+        Returns:
+            Resultado da simulação.
+        """
+        result = self.get(key, count=count)
+        if count:
+            record(n_cache_hits=int(result is not None), n_cache_misses=int(result is None))
+        if result is None:
+            result = self.put(key, compute())
+        return result
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Estatísticas do cache para exibição no app.
+
+        Returns:
+            dict: Entradas, memória usada, acertos, falhas e taxa de acerto.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+def cached_hydrothermal_trajectory(cache, temperature, solid_loading, cellulose_fraction, hemicellulose_fraction,
+                                   count=True):
+    """
+    Trajetória contínua de uma condição, compartilhada via cache.
+
+    Args:
+        count (bool): Conta a consulta nas estatísticas do cache.
+
+    Returns:
+        HydrothermalTrajectory: Avaliável em quaisquer tempos.
+    """
+    key = hydrothermal_trajectory_key(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction)
+    return cache.get_or_compute(key, lambda: HydrothermalTrajectory(
+        temperature, solid_loading, cellulose_fraction, hemicellulose_fraction
+    ), count=count)
+
+@instrumented("hydrothermal_cached")
+def cached_hydrothermal_degradation(cache, temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final,
+                                    adaptive=False):
+    """
+    simulate_hydrothermal_degradation com resultados compartilhados via cache.
+
+    Os resultados são amostrados da trajetória contínua em cache: mudar
+    apenas o tempo final não resolve o sistema de novo. Cada chamada conta
+    uma única consulta (a da trajetória, feita em uma falha, não é contada).
+
+    Args:
+        cache (SimulationCache): Cache do processo.
+        adaptive (bool): Amostragem adaptada à curvatura.
+        Demais argumentos: os mesmos de simulate_hydrothermal_degradation.
+
+    Returns:
+        HydrothermalResult: Resultados da simulação (bloco somente leitura).
+    """
+    key = hydrothermal_cache_key(temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final,
+                                 adaptive)
+    return cache.get_or_compute(key, lambda: cached_hydrothermal_trajectory(
+        cache, temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, count=False
+    ).sample(time_final, adaptive=adaptive))
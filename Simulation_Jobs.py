@@ -0,0 +1,196 @@
+# EXECUÇÃO DE SIMULAÇÕES EM SEGUNDO PLANO
+# Pool de workers compartilhado por todas as sessões do app. Cada sessão
+# ocupa "vagas" (uma por seção da página); um novo pedido na mesma vaga
+# torna o anterior obsoleto e o cancela, e pedidos idênticos em andamento
+# (mesma chave, de qualquer sessão) compartilham o mesmo job. Vagas sem
+# uso por algum tempo (sessões encerradas) são liberadas com seus resultados.
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Instrumentation import record
+
+# Tempo sem consultas após o qual uma vaga é considerada abandonada (s)
+DEFAULT_IDLE_SECONDS = 30 * 60
+
+class _Job:
+    """Job no pool: chave, future e vagas que aguardam o resultado."""
+
+    def __init__(self, key, future):
+        self.key = key
+        self.future = future
+        self.owners = set()
+
+class SimulationJobs:
+    """
+    Fila de simulações em segundo plano, segura para múltiplas threads.
+
+    O pool de threads compartilha com o app o cache de simulação e a
+    superfície de resposta, sem serializar resultados entre processos. Os
+    integradores do solve_ivp avançam os passos em Python, então as threads
+    quase não rodam em paralelo (GIL): o pool mantém a página responsiva,
+    não acelera as simulações.
+
+    Cada job roda em uma cópia do contexto de quem o enviou: o Trace ativo
+    (Instrumentation) continua registrando as etapas executadas no pool.
+
+    Vagas não consultadas há idle_seconds (sessões encerradas ou
+    abandonadas) são liberadas no próximo envio, junto com os resultados
+    que só elas aguardavam.
+
+    Cancelamento: um job ainda na fila é descartado quando nenhuma vaga o
+    aguarda mais. Um job já em execução termina (seu resultado ainda
+    alimenta o cache compartilhado), mas não é entregue a ninguém.
+
+    Args:
+        max_workers (int): Threads do pool (padrão: número de CPUs, até 8).
+        idle_seconds (float): Tempo sem consultas até liberar uma vaga.
+    """
+
+    def __init__(self, max_workers=None, idle_seconds=DEFAULT_IDLE_SECONDS):
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, 8)
+        self.max_workers = max_workers
+        self.idle_seconds = idle_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="simulation")
+        # Reentrante: o callback de um job já concluído roda dentro de submit
+        self._lock = threading.RLock()
+        self._jobs = {}
+        self._owners = {}
+        self._last_seen = {}
+        self.submitted = 0
+        self.deduplicated = 0
+        self.cancelled = 0
+        self.completed = 0
+        self.failed = 0
+        self.expired = 0
+
+    def submit(self, owner, key, fn, *args, **kwargs):
+        """
+        Envia fn(*args, **kwargs) para o pool, ocupando a vaga owner.
+
+        Se a vaga já aguarda a mesma chave, nada muda; se aguardava outra,
+        o job anterior é liberado (e cancelado se ninguém mais o aguarda).
+        Um job com a mesma chave em andamento ou concluído é reaproveitado.
+
+        Args:
+            owner (hashable): Vaga (ex.: (id da sessão, "hydrothermal")).
+            key (hashable): Chave do pedido (entradas quantizadas).
+            fn (callable): Função executada no pool.
+
+        Returns:
+            concurrent.futures.Future: Future do job.
+        """
+        with self._lock:
+            self._expire_idle()
+            self._last_seen[owner] = time.monotonic()
+            current = self._owners.get(owner)
+            if current == key:
+                return self._jobs[key].future
+            if current is not None:
+                self._release(owner, current)
+
+            job = self._jobs.get(key)
+            if job is not None:
+                self.deduplicated += 1
+                record(n_jobs_deduplicated=1)
+            else:
+                context = contextvars.copy_context()
+                job = _Job(key, self._executor.submit(context.run, fn, *args, **kwargs))
+                job.future.add_done_callback(lambda future, job=job: self._finished(job))
+                self._jobs[key] = job
+                self.submitted += 1
+                record(n_jobs_submitted=1)
+            job.owners.add(owner)
+            self._owners[owner] = key
+            return job.future
+
+    def job(self, owner):
+        """Future do job aguardado pela vaga, ou None."""
+        with self._lock:
+            key = self._owners.get(owner)
+            if key is not None:
+                self._last_seen[owner] = time.monotonic()
+            return None if key is None else self._jobs[key].future
+
+    def key(self, owner):
+        """Chave do job aguardado pela vaga, ou None."""
+        with self._lock:
+            return self._owners.get(owner)
+
+    def cancel(self, owner):
+        """Libera a vaga; o job é cancelado se ninguém mais o aguarda."""
+        with self._lock:
+            key = self._owners.get(owner)
+            if key is not None:
+                self._release(owner, key)
+
+    def _release(self, owner, key):
+        """Remove a vaga do job (com o lock já adquirido)."""
+        del self._owners[owner]
+        self._last_seen.pop(owner, None)
+        job = self._jobs[key]
+        job.owners.discard(owner)
+        if job.owners:
+            return
+        if not job.future.done():
+            if job.future.cancel():
+                self.cancelled += 1
+                record(n_jobs_cancelled=1)
+            else:
+                # Em execução: o resultado é descartado ao terminar (_finished)
+                return
+        del self._jobs[key]
+
+    def _expire_idle(self):
+        """Libera as vagas sem consultas há idle_seconds (com o lock já adquirido)."""
+        limit = time.monotonic() - self.idle_seconds
+        for owner in [owner for owner, seen in self._last_seen.items() if seen < limit]:
+            if owner in self._owners:
+                self._release(owner, self._owners[owner])
+                self.expired += 1
+            else:
+                del self._last_seen[owner]
+
+    def _finished(self, job):
+        """Contabiliza o job e descarta resultados que ninguém aguarda."""
+        if job.future.cancelled():
+            return
+        with self._lock:
+            if job.future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+            if not job.owners and self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+
+    def stats(self):
+        """
+        Estatísticas da fila para exibição no app.
+
+        Returns:
+            dict: Vagas, jobs guardados, em andamento, enviados,
+            reaproveitados, cancelados, concluídos, com erro e vagas liberadas
+            por inatividade.
+        """
+        with self._lock:
+            self._expire_idle()
+            return {
+                "workers": self.max_workers,
+                "owners": len(self._owners),
+                "jobs": len(self._jobs),
+                "running": sum(not job.future.done() for job in self._jobs.values()),
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "cancelled": self.cancelled,
+                "completed": self.completed,
+                "failed": self.failed,
+                "expired": self.expired,
+            }
+
+    def shutdown(self):
+        """Encerra o pool, cancelando os jobs na fila."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
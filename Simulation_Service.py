@@ -0,0 +1,616 @@
+# SERVIÇO HTTP/JSON LOCAL DOS SIMULADORES
+# Expõe os modelos de pré-tratamento hidrotérmico, hidrólise enzimática e
+# fermentação a outras ferramentas, sem a interface do Streamlit. As
+# requisições concorrentes de um mesmo modelo são reunidas em uma janela
+# curta (alguns ms) e resolvidas como um único lote vetorizado, dividindo o
+# custo fixo de cada chamada ao solver entre todas elas.
+#
+# Uso:
+#   python Simulation_Service.py --port 8765 --window-ms 5
+#
+#   POST /simulate/hydrothermal   {"temperature": 195, "solid_loading": 100,
+#                                  "cellulose_fraction": 0.4, "hemicellulose_fraction": 0.25,
+#                                  "time_final": 60}
+#   POST /simulate/hydrolysis     {"cellulose_fraction": 0.55, "hemicellulose_fraction": 0.1,
+#                                  "solid_loading": 100, "enzyme_loading": 10}
+#   POST /simulate/fermentation   {"biomass": 1, "glucose": 50, "xylose": 20}
+#   GET  /health                  situação e métricas do serviço
+#
+# As conexões HTTP/1.1 são mantidas abertas (keep-alive). Com o cabeçalho
+# "Accept: application/x-npz" (ou ?format=npz) a resposta é um arquivo .npz
+# com os arrays em binário, lido com np.load(io.BytesIO(corpo)).
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields, replace
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from Enzymatic_Hydrolysis import STATES as HYDROLYSIS_STATES, simulate_hydrolysis_batch
+from Fermentation import (
+    DEFAULT_PARAMETERS, STATES as FERMENTATION_STATES, FermentationParameters, simulate_fermentation_batch
+)
+from Hydrothermal_Pretreatment import SPECIES, TEMPERATURE_RANGE, simulate_hydrothermal_batch
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Janela de agrupamento (s) e tamanho máximo de um lote
+DEFAULT_WINDOW = 0.005
+DEFAULT_MAX_BATCH = 256
+
+# Limites de cada requisição
+MAX_BODY_BYTES = 1024 ** 2
+MAX_HEADERS = 100
+MAX_POINTS = 10_000
+
+# Tempo (s) que uma conexão ociosa fica aberta
+KEEP_ALIVE_TIMEOUT = 15.0
+
+JSON_CONTENT_TYPE = "application/json"
+BINARY_CONTENT_TYPE = "application/x-npz"
+
+# Latências guardadas para os percentis do /health
+_LATENCY_WINDOW = 4096
+
+# =============================================================================
+# ENTRADAS E SOLUÇÃO EM LOTE DE CADA MODELO
+# =============================================================================
+#
+# Cada modelo tem uma função que valida uma requisição e devolve
+# (grupo, condição) e uma função que resolve de uma vez uma lista de
+# condições do mesmo grupo. O grupo reúne o que o solver em lote exige em
+# comum (número de pontos, tempo final).
+
+def _check_fields(inputs, required, optional=()):
+    """Rejeita corpos que não são objetos JSON, entradas ausentes ou desconhecidas."""
+    if not isinstance(inputs, dict):
+        raise ValueError("O corpo da requisição deve ser um objeto JSON")
+    missing = [name for name in required if name not in inputs]
+    if missing:
+        raise ValueError(f"Entradas obrigatórias ausentes: {', '.join(missing)}")
+    unknown = sorted(set(inputs) - set(required) - set(optional))
+    if unknown:
+        raise ValueError(f"Entradas desconhecidas: {', '.join(unknown)}")
+
+def _number(inputs, name, default=None, minimum=None, maximum=None):
+    """Entrada numérica finita, opcionalmente limitada a [minimum, maximum]."""
+    value = inputs.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{name} deve ser um número finito")
+    if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+        raise ValueError(f"{name} deve estar entre {minimum} e {maximum}")
+    return float(value)
+
+def _n_points(inputs, default):
+    value = inputs.get("n_points", default)
+    if isinstance(value, bool) or not isinstance(value, int) or not 2 <= value <= MAX_POINTS:
+        raise ValueError(f"n_points deve ser um inteiro entre 2 e {MAX_POINTS}")
+    return value
+
+def _parse_hydrothermal(inputs):
+    _check_fields(
+        inputs,
+        ("temperature", "solid_loading", "cellulose_fraction", "hemicellulose_fraction", "time_final"),
+        ("n_points",),
+    )
+    condition = (
+        _number(inputs, "temperature", minimum=TEMPERATURE_RANGE[0], maximum=TEMPERATURE_RANGE[1]),
+        _number(inputs, "solid_loading", minimum=0.0),
+        _number(inputs, "cellulose_fraction", minimum=0.0, maximum=1.0),
+        _number(inputs, "hemicellulose_fraction", minimum=0.0, maximum=1.0),
+        _number(inputs, "time_final", minimum=0.0),
+    )
+    if condition[4] <= 0:
+        raise ValueError("time_final deve ser maior que zero")
+    return _n_points(inputs, 200), condition
+
+def _solve_hydrothermal(n_points, conditions):
+    batch = simulate_hydrothermal_batch(*np.array(conditions).T, n_points=n_points)
+    return [
+        {
+            "time": batch["time"][i],
+            "species": SPECIES,
+            "concentrations": batch["concentrations"][i],
+            "cellulose_degraded_percent": batch["cellulose_degraded_percent"][i],
+            "hemicellulose_degraded_percent": batch["hemicellulose_degraded_percent"][i],
+        }
+        for i in range(len(conditions))
+    ]
+
+def _parse_hydrolysis(inputs):
+    _check_fields(
+        inputs,
+        ("cellulose_fraction", "hemicellulose_fraction", "solid_loading", "enzyme_loading"),
+        ("time_final", "n_points"),
+    )
+    condition = (
+        _number(inputs, "cellulose_fraction", minimum=0.0, maximum=1.0),
+        _number(inputs, "hemicellulose_fraction", minimum=0.0, maximum=1.0),
+        _number(inputs, "solid_loading", minimum=0.0),
+        _number(inputs, "enzyme_loading", minimum=0.0),
+    )
+    time_final = _number(inputs, "time_final", 96.0)
+    if time_final <= 0:
+        raise ValueError("time_final deve ser maior que zero")
+    return (time_final, _n_points(inputs, 97)), condition
+
+def _solve_hydrolysis(group, conditions):
+    time_final, n_points = group
+    batch = simulate_hydrolysis_batch(*np.array(conditions).T, time_final=time_final, n_points=n_points)
+    return [
+        {
+            "time": batch["time"],
+            "states": HYDROLYSIS_STATES,
+            "concentrations": batch["concentrations"][i],
+            "free_enzyme": batch["free_enzyme"][i],
+            "bound_enzyme": batch["bound_enzyme"][i],
+            "cellulose_conversion_percent": batch["cellulose_conversion_percent"][i],
+            "hemicellulose_conversion_percent": batch["hemicellulose_conversion_percent"][i],
+            "glucose_yield_percent": batch["glucose_yield_percent"][i],
+        }
+        for i in range(len(conditions))
+    ]
+
+_FERMENTATION_PARAMETERS = tuple(f.name for f in fields(FermentationParameters))
+
+def _parse_fermentation(inputs):
+    _check_fields(inputs, ("biomass", "glucose", "xylose"), ("ethanol", "time_final", "n_points", "params"))
+    overrides = inputs.get("params", {})
+    if not isinstance(overrides, dict):
+        raise ValueError("params deve ser um objeto com parâmetros de FermentationParameters")
+    unknown = sorted(set(overrides) - set(_FERMENTATION_PARAMETERS))
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {', '.join(unknown)}")
+    params = replace(DEFAULT_PARAMETERS, **{name: _number(overrides, name) for name in overrides})
+    condition = (
+        _number(inputs, "biomass", minimum=0.0),
+        _number(inputs, "glucose", minimum=0.0),
+        _number(inputs, "xylose", minimum=0.0),
+        _number(inputs, "ethanol", 0.0, minimum=0.0),
+        params,
+    )
+    time_final = _number(inputs, "time_final", 72.0)
+    if time_final <= 0:
+        raise ValueError("time_final deve ser maior que zero")
+    return (time_final, _n_points(inputs, 73)), condition
+
+def _solve_fermentation(group, conditions):
+    time_final, n_points = group
+    biomass, glucose, xylose, ethanol, params = zip(*conditions)
+    batch = simulate_fermentation_batch(
+        biomass, glucose, xylose, ethanol, params=list(params), time_final=time_final, n_points=n_points
+    )
+    return [
+        {
+            "time": batch["time"],
+            "states": FERMENTATION_STATES,
+            "concentrations": batch["concentrations"][i],
+            "ethanol_titer": batch["ethanol_titer"][i],
+            "ethanol_yield": batch["ethanol_yield"][i],
+            "ethanol_productivity": batch["ethanol_productivity"][i],
+            "glucose_conversion_percent": batch["glucose_conversion_percent"][i],
+            "xylose_conversion_percent": batch["xylose_conversion_percent"][i],
+        }
+        for i in range(len(conditions))
+    ]
+
+# Modelo → (validação de uma requisição, solução de um lote)
+MODELS = {
+    "hydrothermal": (_parse_hydrothermal, _solve_hydrothermal),
+    "hydrolysis": (_parse_hydrolysis, _solve_hydrolysis),
+    "fermentation": (_parse_fermentation, _solve_fermentation),
+}
+
+def solve_batch(solve, group, conditions):
+    """
+    Resolve um lote; se ele falhar, resolve cada condição separadamente.
+
+    Assim, uma condição que o solver rejeita não derruba as requisições
+    que chegaram no mesmo lote.
+
+    Returns:
+        list: Um resultado (dict) ou uma exceção por condição.
+    """
+    try:
+        return solve(group, conditions)
+    except Exception as e:
+        if len(conditions) == 1:
+            return [e]
+    results = []
+    for condition in conditions:
+        try:
+            results.extend(solve(group, [condition]))
+        except Exception as e:
+            results.append(e)
+    return results
+
+# =============================================================================
+# SERIALIZAÇÃO DAS RESPOSTAS
+# =============================================================================
+
+def _jsonable(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+def encode_json(result):
+    """Resultado como JSON compacto (arrays como listas)."""
+    return json.dumps({name: _jsonable(value) for name, value in result.items()}, separators=(",", ":")).encode()
+
+def encode_npz(result):
+    """
+    Resultado como arquivo .npz (sem compressão nem pickle).
+
+    Os arrays viajam em binário float64, sem a conversão para texto, o que
+    reduz o tamanho e o custo das trajetórias longas.
+    """
+    buffer = io.BytesIO()
+    np.savez(buffer, **{name: np.asarray(value) for name, value in result.items()})
+    return buffer.getvalue()
+
+# =============================================================================
+# AGRUPAMENTO DAS REQUISIÇÕES (MICRO-BATCHING)
+# =============================================================================
+
+class ServiceMetrics:
+    """Contadores e latências do serviço, expostos em /health."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.requests = Counter()
+        self.responses = Counter()
+        self.connections = 0
+        self.open_connections = 0
+        self.batches = 0
+        self.batched_conditions = 0
+        self.max_batch = 0
+        self.solver_seconds = 0.0
+        self._latencies = deque(maxlen=_LATENCY_WINDOW)
+
+    def batch(self, size, seconds):
+        self.batches += 1
+        self.batched_conditions += size
+        self.max_batch = max(self.max_batch, size)
+        self.solver_seconds += seconds
+
+    def latency(self, seconds):
+        self._latencies.append(seconds)
+
+    def snapshot(self):
+        """
+        Estado atual das métricas.
+
+        Returns:
+            dict: Tempo no ar, requisições por rota ("other" para as
+            desconhecidas), respostas por status,
+            conexões, lotes (quantidade, tamanho médio e máximo, tempo de
+            solver) e percentis da latência das simulações (ms).
+        """
+        latencies = np.array(self._latencies) * 1000
+        return {
+            "status": "ok",
+            "uptime_seconds": time.time() - self.started,
+            "requests": dict(self.requests),
+            "responses": {str(status): count for status, count in self.responses.items()},
+            "connections": self.connections,
+            "open_connections": self.open_connections,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_conditions / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch,
+            "solver_seconds": self.solver_seconds,
+            "latency_ms": {
+                f"p{q}": float(np.percentile(latencies, q)) if latencies.size else None for q in (50, 95, 99)
+            },
+        }
+
+class MicroBatcher:
+    """
+    Fila de um modelo: reúne as requisições que chegam dentro da janela
+    (ou até max_batch) e resolve cada grupo como um lote vetorizado em uma
+    thread, sem bloquear o laço de eventos.
+
+    Args:
+        solve (callable): Solução em lote do modelo (ver MODELS).
+        executor (Executor): Pool onde os lotes são resolvidos.
+        metrics (ServiceMetrics): Métricas do serviço.
+        window (float): Janela de agrupamento (s).
+        max_batch (int): Tamanho máximo de um lote.
+    """
+
+    def __init__(self, solve, executor, metrics, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.solve = solve
+        self.executor = executor
+        self.metrics = metrics
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = asyncio.Queue()
+        self._tasks = set()
+
+    async def submit(self, group, condition):
+        """Aguarda o resultado de uma condição, resolvida junto com as demais do lote."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((group, condition, future))
+        return await future
+
+    async def run(self):
+        """Laço de agrupamento (uma tarefa por modelo)."""
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(items) < self.max_batch:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    items.append(self._queue.get_nowait())
+
+            groups = defaultdict(list)
+            for group, condition, future in items:
+                groups[group].append((condition, future))
+            for group, members in groups.items():
+                # O próximo lote é reunido enquanto este é resolvido
+                task = asyncio.create_task(self._dispatch(group, members))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, group, members):
+        conditions = [condition for condition, _ in members]
+        start = time.perf_counter()
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, solve_batch, self.solve, group, conditions
+            )
+        except Exception as e:
+            results = [e] * len(members)
+        self.metrics.batch(len(members), time.perf_counter() - start)
+        for (_, future), result in zip(members, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+# =============================================================================
+# SERVIDOR HTTP
+# =============================================================================
+
+class SimulationService:
+    """
+    Servidor HTTP/1.1 assíncrono (somente biblioteca padrão) dos simuladores.
+
+    Args:
+        host (str): Endereço de escuta (padrão: somente a máquina local).
+        port (int): Porta (0 escolhe uma porta livre).
+        window (float): Janela de agrupamento das requisições (s).
+        max_batch (int): Tamanho máximo de um lote.
+        n_workers (int): Threads que resolvem os lotes (padrão: número de CPUs, até 8).
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, window=DEFAULT_WINDOW,
+                 max_batch=DEFAULT_MAX_BATCH, n_workers=None):
+        self.host = host
+        self.port = port
+        self.metrics = ServiceMetrics()
+        self.executor = ThreadPoolExecutor(
+            max_workers=n_workers or min(os.cpu_count() or 1, 8), thread_name_prefix="service"
+        )
+        self.batchers = {
+            name: MicroBatcher(solve, self.executor, self.metrics, window=window, max_batch=max_batch)
+            for name, (_, solve) in MODELS.items()
+        }
+        self._server = None
+        self._tasks = []
+        # Conexões abertas: tarefa do handler → writer
+        self._connections = {}
+
+    async def start(self):
+        """Abre a porta e inicia as filas; devolve (host, porta) efetivos."""
+        self._tasks = [asyncio.create_task(batcher.run()) for batcher in self.batchers.values()]
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+        # O servidor não fecha as conexões keep-alive: fechá-las faz cada
+        # handler ler o fim da conexão e terminar normalmente
+        for writer in list(self._connections.values()):
+            writer.close()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        self.metrics.connections += 1
+        self.metrics.open_connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    break
+                if isinstance(request, HTTPStatus):
+                    # Requisição malformada: responde e fecha a conexão
+                    await self._respond(writer, request, {"error": request.phrase}, keep_alive=False)
+                    break
+                method, target, version, headers, body = request
+                keep_alive = _keep_alive(version, headers)
+                status, payload, content_type = await self._route(method, target, headers, body)
+                await self._respond(writer, status, payload, content_type, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            self.metrics.open_connections -= 1
+            writer.close()
+
+    async def _route(self, method, target, headers, body):
+        """Devolve (status, corpo, tipo) da resposta."""
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+        model = path[len("/simulate/"):] if path.startswith("/simulate/") else None
+        # Só rotas conhecidas têm contador próprio (o caminho vem do cliente)
+        self.metrics.requests[path if path == "/health" or model in MODELS else "other"] += 1
+
+        if path == "/health":
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use GET"}, JSON_CONTENT_TYPE
+            return HTTPStatus.OK, self.metrics.snapshot(), JSON_CONTENT_TYPE
+
+        if model not in MODELS:
+            return HTTPStatus.NOT_FOUND, {"error": f"Rota desconhecida: {url.path}"}, JSON_CONTENT_TYPE
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST"}, JSON_CONTENT_TYPE
+
+        binary = (BINARY_CONTENT_TYPE in headers.get("accept", "")
+                  or parse_qs(url.query).get("format") == ["npz"])
+        start = time.perf_counter()
+        try:
+            group, condition = MODELS[model][0](json.loads(body or b"null"))
+            result = await self.batchers[model].submit(group, condition)
+        except ValueError as e:
+            # Inclui JSON inválido e condições rejeitadas pelo solver
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}, JSON_CONTENT_TYPE
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}, JSON_CONTENT_TYPE
+        self.metrics.latency(time.perf_counter() - start)
+        return HTTPStatus.OK, result, BINARY_CONTENT_TYPE if binary else JSON_CONTENT_TYPE
+
+    async def _respond(self, writer, status, payload, content_type=JSON_CONTENT_TYPE, keep_alive=True):
+        self.metrics.responses[int(status)] += 1
+        body = encode_npz(payload) if content_type == BINARY_CONTENT_TYPE else encode_json(payload)
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+        ]
+        if keep_alive:
+            head += ["Connection: keep-alive", f"Keep-Alive: timeout={KEEP_ALIVE_TIMEOUT:.0f}"]
+        else:
+            head.append("Connection: close")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+async def _read_request(reader):
+    """
+    Lê uma requisição HTTP/1.x.
+
+    Returns:
+        tuple: (método, alvo, versão, cabeçalhos, corpo); None se a conexão
+        foi fechada, ou o HTTPStatus do erro se a requisição é inválida.
+    """
+    try:
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            return HTTPStatus.BAD_REQUEST
+        method, target, version = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                return HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+    except ValueError:
+        # Linha maior que o limite do StreamReader
+        return HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE
+
+    if "transfer-encoding" in headers:
+        return HTTPStatus.NOT_IMPLEMENTED
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        return HTTPStatus.BAD_REQUEST
+    if length < 0:
+        return HTTPStatus.BAD_REQUEST
+    if length > MAX_BODY_BYTES:
+        return HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    body = await reader.readexactly(length) if length else b""
+    return method, target, version, headers, body
+
+def _keep_alive(version, headers):
+    """HTTP/1.1 mantém a conexão salvo "Connection: close"; HTTP/1.0 só com "keep-alive"."""
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+# =============================================================================
+# EXECUÇÃO PELA LINHA DE COMANDO
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON local dos simuladores.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Endereço de escuta (padrão: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Porta (padrão: {DEFAULT_PORT})")
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW * 1000,
+                        help=f"Janela de agrupamento em ms (padrão: {DEFAULT_WINDOW * 1000:g})")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help=f"Tamanho máximo de um lote (padrão: {DEFAULT_MAX_BATCH})")
+    parser.add_argument("--workers", type=int, default=None, help="Threads dos lotes (padrão: número de CPUs)")
+    args = parser.parse_args(argv)
+
+    service = SimulationService(args.host, args.port, window=args.window_ms / 1000,
+                                max_batch=args.max_batch, n_workers=args.workers)
+
+    async def serve():
+        host, port = await service.start()
+        print(f"Servindo em http://{host}:{port}", file=sys.stderr)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,458 @@
+# GERAÇÃO DE DADOS SINTÉTICOS PARA OS SURROGATES DA HIDRÓLISE
+# Substitui os notebooks que geravam BEPE FAPESP/Enzymatic Hydrolysis/
+# synthetic_data_*.csv uma trajetória por vez. As condições vêm de um
+# delineamento (hipercubo latino, Sobol' ou aleatório), o modelo mecanístico
+# é resolvido em lotes vetorizados nos processos de um pool, e cada bloco
+# ("shard") é gravado em formato colunar (Parquet, ou .npz sem pyarrow). O
+# manifest.json da pasta descreve o esquema, a procedência (modelo,
+# parâmetros, solver, delineamento, sementes) e os blocos já gravados; uma
+# geração interrompida continua do último bloco.
+#
+# Uso:
+#   python Synthetic_Data.py dados_sinteticos --samples 1000000 --design sobol --workers 8
+#   python Synthetic_Data.py dados_sinteticos --samples 100000 --range Time=0:72 --noise 0.02
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy
+from scipy.stats import qmc
+
+from Enzymatic_Hydrolysis import ANGARITA_2015_PARAMETERS, STATES, simulate_hydrolysis_endpoints
+from Model_Registry import INPUT_FEATURES
+
+DATASET_VERSION = 1
+MANIFEST = "manifest.json"
+
+DESIGNS = ("lhs", "sobol", "random")
+FORMATS = ("parquet", "npz")
+
+# Faixa (mín, máx) de cada entrada, as mesmas de synthetic_data_*.csv. A
+# lignina não entra no modelo mecanístico, mas é uma entrada dos surrogates.
+DEFAULT_RANGES = {
+    "Cellulose": (0.60, 0.70),
+    "Hemicellulose": (0.07, 0.09),
+    "Lignin": (0.20, 0.30),
+    "Solids_Loading": (100.0, 250.0),
+    "Enzyme_Loading": (0.05, 1.2),
+    "Time": (0.0, 100.0),
+}
+
+# Alvos dos surrogates → estado do modelo
+TARGETS = {"Glucose": "glucose", "Xylose": "xylose", "Cellobiose": "cellobiose"}
+
+UNITS = {
+    "Cellulose": "fração mássica",
+    "Hemicellulose": "fração mássica",
+    "Lignin": "fração mássica",
+    "Solids_Loading": "g/L",
+    "Enzyme_Loading": "g/L",
+    "Time": "h",
+    "Glucose": "g/L",
+    "Xylose": "g/L",
+    "Cellobiose": "g/L",
+}
+
+# Linhas por bloco gravado (potência de 2: cada bloco de Sobol' é balanceado)
+DEFAULT_SHARD_SIZE = 2 ** 16
+
+# Condições por integração do solver (o custo por condição cresce para
+# lotes muito grandes, porque o passo é comum a todas)
+DEFAULT_BATCH_SIZE = 2048
+
+# Tolerâncias do solver
+SOLVER_SETTINGS = {"method": "BDF", "rtol": 1e-6, "atol": 1e-9}
+
+# =============================================================================
+# DELINEAMENTO E SIMULAÇÃO
+# =============================================================================
+
+def shard_seed(seed, index):
+    """Semente independente do bloco index (não depende do número de processos)."""
+    return np.random.SeedSequence(seed, spawn_key=(index,))
+
+def design_points(design, dimension, seed, index, start, n):
+    """
+    Pontos do delineamento no hipercubo unitário para um bloco.
+
+    Sobol': os pontos [start, start + n) de uma única sequência embaralhada,
+    comum a todos os blocos. Hipercubo latino e aleatório: cada bloco é um
+    delineamento próprio, com a semente do bloco.
+
+    Returns:
+        np.ndarray: Pontos com formato (n, dimension).
+    """
+    if design == "sobol":
+        sampler = qmc.Sobol(d=dimension, scramble=True, seed=seed)
+        if start:
+            sampler.fast_forward(start)
+        return sampler.random(n)
+    rng = np.random.default_rng(shard_seed(seed, index))
+    if design == "lhs":
+        return qmc.LatinHypercube(d=dimension, seed=rng).random(n)
+    if design == "random":
+        return rng.random((n, dimension))
+    raise ValueError(f"Delineamento desconhecido: {design!r} (use {', '.join(DESIGNS)})")
+
+def simulate_samples(inputs, batch_size=DEFAULT_BATCH_SIZE, params=None):
+    """
+    Resolve o modelo de Angarita et al. (2015) para cada amostra.
+
+    Cada amostra é resolvida no seu próprio tempo (simulate_hydrolysis_endpoints),
+    em integrações de até batch_size condições.
+
+    Args:
+        inputs (dict): Colunas de INPUT_FEATURES, arrays (n,).
+        batch_size (int): Condições por integração.
+        params (dict): Parâmetros do modelo (padrão: ANGARITA_2015_PARAMETERS).
+
+    Returns:
+        dict: Colunas de TARGETS, arrays (n,).
+    """
+    n = len(inputs["Time"])
+    states = np.empty((n, len(STATES)))
+    for start in range(0, n, batch_size):
+        batch = slice(start, start + batch_size)
+        states[batch] = simulate_hydrolysis_endpoints(
+            inputs["Cellulose"][batch], inputs["Hemicellulose"][batch], inputs["Solids_Loading"][batch],
+            inputs["Enzyme_Loading"][batch], inputs["Time"][batch], params=params, **SOLVER_SETTINGS
+        )
+    return {target: states[:, STATES.index(state)] for target, state in TARGETS.items()}
+
+def generate_shard(settings, index):
+    """
+    Gera as colunas de um bloco.
+
+    Args:
+        settings (dict): Configuração da geração (ver generate_dataset).
+        index (int): Número do bloco.
+
+    Returns:
+        dict: Colunas de INPUT_FEATURES e TARGETS, arrays (linhas do bloco,).
+    """
+    start = index * settings["shard_size"]
+    n = min(settings["shard_size"], settings["n_samples"] - start)
+    ranges = settings["ranges"]
+
+    unit = design_points(settings["design"], len(INPUT_FEATURES), settings["seed"], index, start, n)
+    low = np.array([ranges[name][0] for name in INPUT_FEATURES])
+    high = np.array([ranges[name][1] for name in INPUT_FEATURES])
+    points = low + unit * (high - low)
+    columns = {name: points[:, j] for j, name in enumerate(INPUT_FEATURES)}
+    columns.update(simulate_samples(columns, batch_size=settings["batch_size"]))
+
+    if settings["noise"] > 0:
+        # Ruído relativo gaussiano nos alvos (com a semente do bloco, mas em
+        # uma sequência separada da usada pelo delineamento)
+        rng = np.random.default_rng(shard_seed(settings["seed"], index).spawn(1)[0])
+        for target in TARGETS:
+            columns[target] = np.maximum(columns[target] * (1 + settings["noise"] * rng.standard_normal(n)), 0.0)
+    return columns
+
+# =============================================================================
+# ESQUEMA, PROCEDÊNCIA E GRAVAÇÃO
+# =============================================================================
+
+def _parameters_fingerprint(params):
+    payload = json.dumps(params, sort_keys=True).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def dataset_schema(ranges):
+    """Colunas, tipos, unidades, papel (entrada/alvo) e faixa das entradas."""
+    schema = [
+        {"name": name, "dtype": "float64", "unit": UNITS[name], "role": "input", "range": list(ranges[name])}
+        for name in INPUT_FEATURES
+    ]
+    schema += [{"name": name, "dtype": "float64", "unit": UNITS[name], "role": "target"} for name in TARGETS]
+    return schema
+
+def dataset_provenance():
+    """Modelo, parâmetros, solver e ambiente que geraram os dados."""
+    return {
+        "generator": "Synthetic_Data.py",
+        "model": "Angarita et al. (2015), Enzymatic_Hydrolysis.simulate_hydrolysis_endpoints",
+        "parameters": ANGARITA_2015_PARAMETERS,
+        "parameters_fingerprint": _parameters_fingerprint(ANGARITA_2015_PARAMETERS),
+        "solver": SOLVER_SETTINGS,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+    }
+
+def _shard_name(index, format):
+    return f"part-{index:06d}.{format}"
+
+def _write_shard(path, columns, format, metadata):
+    """Grava um bloco de forma atômica (arquivo temporário + os.replace)."""
+    tmp = path.with_name(path.name + ".tmp")
+    if format == "parquet":
+        # pyarrow só é necessário para Parquet
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(columns).replace_schema_metadata({"ethanol_ai": json.dumps(metadata)})
+        pq.write_table(table, tmp)
+    else:
+        with open(tmp, "wb") as f:
+            np.savez(f, **columns)
+    os.replace(tmp, path)
+
+def _generate_and_write(args):
+    """Gera e grava um bloco no processo do pool; devolve o resumo do bloco."""
+    settings, index, path = args
+    start = time.perf_counter()
+    columns = generate_shard(settings, index)
+    _write_shard(Path(path), columns, settings["format"], {"dataset_version": DATASET_VERSION, "shard": index})
+    return {
+        "index": index,
+        "file": Path(path).name,
+        "rows": len(columns["Time"]),
+        "seconds": time.perf_counter() - start,
+        "nonfinite": int(sum((~np.isfinite(columns[target])).sum() for target in TARGETS)),
+    }
+
+def _save_manifest(path, manifest):
+    """Grava o manifest de forma atômica."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+def _default_format():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "npz"
+    return "parquet"
+
+def _print_progress(report):
+    """Relatório de progresso padrão (stderr)."""
+    print(
+        f"\rbloco {report['shards_done']}/{report['n_shards']}: {report['rows_done']:,} amostras "
+        f"| {report['samples_per_second']:,.0f} amostras/s",
+        end="\n" if report["finished"] else "",
+        file=sys.stderr,
+        flush=True,
+    )
+
+# =============================================================================
+# GERAÇÃO DO CONJUNTO DE DADOS
+# =============================================================================
+
+def generate_dataset(output_dir, n_samples, design="lhs", ranges=None, seed=0, noise=0.0,
+                     shard_size=DEFAULT_SHARD_SIZE, batch_size=DEFAULT_BATCH_SIZE, format=None,
+                     n_workers=None, restart=False, progress=_print_progress):
+    """
+    Gera um conjunto de dados sintéticos em blocos colunares.
+
+    Os blocos são distribuídos em um pool de processos, com no máximo dois
+    blocos por processo em andamento. Cada bloco tem a sua semente
+    (SeedSequence(seed, spawn_key=(bloco,))), de modo que o resultado não
+    depende do número de processos nem da ordem de conclusão. O manifest é
+    atualizado após cada bloco gravado.
+
+    Args:
+        output_dir (str): Pasta dos blocos e do manifest.json.
+        n_samples (int): Número de amostras.
+        design (str): "lhs" (hipercubo latino por bloco), "sobol" (uma
+            sequência embaralhada) ou "random".
+        ranges (dict): Faixas (mín, máx) que substituem DEFAULT_RANGES.
+        seed (int): Semente da geração.
+        noise (float): Desvio-padrão relativo do ruído nos alvos (0 = sem ruído).
+        shard_size (int): Linhas por bloco.
+        batch_size (int): Condições por integração do solver.
+        format (str): "parquet" ou "npz" (padrão: parquet se pyarrow está
+            instalado).
+        n_workers (int): Processos do pool (padrão: número de CPUs; 1 gera
+            no próprio processo).
+        restart (bool): Descarta uma geração anterior na mesma pasta.
+        progress (callable): Recebe um dict de progresso após cada bloco
+            (None desativa).
+
+    Returns:
+        dict: Manifest (esquema, procedência, configuração e blocos).
+    """
+    if n_samples <= 0 or shard_size <= 0 or batch_size <= 0:
+        raise ValueError("n_samples, shard_size e batch_size devem ser positivos")
+    if design not in DESIGNS:
+        raise ValueError(f"Delineamento desconhecido: {design!r} (use {', '.join(DESIGNS)})")
+    format = format or _default_format()
+    if format not in FORMATS:
+        raise ValueError(f"Formato desconhecido: {format!r} (use {', '.join(FORMATS)})")
+    unknown = set(ranges or {}) - set(DEFAULT_RANGES)
+    if unknown:
+        raise ValueError(f"Entradas desconhecidas: {', '.join(sorted(unknown))}")
+    ranges = {name: tuple(map(float, bounds)) for name, bounds in {**DEFAULT_RANGES, **(ranges or {})}.items()}
+    if any(low > high for low, high in ranges.values()) or ranges["Time"][0] < 0:
+        raise ValueError("Faixas inválidas: mín > máx ou tempo negativo")
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    settings = {
+        "n_samples": int(n_samples),
+        "design": design,
+        "ranges": ranges,
+        "seed": int(seed),
+        "noise": float(noise),
+        "shard_size": int(shard_size),
+        "batch_size": int(batch_size),
+        "format": format,
+    }
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST
+    n_shards = -(-settings["n_samples"] // settings["shard_size"])
+
+    manifest = None
+    if manifest_path.exists() and not restart:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        # Tuplas viram listas no JSON
+        if manifest.get("settings") != json.loads(json.dumps(settings)):
+            raise ValueError(
+                f"{output_dir} contém uma geração com outra configuração; use restart=True (--restart)"
+            )
+    if manifest is None:
+        for stale in output_dir.glob("part-*"):
+            stale.unlink()
+        manifest = {
+            "dataset_version": DATASET_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "settings": settings,
+            "schema": dataset_schema(ranges),
+            "provenance": dataset_provenance(),
+            "n_shards": n_shards,
+            "shards": [],
+            "finished": False,
+        }
+        _save_manifest(manifest_path, manifest)
+    if manifest["finished"]:
+        return manifest
+
+    done = {shard["index"] for shard in manifest["shards"]}
+    tasks = [(settings, index, str(output_dir / _shard_name(index, format)))
+             for index in range(n_shards) if index not in done]
+
+    start = time.perf_counter()
+    rows_at_start = sum(shard["rows"] for shard in manifest["shards"])
+
+    def commit(summary):
+        manifest["shards"].append(summary)
+        manifest["shards"].sort(key=lambda shard: shard["index"])
+        manifest["finished"] = len(manifest["shards"]) == n_shards
+        _save_manifest(manifest_path, manifest)
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            rows_done = sum(shard["rows"] for shard in manifest["shards"])
+            progress({
+                "shards_done": len(manifest["shards"]),
+                "n_shards": n_shards,
+                "rows_done": rows_done,
+                "elapsed": elapsed,
+                "samples_per_second": (rows_done - rows_at_start) / elapsed if elapsed > 0 else 0.0,
+                "finished": manifest["finished"],
+            })
+
+    executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    try:
+        pending = deque()
+        for task in tasks:
+            if executor is None:
+                commit(_generate_and_write(task))
+                continue
+            pending.append(executor.submit(_generate_and_write, task))
+            while len(pending) >= 2 * n_workers:
+                commit(pending.popleft().result())
+        while pending:
+            commit(pending.popleft().result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return manifest
+
+def load_dataset(path, columns=None):
+    """
+    Lê um conjunto gerado por generate_dataset.
+
+    Args:
+        path (str): Pasta com manifest.json e os blocos.
+        columns (list): Colunas a ler (padrão: todas).
+
+    Returns:
+        pd.DataFrame: Amostras na ordem dos blocos, com as colunas de
+        INPUT_FEATURES e TARGETS (o formato de synthetic_data_*.csv).
+    """
+    path = Path(path)
+    manifest = json.loads((path / MANIFEST).read_text(encoding="utf-8"))
+    if manifest["dataset_version"] != DATASET_VERSION:
+        raise ValueError(f"Versão do conjunto de dados não suportada: {manifest['dataset_version']}")
+    columns = list(columns or [column["name"] for column in manifest["schema"]])
+
+    frames = []
+    for shard in manifest["shards"]:
+        file = path / shard["file"]
+        if manifest["settings"]["format"] == "parquet":
+            frames.append(pd.read_parquet(file, columns=columns))
+        else:
+            with np.load(file) as data:
+                frames.append(pd.DataFrame({name: data[name] for name in columns}))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+# =============================================================================
+# EXECUÇÃO PELA LINHA DE COMANDO
+# =============================================================================
+
+def _parse_range(text):
+    name, _, bounds = text.partition("=")
+    low, _, high = bounds.partition(":")
+    try:
+        return name.strip(), (float(low), float(high))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Use NOME=MÍN:MÁX (recebido {text!r})")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos da hidrólise enzimática para os surrogates.")
+    parser.add_argument("output", help="Pasta dos blocos e do manifest.json")
+    parser.add_argument("--samples", type=int, default=1_000_000, help="Número de amostras (padrão: 1000000)")
+    parser.add_argument("--design", choices=DESIGNS, default="lhs", help="Delineamento (padrão: lhs)")
+    parser.add_argument("--range", type=_parse_range, action="append", default=[], metavar="NOME=MÍN:MÁX",
+                        help="Substitui a faixa de uma entrada (pode repetir)")
+    parser.add_argument("--seed", type=int, default=0, help="Semente (padrão: 0)")
+    parser.add_argument("--noise", type=float, default=0.0, help="Ruído relativo nos alvos (padrão: 0)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+                        help=f"Linhas por bloco (padrão: {DEFAULT_SHARD_SIZE})")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Formato dos blocos (padrão: parquet se disponível)")
+    parser.add_argument("--workers", type=int, default=None, help="Processos do pool (padrão: número de CPUs)")
+    parser.add_argument("--restart", action="store_true", help="Descarta uma geração anterior na pasta")
+    parser.add_argument("--quiet", action="store_true", help="Não mostra o progresso")
+    args = parser.parse_args(argv)
+
+    manifest = generate_dataset(
+        args.output, args.samples,
+        design=args.design,
+        ranges=dict(args.range),
+        seed=args.seed,
+        noise=args.noise,
+        shard_size=args.shard_size,
+        format=args.format,
+        n_workers=args.workers,
+        restart=args.restart,
+        progress=None if args.quiet else _print_progress,
+    )
+    rows = sum(shard["rows"] for shard in manifest["shards"])
+    print(f"Concluído: {rows:,} amostras em {len(manifest['shards'])} blocos ({args.output})", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# OTIMIZAÇÃO DAS CONDIÇÕES DE PRÉ-TRATAMENTO HIDROTÉRMICO
+# Busca temperatura e tempo que maximizam o rendimento em açúcares com o
+# mínimo de inibidores (furfural e HMF) por grama de açúcar liberado,
+# retornando a frente de Pareto
+#
+# Os dois objetivos são normalizados pela carga: o modelo é linear na carga
+# de sólidos, então açúcares e inibidores em g/L cresceriam juntos com ela e
+# a frente se reduziria ao eixo da carga. A carga entra apenas para reportar
+# as concentrações.
+
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from scipy.stats import qmc
+
+from Hydrothermal_Pretreatment import (
+    INHIBITOR_SPECIES, SPECIES, SUGAR_SPECIES, TEMPERATURE_RANGE, simulate_hydrothermal_batch
+)
+from Instrumentation import instrumented, record
+
+# Limites padrão das variáveis de decisão
+DEFAULT_BOUNDS = {
+    "temperature": TEMPERATURE_RANGE,   # °C
+    "time_final": (1.0, 120.0),         # min
+}
+
+# Carga de sólidos usada para reportar as concentrações (g/L)
+DEFAULT_SOLID_LOADING = 100.0
+
+_SUGAR_IDX = [SPECIES.index(s) for s in SUGAR_SPECIES]
+_INHIBITOR_IDX = [SPECIES.index(s) for s in INHIBITOR_SPECIES]
+
+def evaluate_conditions(temperature, time_final, solid_loading, cellulose_fraction, hemicellulose_fraction,
+                        rate_multipliers=None):
+    """
+    Avalia os objetivos para um lote de condições operacionais.
+
+    Args:
+        temperature (array): Temperaturas em °C.
+        time_final (array): Tempos de pré-tratamento em minutos.
+        solid_loading (array): Cargas de sólidos em g/L.
+        cellulose_fraction (float): Fração mássica de celulose (0-1).
+        hemicellulose_fraction (float): Fração mássica de hemicelulose (0-1).
+        rate_multipliers (array): Fatores das constantes k1-k6, formato
+            compatível com (N, 2, 6) (opcional).
+
+    Returns:
+        dict: Açúcares liberados e inibidores (g/L), rendimento em açúcares
+        (% dos polissacarídeos iniciais), inibidores por açúcar liberado (g/g)
+        e porcentagens de degradação ao final de cada condição.
+    """
+    # Apenas o estado final interessa: dois pontos no tempo bastam
+    results = simulate_hydrothermal_batch(
+        temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final, n_points=2,
+        rate_multipliers=rate_multipliers
+    )
+    final = results["concentrations"][:, -1, :]
+    sugar_release = final[:, _SUGAR_IDX].sum(axis=1)
+    inhibitors = final[:, _INHIBITOR_IDX].sum(axis=1)
+    polysaccharides = np.asarray(solid_loading) * (np.asarray(cellulose_fraction) + np.asarray(hemicellulose_fraction))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sugar_yield = np.where(polysaccharides > 0, sugar_release / polysaccharides * 100, 0.0)
+        inhibitors_per_sugar = np.where(sugar_release > 0, inhibitors / sugar_release, np.inf)
+    return {
+        "sugar_release": sugar_release,
+        "inhibitors": inhibitors,
+        "sugar_yield_percent": sugar_yield,
+        "inhibitors_per_sugar": inhibitors_per_sugar,
+        "hemicellulose_degraded_percent": results["hemicellulose_degraded_percent"],
+        "cellulose_degraded_percent": results["cellulose_degraded_percent"],
+    }
+
+def _evaluate_chunk(args):
+    """Avalia um bloco de candidatos (executado nos processos do pool)."""
+    x, solid_loading, cellulose_fraction, hemicellulose_fraction = args
+    return evaluate_conditions(x[:, 0], x[:, 1], solid_loading, cellulose_fraction, hemicellulose_fraction)
+
+# Pools de processos reutilizados entre buscas (um por número de workers)
+_executors = {}
+_executors_lock = threading.Lock()
+
+def _get_executor(n_workers):
+    """Pool com n_workers processos, criado na primeira busca que o usa."""
+    with _executors_lock:
+        executor = _executors.get(n_workers)
+        if executor is None:
+            executor = _executors[n_workers] = ProcessPoolExecutor(max_workers=n_workers)
+        return executor
+
+def _discard_executor(n_workers):
+    """Descarta um pool quebrado (um processo morreu); o próximo uso cria outro."""
+    with _executors_lock:
+        executor = _executors.pop(n_workers, None)
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+@atexit.register
+def shutdown_pools():
+    """Encerra os pools de processos reutilizados."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown()
+
+def pareto_front(objectives):
+    """
+    Identifica os pontos não dominados (todos os objetivos a minimizar).
+
+    Args:
+        objectives (np.ndarray): Objetivos com formato (n, m).
+
+    Returns:
+        np.ndarray: Máscara booleana (n,) dos pontos da frente de Pareto.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n = objectives.shape[0]
+    efficient = np.ones(n, dtype=bool)
+
+    # Comparação todos-contra-todos em blocos para limitar a memória
+    chunk = max(1, 2_000_000 // max(n, 1))
+    for start in range(0, n, chunk):
+        block = objectives[start:start + chunk, None, :]
+        dominated = np.all(objectives[None, :, :] <= block, axis=2) & np.any(objectives[None, :, :] < block, axis=2)
+        efficient[start:start + chunk] = ~dominated.any(axis=1)
+    return efficient
+
+@instrumented("optimizer")
+def optimize_hydrothermal_yield(cellulose_fraction, hemicellulose_fraction, bounds=None,
+                                solid_loading=DEFAULT_SOLID_LOADING, n_samples=1024, n_rounds=4, n_workers=None,
+                                seed=0):
+    """
+    Busca as condições operacionais da frente de Pareto rendimento em
+    açúcares × inibidores por açúcar liberado.
+
+    A busca começa com uma amostra de Sobol do espaço de decisão e, em cada
+    rodada, gera novos candidatos em torno dos pontos da frente com passo
+    decrescente. Os candidatos são avaliados em blocos vetorizados
+    distribuídos em um pool de processos, reutilizado entre chamadas.
+
+    Args:
+        cellulose_fraction (float): Fração mássica de celulose (0-1).
+        hemicellulose_fraction (float): Fração mássica de hemicelulose (0-1).
+        bounds (dict): Limites de "temperature" e "time_final"; usa
+            DEFAULT_BOUNDS para as chaves ausentes.
+        solid_loading (float): Carga de sólidos (g/L) das concentrações
+            reportadas (não altera a frente).
+        n_samples (int): Candidatos avaliados por rodada.
+        n_rounds (int): Rodadas de refinamento após a amostra inicial.
+        n_workers (int): Processos do pool (padrão: número de CPUs; 1 avalia
+            no próprio processo).
+        seed (int): Semente para reprodutibilidade.
+
+    Returns:
+        dict: Condições e objetivos dos pontos da frente de Pareto, ordenados
+        por rendimento em açúcares, e o número total de avaliações.
+    """
+    bounds = {**DEFAULT_BOUNDS, **(bounds or {})}
+    names = ("temperature", "time_final")
+    lower = np.array([bounds[name][0] for name in names], dtype=float)
+    upper = np.array([bounds[name][1] for name in names], dtype=float)
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    rng = np.random.default_rng(seed)
+    sampler = qmc.Sobol(d=len(names), seed=rng)
+
+    def evaluate(x, executor):
+        chunks = np.array_split(x, max(1, min(n_workers, len(x))))
+        args = [(chunk, solid_loading, cellulose_fraction, hemicellulose_fraction) for chunk in chunks]
+        if executor is None:
+            parts = [_evaluate_chunk(a) for a in args]
+        else:
+            parts = list(executor.map(_evaluate_chunk, args))
+        return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+    def objectives(metrics):
+        return np.column_stack([-metrics["sugar_yield_percent"], metrics["inhibitors_per_sugar"]])
+
+    executor = _get_executor(n_workers) if n_workers > 1 else None
+    try:
+        x = qmc.scale(sampler.random(n_samples), lower, upper)
+        metrics = evaluate(x, executor)
+        n_evaluations = len(x)
+
+        for round_idx in range(n_rounds):
+            front = pareto_front(objectives(metrics))
+            x, metrics = x[front], {key: value[front] for key, value in metrics.items()}
+
+            # Novos candidatos em torno da frente, com passo decrescente
+            scale = 0.1 * (upper - lower) / 2 ** round_idx
+            parents = x[rng.integers(len(x), size=n_samples)]
+            children = np.clip(parents + rng.normal(size=parents.shape) * scale, lower, upper)
+
+            child_metrics = evaluate(children, executor)
+            x = np.vstack([x, children])
+            metrics = {key: np.concatenate([metrics[key], child_metrics[key]]) for key in metrics}
+            n_evaluations += len(children)
+    except BrokenProcessPool:
+        _discard_executor(n_workers)
+        raise
+
+    front = pareto_front(objectives(metrics))
+    order = np.argsort(metrics["sugar_yield_percent"][front])
+    result = {name: x[front, i][order] for i, name in enumerate(names)}
+    result["solid_loading"] = np.full(len(order), float(solid_loading))
+    result.update({key: value[front][order] for key, value in metrics.items()})
+    result["n_evaluations"] = n_evaluations
+    record(n_evaluations=n_evaluations, n_workers=n_workers)
+    return result
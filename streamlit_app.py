@@ -1,11 +1,158 @@
+import os
+from concurrent.futures import wait
+from uuid import uuid4
 import streamlit as st
+import numpy as np
 import pandas as pd
 from plotly import graph_objs as go
-from Hydrothermal_Pretreatment import simulate_hydrothermal_degradation
+from Simulation_Cache import SimulationCache, cached_hydrothermal_degradation, hydrothermal_cache_key
+from Hydrothermal_Pretreatment import SPECIES
+from Plot_Rendering import (
+    SPECIES_LABELS, figure_spec, line_traces, marker_trace, scenario_overlay_spec, timecourse_spec
+)
+from Yield_Optimizer import optimize_hydrothermal_yield
+from Enzymatic_Hydrolysis import STATES as HYDROLYSIS_STATES, simulate_enzymatic_hydrolysis
+from Model_Registry import get_registry
+from Fermentation import STATES as FERMENTATION_STATES, FermentationParameters, simulate_fermentation
+from Process_Pipeline import ProcessPipeline
+from Response_Surface import DEFAULT_SURFACE_PATH, ResponseSurface
+from Experimental_Data import DEFAULT_STORE_PATH, ExperimentalData
+from Sensitivity_Analysis import prediction_bands, sobol_indices
+from Simulation_Jobs import SimulationJobs
+from Scenario_History import ScenarioHistory
+from Instrumentation import JsonLinesSink, Trace, activate
 
 # Configurando o layout para modo "wide"
 st.set_page_config(layout="wide")
 
+# Shared simulation cache (one per server process, reused by every session)
+@st.cache_resource
+def get_simulation_cache():
+    max_mb = float(os.environ.get("ETHANOL_AI_CACHE_MB", 64))
+    return SimulationCache(max_bytes=int(max_mb * 1024 ** 2))
+
+simulation_cache = get_simulation_cache()
+
+# Precomputed response surface (python Response_Surface.py), memory-mapped and
+# shared by every session; conditions outside its grid are solved live
+@st.cache_resource
+def get_response_surface():
+    return ResponseSurface.load(os.environ.get("ETHANOL_AI_SURFACE_PATH", DEFAULT_SURFACE_PATH))
+
+response_surface = get_response_surface()
+
+# Experimental datasets, parsed once into a memory-mapped columnar store indexed
+# by condition (rebuilt only when a source file changes) and shared by every session
+@st.cache_resource
+def get_experimental_data():
+    try:
+        return ExperimentalData.open(os.environ.get("ETHANOL_AI_EXPERIMENTAL_PATH", DEFAULT_STORE_PATH))
+    except OSError:
+        return None
+
+experimental_data = get_experimental_data()
+
+def measured_points(stage, process, biomass, time_final, **conditions):
+    """Points measured at a condition up to time_final ({"dataset", "time", series...}), or None."""
+    if experimental_data is None:
+        return None
+    for match in experimental_data.matching(stage, biomass, **conditions):
+        if match["process"] != process or match["time"] is None:
+            continue
+        values = match["values"]
+        keep = values[match["time"]] <= time_final
+        return {"dataset": match["dataset"], **{name: column[keep] for name, column in values.items()}}
+    return None
+
+def hydrothermal_result(scenario):
+    """Interpolated result and its error bound, or a live (cached) solve outside the grid."""
+    if response_surface is not None and response_surface.contains(scenario["temperature"], scenario["time_final"]):
+        return response_surface.result(**scenario)
+    return cached_hydrothermal_degradation(simulation_cache, **scenario, adaptive=True), None
+
+# Most recent hydrothermal scenarios of the history drawn in the overlay
+MAX_OVERLAY_SCENARIOS = 50
+
+def scenario_label(scenario):
+    return (f"{scenario['temperature']:.0f} °C, {scenario['time_final']:.0f} min, "
+            f"{scenario['solid_loading']:.0f} g/L")
+
+# Background simulation pool (one per server process, shared by every session):
+# a newer request of a section cancels its obsolete job, and identical
+# requests in flight share a single job
+@st.cache_resource
+def get_simulation_jobs():
+    workers = os.environ.get("ETHANOL_AI_WORKERS")
+    return SimulationJobs(max_workers=int(workers) if workers else None)
+
+simulation_jobs = get_simulation_jobs()
+session_id = st.session_state.setdefault("session_id", uuid4().hex)
+
+# Fast jobs (e.g. response-surface queries) are awaited briefly and render in
+# the same run; slower ones render in their own fragment, which polls the job
+JOB_WAIT_SECONDS = 0.2
+JOB_POLL_SECONDS = 0.5
+
+def show_job(owner, render, pending_message, error_message):
+    """Renders the job of a page section in an isolated fragment."""
+    future = simulation_jobs.job(owner)
+    if future is None:
+        return
+    wait([future], timeout=JOB_WAIT_SECONDS)
+    polling = not future.done()
+    st.fragment(run_every=JOB_POLL_SECONDS if polling else None)(job_fragment)(
+        owner, render, pending_message, error_message, polling
+    )
+
+def job_fragment(owner, render, pending_message, error_message, polling):
+    future = simulation_jobs.job(owner)
+    if future is None:
+        return
+    if not future.done():
+        st.info(pending_message)
+        return
+    if polling:
+        # Rerun the page once to render the result and stop polling
+        st.rerun()
+    try:
+        render(future.result())
+    except Exception as e:
+        st.error(f"{error_message}: {e}")
+
+# Inputs, trajectories and metrics of every scenario simulated in this session,
+# kept as compact arrays within a memory budget (least recently used dropped first)
+if "scenario_history" not in st.session_state:
+    st.session_state.scenario_history = ScenarioHistory(
+        max_bytes=int(float(os.environ.get("ETHANOL_AI_HISTORY_MB", 8)) * 1024 ** 2)
+    )
+history = st.session_state.scenario_history
+
+HYDROTHERMAL_METRICS = (
+    "cellulose_degraded_percent", "hemicellulose_degraded_percent", "final_cellulose", "final_hemicellulose",
+    "sugar_yield_percent",
+)
+HYDROLYSIS_METRICS = ("glucose_yield_percent", "cellulose_conversion_percent", "hemicellulose_conversion_percent")
+FERMENTATION_METRICS = (
+    "ethanol_titer", "ethanol_yield", "ethanol_productivity", "glucose_conversion_percent",
+    "xylose_conversion_percent",
+)
+
+# Incremental pre-treatment -> hydrolysis -> fermentation chain (one per session):
+# only the stages downstream of a changed input are solved again
+if "process_pipeline" not in st.session_state:
+    st.session_state.process_pipeline = ProcessPipeline(cache=simulation_cache)
+pipeline = st.session_state.process_pipeline
+
+# Solver and stage instrumentation of this rerun, shown in the diagnostics panel
+# and appended as JSON lines to ETHANOL_AI_METRICS_PATH when it is set
+@st.cache_resource
+def get_metrics_sink():
+    path = os.environ.get("ETHANOL_AI_METRICS_PATH")
+    return JsonLinesSink(path) if path else None
+
+trace = Trace(sink=get_metrics_sink(), source="streamlit")
+activate(trace)
+
 # Título do app
 st.title('⚗️Ethanol AI (Beta)')
 
@@ -75,7 +222,7 @@ with col2:
         },
         ("Sugarcane Bagasse", "Hydrothermal"): {
             "params": [
-                {"name": "Temperature (°C)", "type": "selectbox", "options": [180, 195, 210]},
+                {"name": "Temperature (°C)", "type": "slider", "min": 180.0, "max": 210.0, "value": 195.0},
                 {"name": "Solid Loading (g/L)", "type": "number", "min": 50.0, "max": 200.0, "value": 100.0},
                 {"name": "Time (min)", "type": "slider", "min": 10.0, "max": 120.0, "value": 40.0},
                 {"name": "pH", "type": "selectbox", "options": ["Natural", "Acidic", "Basic"]},
@@ -86,7 +233,7 @@ with col2:
         ("Sugarcane Straw", "Hydrothermal"): {
             "params": [
                 {"name": "Solid Loading (g/L)", "type": "number", "min": 1.0, "max": 500.0, "value": 100.0},
-                {"name": "Temperature (°C)", "type": "selectbox", "options": [180, 195, 210]},
+                {"name": "Temperature (°C)", "type": "slider", "min": 180.0, "max": 210.0, "value": 195.0},
                 {"name": "Time (min)", "type": "slider", "min": 1.0, "max": 120.0, "value": 15.0, "step": 0.1}
             ]
         }
@@ -162,6 +309,28 @@ with col2:
         solid_loading_hydro = st.session_state.pretreatment_params.get("Solid Loading (g/L)", 100.0)
         temperature_hydro = st.session_state.pretreatment_params.get("Temperature (°C)", 195)
         time_hydro = st.session_state.pretreatment_params.get("Time (min)", 15.0)
+        
+        plot_species = st.multiselect(
+            "Species to plot",
+            options=list(SPECIES),
+            default=["cellulose", "hemicellulose"],
+            format_func=SPECIES_LABELS.get,
+            key="hydrothermal_plot_species"
+        )
+        overlay_scenarios = st.checkbox(
+            "Overlay previous scenarios",
+            key="hydrothermal_overlay",
+            help="Plot every condition calculated in this session on the same chart"
+        )
+        show_bands = st.checkbox(
+            "Show uncertainty bands",
+            key="hydrothermal_bands",
+            help="90% prediction band of the current condition when each rate constant has a "
+                 "log-normal uncertainty of about 20%"
+        )
+
+# The hydrothermal model of sugarcane straw feeds the next stages
+linked_process = pretratamento == "Hydrothermal" and biomassa == "Sugarcane Straw"
 
 # Customizing the Pre-Treatment Results column (col3)
 
@@ -171,83 +340,209 @@ with col3:
     
     # Special handling for Hydrothermal pretreatment
     if pretratamento == "Hydrothermal" and biomassa == "Sugarcane Straw":
+        # Convert percentages to fractions
+        cellulose_frac = celulose / 100.0
+        hemicellulose_frac = hemicelulose / 100.0
+        scenario = {
+            "temperature": temperature_hydro,
+            "solid_loading": solid_loading_hydro,
+            "cellulose_fraction": cellulose_frac,
+            "hemicellulose_fraction": hemicellulose_frac,
+            "time_final": time_hydro,
+        }
+        
+        # Instant feedback while the sliders move (grid interpolation, no solver call)
+        if response_surface is not None and response_surface.contains(temperature_hydro, time_hydro):
+            preview, preview_error = response_surface.result(**scenario, n_points=2)
+            st.caption(
+                f"Live preview: {preview['cellulose_degraded_percent']:.1f}% cellulose and "
+                f"{preview['hemicellulose_degraded_percent']:.1f}% hemicellulose degraded "
+                f"(interpolated, ±{max(preview_error.values()):.2g} g/L)"
+            )
+        
+        hydrothermal_owner = (session_id, "hydrothermal")
+        scenario_key = hydrothermal_cache_key(**scenario, adaptive=True)
         if st.button("Calculate Hydrothermal Degradation", key="hydrothermal_calc"):
-            try:
-                # Convert percentages to fractions
-                cellulose_frac = celulose / 100.0
-                hemicellulose_frac = hemicelulose / 100.0
-                
-                # Run simulation
-                results = simulate_hydrothermal_degradation(
-                    temperature=temperature_hydro,
-                    solid_loading=solid_loading_hydro,
-                    cellulose_fraction=cellulose_frac,
-                    hemicellulose_fraction=hemicellulose_frac,
-                    time_final=time_hydro
+            # Interpolate from the response surface or solve (reusing results of any session)
+            simulation_jobs.submit(hydrothermal_owner, ("hydrothermal",) + scenario_key, hydrothermal_result, scenario)
+        elif simulation_jobs.key(hydrothermal_owner) not in (None, ("hydrothermal",) + scenario_key):
+            # The inputs changed since the last request: its job is obsolete
+            simulation_jobs.cancel(hydrothermal_owner)
+        
+        def render_hydrothermal(job_result):
+            results, interpolation_error = job_result
+            
+            # Kept in the session history for the overlay and the comparisons
+            history.add(
+                scenario_key, "pretreatment", scenario, results, SPECIES,
+                {**{name: results[name] for name in HYDROTHERMAL_METRICS},
+                 "final_inhibitors": results["inhibitor_load"][-1]},
+                label=scenario_label(scenario)
+            )
+            
+            # Display results
+            st.success("Simulation completed successfully!")
+            
+            col_a, col_b = st.columns(2)
+            
+            with col_a:
+                st.metric(
+                    label="Cellulose Degradation",
+                    value=f"{results['cellulose_degraded_percent']:.1f}%",
+                    help="Percentage of cellulose degraded during pretreatment"
                 )
-                
-                # Display results
-                st.success("Simulation completed successfully!")
-                
-                col_a, col_b = st.columns(2)
-                
-                with col_a:
-                    st.metric(
-                        label="Cellulose Degradation",
-                        value=f"{results['cellulose_degraded_percent']:.1f}%",
-                        help="Percentage of cellulose degraded during pretreatment"
-                    )
-                    st.metric(
-                        label="Final Cellulose",
-                        value=f"{results['final_cellulose']:.1f} g/L",
-                        help="Remaining cellulose concentration"
-                    )
-                
-                with col_b:
-                    st.metric(
-                        label="Hemicellulose Degradation",
-                        value=f"{results['hemicellulose_degraded_percent']:.1f}%",
-                        help="Percentage of hemicellulose degraded during pretreatment"
+                st.metric(
+                    label="Final Cellulose",
+                    value=f"{results['final_cellulose']:.1f} g/L",
+                    help="Remaining cellulose concentration"
+                )
+            
+            with col_b:
+                st.metric(
+                    label="Hemicellulose Degradation",
+                    value=f"{results['hemicellulose_degraded_percent']:.1f}%",
+                    help="Percentage of hemicellulose degraded during pretreatment"
+                )
+                st.metric(
+                    label="Final Hemicellulose",
+                    value=f"{results['final_hemicellulose']:.1f} g/L",
+                    help="Remaining hemicellulose concentration"
+                )
+            
+            # Downsampled float32 figure spec, cached with the results
+            # (WebGL traces once the overlay gets large); previous scenarios
+            # come from the history instead of being simulated again
+            if overlay_scenarios:
+                plotted = [history.peek(key) for key in history.keys("pretreatment")[-MAX_OVERLAY_SCENARIOS:]]
+            else:
+                plotted = [history.peek(scenario_key)]
+            species = tuple(plot_species) or ("cellulose", "hemicellulose")
+            
+            def build_spec():
+                bands = None
+                if show_bands:
+                    # Quasi-Monte Carlo over the rate constants, shared by every session
+                    band = simulation_cache.get_or_compute(
+                        ("bands",) + scenario_key, lambda: prediction_bands(**scenario)
                     )
-                    st.metric(
-                        label="Final Hemicellulose",
-                        value=f"{results['final_hemicellulose']:.1f} g/L",
-                        help="Remaining hemicellulose concentration"
+                    bands = [band if stored.key == scenario_key else None for stored in plotted]
+                return scenario_overlay_spec(
+                    [(stored.label, stored) for stored in plotted],
+                    species,
+                    title=(f'Hydrothermal Degradation ({len(plotted)} scenarios)' if overlay_scenarios
+                           else f'Hydrothermal Degradation at {temperature_hydro}°C'),
+                    bands=bands,
+                    measured=[
+                        measured_points("pretreatment", "Hydrothermal", biomassa, stored.inputs["time_final"],
+                                        temperature=stored.inputs["temperature"],
+                                        solid_loading=stored.inputs["solid_loading"])
+                        for stored in plotted
+                    ]
+                )
+            
+            # With bands the figure also depends on which scenario is current
+            # (the band is drawn on it), and the cache is shared by all sessions
+            spec = simulation_cache.get_or_compute(
+                ("figure", "hydrothermal", overlay_scenarios, show_bands, species,
+                 scenario_key if show_bands else None)
+                + tuple(stored.key for stored in plotted),
+                build_spec
+            )
+            st.plotly_chart(spec, use_container_width=True)
+            
+            measured = measured_points("pretreatment", "Hydrothermal", biomassa, time_hydro,
+                                       temperature=temperature_hydro, solid_loading=solid_loading_hydro)
+            if measured is not None:
+                available = [SPECIES_LABELS[name] for name in SPECIES if name in measured]
+                st.caption(
+                    f"Markers: {len(measured['time'])} experimental points measured at this condition "
+                    f"({measured['dataset']}), available for {', '.join(available)}"
+                )
+            
+            if interpolation_error is not None:
+                st.caption(
+                    "Interpolated from the precomputed response surface "
+                    f"(estimated error ≤ {max(interpolation_error.values()):.2g} g/L)"
+                )
+            
+            cache_stats = simulation_cache.stats()
+            st.caption(
+                f"Result cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['entries']} entries, "
+                f"{cache_stats['nbytes'] / 1024 ** 2:.1f}/{cache_stats['max_bytes'] / 1024 ** 2:.0f} MB"
+            )
+        
+        show_job(hydrothermal_owner, render_hydrothermal, "Solving the hydrothermal model...",
+                 "Error in simulation")
+        
+        if overlay_scenarios and st.button("Clear overlay scenarios", key="hydrothermal_overlay_clear"):
+            for key in history.keys("pretreatment"):
+                if key != scenario_key:
+                    history.remove(key)
+        
+        if st.button("Rank Rate Constants", key="hydrothermal_sobol",
+                     help="Sobol sensitivity indices of the twelve rate constants at the current condition"):
+            try:
+                with st.spinner("Sampling the rate constants..."):
+                    indices = simulation_cache.get_or_compute(
+                        ("sobol",) + hydrothermal_cache_key(**scenario),
+                        lambda: sobol_indices(n_samples=2 ** 12, inputs=scenario)
                     )
                 
-                # Create and display plot
                 fig = go.Figure()
+                for output, label, color in (("cellulose_degraded_percent", "Cellulose degradation", "blue"),
+                                             ("hemicellulose_degraded_percent", "Hemicellulose degradation", "green")):
+                    j = indices["outputs"].index(output)
+                    fig.add_trace(go.Bar(
+                        x=indices["factors"],
+                        y=indices["total_order"][:, j],
+                        error_y=dict(type='data', array=indices["total_order_conf"][:, j]),
+                        name=label,
+                        marker_color=color
+                    ))
+                fig.update_layout(
+                    title='Total Sobol Index of Each Rate Constant',
+                    yaxis_title='Total-order index',
+                    barmode='group'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+                st.caption(f"{indices['n_evaluations']} model evaluations, "
+                           f"{indices['level']:.0%} confidence intervals.")
                 
-                fig.add_trace(go.Scatter(
-                    x=results["time"],
-                    y=results["cellulose"],
-                    mode='lines+markers',
-                    name='Cellulose',
-                    line=dict(color='blue', width=3),
-                    marker=dict(size=4)
-                ))
+            except Exception as e:
+                st.error(f"Error in sensitivity analysis: {str(e)}")
+        
+        if st.button("Find Optimal Conditions", key="hydrothermal_optimize"):
+            try:
+                with st.spinner("Searching temperature and time..."):
+                    front = optimize_hydrothermal_yield(
+                        cellulose_fraction=celulose / 100.0,
+                        hemicellulose_fraction=hemicelulose / 100.0,
+                        solid_loading=solid_loading_hydro
+                    )
                 
-                fig.add_trace(go.Scatter(
-                    x=results["time"],
-                    y=results["hemicellulose"],
-                    mode='lines+markers',
-                    name='Hemicellulose',
-                    line=dict(color='green', width=3),
-                    marker=dict(size=4)
-                ))
+                st.success(f"Pareto front with {len(front['sugar_release'])} conditions ({front['n_evaluations']} evaluations).")
                 
+                fig = go.Figure(go.Scatter(
+                    x=front["inhibitors_per_sugar"] * 1000,
+                    y=front["sugar_yield_percent"],
+                    mode='markers',
+                    marker=dict(size=6, color=front["temperature"], colorscale='Viridis', colorbar=dict(title='T (°C)')),
+                    customdata=list(zip(front["temperature"], front["time_final"], front["sugar_release"],
+                                        front["inhibitors"])),
+                    hovertemplate='T: %{customdata[0]:.1f} °C<br>Time: %{customdata[1]:.1f} min<br>'
+                                  'Sugars: %{customdata[2]:.2f} g/L<br>Furfural + HMF: %{customdata[3]:.3f} g/L'
+                                  '<extra></extra>'
+                ))
                 fig.update_layout(
-                    title=f'Hydrothermal Degradation at {temperature_hydro}°C',
-                    xaxis_title='Time (min)',
-                    yaxis_title='Concentration (g/L)',
-                    hovermode='x unified'
+                    title='Sugar Yield vs. Inhibitors per Released Sugar',
+                    xaxis_title='Furfural + HMF per Sugar (mg/g)',
+                    yaxis_title='Sugar Yield (% of polysaccharides)'
                 )
-                
                 st.plotly_chart(fig, use_container_width=True)
                 
             except Exception as e:
-                st.error(f"Error in simulation: {str(e)}")
-                st.info("Please check your input parameters and try again.")
+                st.error(f"Error in optimization: {str(e)}")
     
     else:
         # For other pretreatment types, keep the original placeholder
@@ -269,11 +564,38 @@ col4, spacer3, col5, spacer4, col6 = st.columns([10, 2, 10, 2, 10])
 # Customizing the Pre-Treatment Data column (col4)
 with col4:
     st.header("Pre-Treatment Data")
-    st.write("Enter the data obtained from pre-treatment.")
-    celulose1 = st.number_input("Cellulose Percentage", min_value=0.0, max_value=100.0, format="%.2f")
-    lignina1 = st.number_input("Lignin Percentage", min_value=0.0, max_value=100.0, format="%.2f")
-    hemicelulose1 = st.number_input("Hemicellulose Percentage", min_value=0.0, max_value=100.0, format="%.2f")
-    cinzas1 = st.number_input("Ash Percentage", min_value=0.0, max_value=100.0, format="%.2f")
+    pretreated = None
+    if linked_process and st.checkbox("Use the simulated pre-treatment result", value=True, key="hydrolysis_linked"):
+        try:
+            pretreated = pipeline.pretreatment(
+                temperature=temperature_hydro,
+                solid_loading=solid_loading_hydro,
+                cellulose_fraction=celulose / 100.0,
+                hemicellulose_fraction=hemicelulose / 100.0,
+                lignin_fraction=lignina / 100.0,
+                time_final=time_hydro
+            )
+        except Exception as e:
+            st.error(f"Error in pre-treatment simulation: {e}")
+    
+    if pretreated is not None:
+        composition = pretreated["composition"]
+        st.write("Composition of the pre-treated solid, computed from the pre-treatment stage.")
+        celulose1 = composition["cellulose"] * 100.0
+        lignina1 = composition["lignin"] * 100.0
+        hemicelulose1 = composition["hemicellulose"] * 100.0
+        cinzas1 = composition["other"] * 100.0
+        st.metric("Cellulose Percentage", f"{celulose1:.2f}%")
+        st.metric("Lignin Percentage", f"{lignina1:.2f}%")
+        st.metric("Hemicellulose Percentage", f"{hemicelulose1:.2f}%")
+        st.metric("Ash + Extractives Percentage", f"{cinzas1:.2f}%")
+        st.caption(f"Solid recovery after pre-treatment: {composition['solid_recovery']:.1%}")
+    else:
+        st.write("Enter the data obtained from pre-treatment.")
+        celulose1 = st.number_input("Cellulose Percentage", min_value=0.0, max_value=100.0, format="%.2f")
+        lignina1 = st.number_input("Lignin Percentage", min_value=0.0, max_value=100.0, format="%.2f")
+        hemicelulose1 = st.number_input("Hemicellulose Percentage", min_value=0.0, max_value=100.0, format="%.2f")
+        cinzas1 = st.number_input("Ash Percentage", min_value=0.0, max_value=100.0, format="%.2f")
 
 # Customizing the Enzymatic Hydrolysis Parameters column (col5)
 with col5:
@@ -295,45 +617,323 @@ with col6:
     st.write(f"Here you can see the results obtained for the Enzymatic Hydrolysis stage of {biomassa}. Change the chart layout to visualize more relationships between the variables.")
     
     st.button("Calculate Yield", key="hidrolise_resultados")
+    st.checkbox("Overlay ML surrogate (Random Forest)", key="hydrolysis_surrogate")
     
-    # Placeholder for enzymatic hydrolysis model
-    # TODO: Replace with actual model function import
-    def predict_enzymatic_hydrolysis(cellulose_pct, lignin_pct, hemicellulose_pct, ash_pct, 
-                                   solid_loading, enzyme_loading, enzyme_type, biomass_type):
-        """
-        Placeholder function for enzymatic hydrolysis prediction.
-        This should be replaced with your actual model function.
-        """
-        # Simple placeholder calculation - replace with real model
-        base_yield = 75.0
-        cellulose_factor = cellulose_pct * 0.8
-        enzyme_factor = enzyme_loading * 2.0
-        solid_factor = max(0, 100 - solid_loading * 0.1)
+    # Composition of the solid: from the pre-treatment stage or entered by hand
+    hydrolysis_inputs = {
+        "cellulose_fraction": celulose1 / 100.0,
+        "hemicellulose_fraction": hemicelulose1 / 100.0,
+        "solid_loading": solid_loading,
+        "enzyme_loading": enzyme_loading,
+        "time_final": reaction_time,
+        "n_points": int(reaction_time) + 1,
+    }
+    surrogate = bool(st.session_state.get("hydrolysis_surrogate"))
+    hydrolysis_owner = (session_id, "hydrolysis")
+    hydrolysis_key = ("hydrolysis", lignina1, surrogate) + tuple(hydrolysis_inputs.values())
+    
+    def solve_hydrolysis():
+        # Angarita et al. (2015) model
+        hydrolysis = simulate_enzymatic_hydrolysis(**hydrolysis_inputs)
+        if not surrogate:
+            return hydrolysis, None
         
-        predicted_yield = min(95.0, base_yield + cellulose_factor * 0.2 + enzyme_factor * 0.1 + solid_factor * 0.05)
-        return predicted_yield
+        # Trained surrogate on the same time grid
+        time = hydrolysis["time"]
+        surrogate_inputs = np.column_stack([
+            np.full_like(time, celulose1 / 100.0),
+            np.full_like(time, hemicelulose1 / 100.0),
+            np.full_like(time, lignina1 / 100.0),
+            np.full_like(time, solid_loading),
+            np.full_like(time, enzyme_loading),
+            time
+        ])
+        return hydrolysis, get_registry().predict(surrogate_inputs, target="multioutput")
     
     if st.session_state.get("hidrolise_resultados"):
+        simulation_jobs.submit(hydrolysis_owner, hydrolysis_key, solve_hydrolysis)
+    elif simulation_jobs.key(hydrolysis_owner) not in (None, hydrolysis_key):
+        simulation_jobs.cancel(hydrolysis_owner)
+    
+    def render_hydrolysis(job_result):
+        hydrolysis, surrogate_pred = job_result
+        predicted_yield = hydrolysis["glucose_yield_percent"]
+        
+        history_inputs = {name: value for name, value in hydrolysis_inputs.items() if name != "n_points"}
+        history_inputs["lignin_fraction"] = lignina1 / 100.0
+        history.add(
+            ("hydrolysis",) + tuple(history_inputs.values()), "hydrolysis", history_inputs, hydrolysis,
+            HYDROLYSIS_STATES,
+            {**{name: hydrolysis[name] for name in HYDROLYSIS_METRICS}, "final_glucose": hydrolysis["glucose"][-1]},
+            label=f"{solid_loading:.0f} g/L solids, {enzyme_loading:.2f} g/L enzyme, {reaction_time:.0f} h"
+        )
+        
+        st.success(f"Yield predicted by the model: {predicted_yield:.2f}%")
+        
+        col_c, col_d = st.columns(2)
+        with col_c:
+            st.metric(
+                label="Final Glucose",
+                value=f"{hydrolysis['glucose'][-1]:.1f} g/L",
+                help="Glucose concentration at the end of the reaction"
+            )
+        with col_d:
+            st.metric(
+                label="Cellulose Conversion",
+                value=f"{hydrolysis['cellulose_conversion_percent']:.1f}%",
+                help="Percentage of cellulose hydrolyzed"
+            )
+        
+        curves = [
+            {"y": hydrolysis[name], "name": label, "color": color}
+            for name, label, color in (("glucose", "Glucose", "blue"), ("xylose", "Xylose", "green"),
+                                       ("cellobiose", "Cellobiose", "orange"))
+        ]
+        
+        # Optional overlay of the trained surrogate
+        if surrogate_pred is not None:
+            for i, (label, color) in enumerate((("Glucose", "blue"), ("Xylose", "green"), ("Cellobiose", "orange"))):
+                curves.append({"y": surrogate_pred[:, i], "name": f'{label} (ML surrogate)', "color": color,
+                               "width": 2, "dash": 'dash'})
+        
+        traces = line_traces(hydrolysis["time"], curves)
+        
+        # Points measured at the same solids and enzyme loadings, if any
+        measured = measured_points("hydrolysis", "Enzymatic", biomassa, reaction_time,
+                                   solid_loading=solid_loading, enzyme_loading=enzyme_loading)
+        if measured is not None:
+            traces += [
+                marker_trace(measured["time"], measured[name], f'{label} (measured)', color)
+                for name, label, color in (("glucose", "Glucose", "blue"), ("xylose", "Xylose", "green"),
+                                           ("cellobiose", "Cellobiose", "orange"))
+            ]
+        
+        spec = figure_spec(traces, 'Enzymatic Hydrolysis', 'Time (h)', 'Concentration (g/L)')
+        st.plotly_chart(spec, use_container_width=True)
+        if measured is not None:
+            st.caption(f"Markers: {len(measured['time'])} experimental points measured at this condition "
+                       f"({measured['dataset']})")
+    
+    show_job(hydrolysis_owner, render_hydrolysis, "Simulating the enzymatic hydrolysis...",
+             "An error occurred while processing")
+
+
+st.markdown("<hr style='border: 1px solid #ccc;' />", unsafe_allow_html=True)
+
+# Next Stage: Fermentation
+
+st.markdown(
+    "<h1 style='font-size:50px;'>Fermentation</h1>",
+    unsafe_allow_html=True
+)
+st.write("In this section, introduce the relevant data for calculating the ethanol titer of the Fermentation.")
+# Creating "Parameters" and "Results" columns
+col7, spacer5, col8, spacer6, col9 = st.columns([10, 2, 10, 2, 10])
+
+# Customizing the Hydrolysate Data column (col7)
+with col7:
+    st.header("Hydrolysate Data")
+    hydrolysate = None
+    if pretreated is not None and st.checkbox("Use the simulated hydrolysate", value=True, key="fermentation_linked"):
         try:
-            # Convert enzyme type to numerical value
-            enzyme_value = enzyme_types.get(enzyme, 1)
+            hydrolysate = pipeline.hydrolysis(
+                solid_loading=solid_loading,
+                enzyme_loading=enzyme_loading,
+                time_final=reaction_time,
+                n_points=int(reaction_time) + 1
+            )
+        except Exception as e:
+            st.warning(f"The hydrolysis stage could not be simulated ({e}). Enter the hydrolysate data below.")
+    
+    if hydrolysate is not None:
+        st.write("Sugar concentrations at the end of the simulated enzymatic hydrolysis.")
+        glicose_ferm = hydrolysate["glucose"][-1]
+        xilose_ferm = hydrolysate["xylose"][-1]
+        etanol_ferm = 0.0
+        st.metric("Initial Glucose", f"{glicose_ferm:.2f} g/L")
+        st.metric("Initial Xylose", f"{xilose_ferm:.2f} g/L")
+    else:
+        st.write("Enter the sugar concentrations obtained from enzymatic hydrolysis.")
+        glicose_ferm = st.number_input("Initial Glucose (g/L)", min_value=0.0, value=20.0, format="%.2f")
+        xilose_ferm = st.number_input("Initial Xylose (g/L)", min_value=0.0, value=10.0, format="%.2f")
+        etanol_ferm = st.number_input("Initial Ethanol (g/L)", min_value=0.0, value=0.0, format="%.2f")
+
+# Customizing the Fermentation Parameters column (col8)
+with col8:
+    st.header("Fermentation Parameters")
+    st.write("Enter the fermentation parameters to define your operating condition.")
+    inoculo = st.number_input("Initial Cell Concentration (g/L)", min_value=0.01, value=0.5, format="%.2f")
+    mimax_glu = st.number_input("Max. Growth Rate on Glucose (1/h)", min_value=0.01, max_value=1.0, value=0.2, format="%.3f")
+    mimax_xyl = st.number_input("Max. Growth Rate on Xylose (1/h)", min_value=0.001, max_value=1.0, value=0.05, format="%.3f")
+    tempo_ferm = st.slider("Fermentation Time (h)", min_value=1.0, max_value=120.0, value=72.0, step=1.0, format="%.1f")
+
+# Customizing the Fermentation Results column (col9)
+with col9:
+    st.header("Fermentation Results")
+    st.write(f"Here you can see the results obtained for the Fermentation stage of {biomassa}.")
+    
+    # With the linked process the whole chain is cheap enough to follow every change
+    if hydrolysate is None:
+        st.button("Calculate Ethanol", key="fermentacao_resultados")
+    
+    if hydrolysate is not None or st.session_state.get("fermentacao_resultados"):
+        try:
+            fermentation_params = FermentationParameters(mimax_Glu=mimax_glu, mimax_Xyl=mimax_xyl)
+            if hydrolysate is not None:
+                fermentation = pipeline.fermentation(
+                    biomass=inoculo,
+                    params=fermentation_params,
+                    time_final=tempo_ferm,
+                    n_points=int(tempo_ferm) + 1
+                )
+            else:
+                fermentation = simulate_fermentation(
+                    biomass=inoculo,
+                    glucose=glicose_ferm,
+                    xylose=xilose_ferm,
+                    ethanol=etanol_ferm,
+                    params=fermentation_params,
+                    time_final=tempo_ferm,
+                    n_points=int(tempo_ferm) + 1
+                )
             
-            # Convert biomass to numerical value (1 for Bagasse, 2 for Straw)
-            biomass_value = 1 if biomassa == "Sugarcane Bagasse" else 2
+            st.success(f"Ethanol titer predicted by the model: {fermentation['ethanol_titer']:.2f} g/L")
             
-            # Use the placeholder function (replace with actual model import)
-            predicted_yield = predict_enzymatic_hydrolysis(
-                celulose1, lignina1, hemicelulose1, cinzas1, 
-                solid_loading, enzyme_loading, enzyme_value, biomass_value
+            fermentation_inputs = {
+                "biomass": inoculo,
+                "glucose": fermentation["glucose"][0],
+                "xylose": fermentation["xylose"][0],
+                "ethanol": fermentation["ethanol"][0],
+                "mimax_glu": mimax_glu,
+                "mimax_xyl": mimax_xyl,
+                "time_final": tempo_ferm,
+            }
+            history.add(
+                ("fermentation",) + tuple(fermentation_inputs.values()), "fermentation", fermentation_inputs,
+                fermentation, FERMENTATION_STATES, {name: fermentation[name] for name in FERMENTATION_METRICS},
+                label=(f"{fermentation_inputs['glucose']:.1f} g/L glucose, "
+                       f"{fermentation_inputs['xylose']:.1f} g/L xylose, {tempo_ferm:.0f} h")
             )
             
-            st.success(f"Yield predicted by the model: {predicted_yield:.2f}%")
+            col_e, col_f = st.columns(2)
+            with col_e:
+                st.metric(
+                    label="Ethanol Yield",
+                    value=f"{fermentation['ethanol_yield']:.3f} g/g",
+                    help="Ethanol produced per gram of sugar consumed"
+                )
+            with col_f:
+                st.metric(
+                    label="Productivity",
+                    value=f"{fermentation['ethanol_productivity']:.2f} g/L/h",
+                    help="Ethanol produced per hour of fermentation"
+                )
+            
+            spec = timecourse_spec(
+                fermentation,
+                (("biomass", "Cells", "blue"), ("glucose", "Glucose", "black"),
+                 ("xylose", "Xylose", "green"), ("ethanol", "Ethanol", "red")),
+                title='Fermentation',
+                x_title='Time (h)'
+            )
+            st.plotly_chart(spec, use_container_width=True)
             
-            # Store result for chart
-            rendimento_previsto = predicted_yield
+            if hydrolysate is not None:
+                st.caption(
+                    "Process pipeline solves per stage: "
+                    + ", ".join(f"{stage} {count}" for stage, count in pipeline.computations.items())
+                    + " (unchanged stages are reused)"
+                )
             
         except Exception as e:
             st.error(f"An error occurred while processing: {e}")
-    else:
-        rendimento_previsto = None
 
+st.markdown("<hr style='border: 1px solid #ccc;' />", unsafe_allow_html=True)
+
+# Scenario History: previous runs of this session, compared without simulating them again
+st.markdown(
+    "<h1 style='font-size:50px;'>Scenario History</h1>",
+    unsafe_allow_html=True
+)
+st.write("Every condition simulated in this session is kept here. Rank the scenarios of a stage by any metric and compare them side by side without running them again.")
+
+STAGE_LABELS = {"pretreatment": "Pre-Treatment", "hydrolysis": "Enzymatic Hydrolysis", "fermentation": "Fermentation"}
+STAGE_TIME_TITLES = {"pretreatment": "Time (min)", "hydrolysis": "Time (h)", "fermentation": "Time (h)"}
+SERIES_LABELS = {**SPECIES_LABELS, "solids": "Solids", "biomass": "Cells", "ethanol": "Ethanol",
+                 "cellobiose": "Cellobiose"}
+
+def column_label(name):
+    return name.replace("_", " ").capitalize()
+
+history_stages = history.stages()
+if not history_stages:
+    st.write("No scenario simulated yet.")
+else:
+    col_h1, col_h2, col_h3 = st.columns([10, 10, 10])
+    with col_h1:
+        history_stage = st.selectbox("Stage", history_stages, format_func=STAGE_LABELS.get, key="history_stage")
+    history_columns = history.columns(history_stage)
+    with col_h2:
+        rank_metric = st.selectbox("Rank by", history_columns["metrics"], format_func=column_label,
+                                   key="history_metric")
+    with col_h3:
+        rank_ascending = st.checkbox("Lowest first", key="history_ascending")
+    
+    ranked = history.rank(history_stage, rank_metric, descending=not rank_ascending)
+    ranking = history.table(ranked)
+    ranking.columns = [column_label(name) for name in ranking.columns]
+    st.dataframe(ranking, use_container_width=True)
+    
+    compared = st.multiselect("Scenarios to compare", ranked, default=ranked[:3], format_func=history.label,
+                              key=f"history_compare_{history_stage}")
+    if compared:
+        comparison = history.compare(compared)
+        comparison.index = [column_label(name) for name in comparison.index]
+        st.dataframe(comparison, use_container_width=True)
+        
+        series = st.multiselect("Series to plot", history_columns["series"],
+                                default=list(history_columns["series"][:1]),
+                                format_func=lambda name: SERIES_LABELS.get(name, column_label(name)),
+                                key=f"history_series_{history_stage}")
+        if series:
+            spec = scenario_overlay_spec(
+                [(history.label(key), history.peek(key)) for key in compared], series,
+                title=f"{STAGE_LABELS[history_stage]} ({len(compared)} scenarios)",
+                x_title=STAGE_TIME_TITLES[history_stage]
+            )
+            st.plotly_chart(spec, use_container_width=True)
+    
+    history_stats = history.stats()
+    st.caption(
+        f"{history_stats['scenarios']} scenarios stored in {history_stats['nbytes'] / 1024:.0f} of "
+        f"{history_stats['max_bytes'] / 1024:.0f} KB ({history_stats['evictions']} older ones dropped)."
+    )
+    if st.button("Clear history", key="history_clear"):
+        history.clear()
+        st.rerun()
+
+st.markdown("<hr style='border: 1px solid #ccc;' />", unsafe_allow_html=True)
+
+# Diagnostics of the simulations run in this interaction
+with st.expander("Diagnostics"):
+    if trace.stages:
+        st.write("Wall time, solver statistics and cache usage of every simulation run in this interaction.")
+        summary = pd.DataFrame.from_dict(trace.summary(), orient="index")
+        st.dataframe(summary, use_container_width=True)
+        stages = pd.DataFrame(trace.stages).drop(columns=["source", "timestamp", "pid"], errors="ignore")
+        st.dataframe(stages, use_container_width=True)
+    else:
+        st.write("No simulation ran in this interaction.")
+    cache_stats = simulation_cache.stats()
+    st.caption(
+        f"Result cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+        f"{cache_stats['entries']} entries. Process pipeline solves per stage: "
+        + ", ".join(f"{name} {count}" for name, count in pipeline.computations.items())
+    )
+    job_stats = simulation_jobs.stats()
+    st.caption(
+        f"Background simulations ({job_stats['workers']} workers): {job_stats['running']} running, "
+        f"{job_stats['submitted']} submitted, {job_stats['deduplicated']} shared, "
+        f"{job_stats['cancelled']} cancelled, {job_stats['failed']} failed, "
+        f"{job_stats['expired']} idle sessions released."
+    )
@@ -0,0 +1,116 @@
+# TESTES DA EXECUÇÃO EM LOTE
+# Linhas longas demais, não numéricas ou fora da faixa ficam no resultado
+# com a mensagem na coluna "error"; composições em porcentagem são
+# decididas por coluna; uma execução interrompida continua do checkpoint.
+#
+# Uso:
+#   python -m pytest -q tests
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Batch_Runner import read_chunks, run_batch, simulate_chunk
+from Hydrothermal_Pretreatment import simulate_hydrothermal_degradation
+
+HEADER = "temperature, solid_loading, cellulose_fraction, hemicellulose_fraction, time_final\n"
+
+def _write(path, rows):
+    path.write_text(HEADER + "".join(row + "\n" for row in rows))
+    return path
+
+def _run(tmp_path, rows, **options):
+    source = _write(tmp_path / "conditions.csv", rows)
+    report = run_batch(source, tmp_path / "results.csv", n_workers=1, progress=None, **options)
+    return report, pd.read_csv(tmp_path / "results.csv", keep_default_na=False, na_values=[""])
+
+def test_invalid_rows_are_reported_in_place(tmp_path):
+    report, results = _run(tmp_path, [
+        "195, 100, 0.35, 0.23, 40",
+        "195, 100, 0.35, 0.23, 40, 99, 98",     # campos a mais
+        "195, 100, 0.35, 0.23, 40, 7",          # um campo a mais
+        "195, abc, 0.35, 0.23, 40",             # não numérico
+        "195, 100, 0.35",                       # campos a menos
+        "230, 100, 0.35, 0.23, 40",             # fora da faixa de temperatura
+        "200, 100, 0.40, 0.25, 60",
+    ])
+
+    assert (report["rows_done"], report["errors"]) == (7, 5)
+    assert list(results.columns[:5]) == ["temperature", "solid_loading", "cellulose_fraction",
+                                         "hemicellulose_fraction", "time_final"]
+    errors = results["error"].fillna("").tolist()
+    assert errors[0] == errors[6] == ""
+    assert errors[1] == "linha com mais campos que o cabeçalho (excedentes: 99, 98)"
+    assert errors[2] == "linha com mais campos que o cabeçalho (excedentes: 7)"
+    assert "não numérico" in errors[3] and "solid_loading" in errors[3]
+    assert "não numérico" in errors[4]
+    assert "temperatura fora da faixa" in errors[5]
+    assert results.loc[[1, 2, 3, 4, 5], "sugar_release"].isna().all()
+
+    expected = simulate_hydrothermal_degradation(200, 100, 0.40, 0.25, 60)
+    assert results.loc[6, "cellulose_degraded_percent"] == pytest.approx(expected.cellulose_degraded_percent)
+
+def test_composition_units_are_decided_per_column(tmp_path):
+    # Coluna em porcentagem: 0.9 é 0.9% (não 90%)
+    chunk = pd.DataFrame({"temperature": [195.0, 195.0], "solid_loading": [100.0, 100.0],
+                          "cellulose_fraction": [35.0, 0.9], "hemicellulose_fraction": [0.23, 0.20],
+                          "time_final": [40.0, 40.0]})
+    results = simulate_chunk(chunk)
+    expected = simulate_hydrothermal_degradation(195, 100, 0.009, 0.20, 40)
+    assert results.loc[1, "cellulose_final"] == pytest.approx(expected["cellulose"][-1])
+
+    # run_batch decide pelo primeiro bloco e mantém a decisão nos seguintes
+    report, results = _run(tmp_path, ["195, 100, 35, 23, 40", "195, 100, 0.5, 0.5, 40"], chunk_size=1)
+    assert report["errors"] == 0
+    expected = simulate_hydrothermal_degradation(195, 100, 0.005, 0.005, 40)
+    assert results.loc[1, "cellulose_final"] == pytest.approx(expected["cellulose"][-1])
+
+def test_over_long_lines_keep_their_position_across_chunks(tmp_path):
+    source = _write(tmp_path / "conditions.csv", [f"{180 + i}, 100, 0.35, 0.23, 40" + (", 1, 2" if i % 3 == 1 else "")
+                                                  for i in range(10)])
+    chunks = list(read_chunks(source, chunk_size=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    frame = pd.concat(chunks, ignore_index=True)
+    assert frame["temperature"].tolist() == [180.0 + i for i in range(10)]
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path):
+    rows = [f"{180 + i}, 100, 0.35, 0.23, {10 + i}" for i in range(25)]
+    source = _write(tmp_path / "conditions.csv", rows)
+    output = tmp_path / "results.csv"
+    complete = tmp_path / "complete.csv"
+    run_batch(source, complete, chunk_size=10, n_workers=1, progress=None)
+
+    # Interrompe a execução depois do segundo bloco gravado
+    seen = []
+
+    def stop_after_two_chunks(report):
+        seen.append(report["chunks_done"])
+        if report["chunks_done"] == 2 and not report["finished"]:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(source, output, chunk_size=10, n_workers=1, progress=stop_after_two_chunks)
+    checkpoint = json.loads((tmp_path / "results.csv.checkpoint.json").read_text())
+    assert (checkpoint["chunks_done"], checkpoint["rows_done"], checkpoint["finished"]) == (2, 20, False)
+
+    # Um bloco gravado pela metade é descartado ao retomar
+    with open(output, "ab") as f:
+        f.write(b"195.0,100.0,0.35")
+
+    resumed = []
+    report = run_batch(source, output, chunk_size=10, n_workers=1, progress=resumed.append)
+    assert [r["chunks_done"] for r in resumed] == [3, 3]
+    assert (report["rows_done"], report["finished"]) == (25, True)
+    assert output.read_bytes() == complete.read_bytes()
+
+    # Execução já concluída: nada é refeito
+    assert run_batch(source, output, chunk_size=10, n_workers=1, progress=None)["finished"]
+
+    # Outros parâmetros não reaproveitam o checkpoint
+    with pytest.raises(ValueError):
+        run_batch(source, output, chunk_size=5, n_workers=1, progress=None)
+    assert run_batch(source, output, chunk_size=5, n_workers=1, progress=None, restart=True)["rows_done"] == 25
+    assert np.allclose(pd.read_csv(output)["sugar_release"], pd.read_csv(complete)["sugar_release"])
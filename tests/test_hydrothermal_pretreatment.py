@@ -0,0 +1,72 @@
+# TESTES DE REGRESSÃO DO MODELO HIDROTÉRMICO
+# A solução analítica (autodecomposição) deve reproduzir a integração
+# numérica do notebook (odeint), e o lote com N=1 deve reproduzir a
+# simulação escalar. O instante inicial devolve exatamente o estado
+# inicial e nenhuma concentração fica negativa.
+#
+# Uso:
+#   python -m pytest -q tests
+
+import numpy as np
+import pytest
+
+from Hydrothermal_Pretreatment import (SPECIES, HydrothermalTrajectory, simulate_hydrothermal_batch,
+                                       simulate_hydrothermal_degradation)
+
+# Palha de cana (experimental_data.csv) nos extremos e no meio da faixa de temperatura
+CONDITIONS = [
+    {"temperature": 180.0, "solid_loading": 100.0, "cellulose_fraction": 0.348, "hemicellulose_fraction": 0.230,
+     "time_final": 120.0},
+    {"temperature": 195.0, "solid_loading": 100.0, "cellulose_fraction": 0.348, "hemicellulose_fraction": 0.230,
+     "time_final": 40.0},
+    {"temperature": 210.0, "solid_loading": 150.0, "cellulose_fraction": 0.400, "hemicellulose_fraction": 0.250,
+     "time_final": 60.0},
+]
+
+@pytest.mark.parametrize("condition", CONDITIONS)
+def test_analytic_matches_odeint(condition):
+    analytic = simulate_hydrothermal_degradation(**condition)
+    numeric = simulate_hydrothermal_degradation(**condition, method="odeint")
+
+    np.testing.assert_allclose(analytic["time"], numeric["time"])
+    for species in SPECIES:
+        # As duas soluções concordam em ~6e-8 g/L
+        np.testing.assert_allclose(analytic[species], numeric[species], rtol=0, atol=1e-6, err_msg=species)
+    assert analytic.cellulose_degraded_percent == pytest.approx(numeric.cellulose_degraded_percent, abs=1e-6)
+    assert analytic.hemicellulose_degraded_percent == pytest.approx(numeric.hemicellulose_degraded_percent, abs=1e-6)
+
+@pytest.mark.parametrize("condition", CONDITIONS)
+def test_batch_of_one_matches_scalar(condition):
+    scalar = simulate_hydrothermal_degradation(**condition, n_points=50)
+    batch = simulate_hydrothermal_batch(**{name: [value] for name, value in condition.items()}, n_points=50)
+
+    np.testing.assert_allclose(batch["time"][0], scalar["time"], rtol=1e-12)
+    for i, species in enumerate(SPECIES):
+        np.testing.assert_allclose(batch["concentrations"][0, :, i], scalar[species], rtol=1e-10, atol=1e-12,
+                                   err_msg=species)
+    assert batch["cellulose_degraded_percent"][0] == pytest.approx(scalar.cellulose_degraded_percent, rel=1e-10)
+    assert batch["hemicellulose_degraded_percent"][0] == pytest.approx(scalar.hemicellulose_degraded_percent, rel=1e-10)
+
+def test_batch_rejects_temperature_out_of_range():
+    condition = {**CONDITIONS[1], "temperature": [195.0, 230.0]}
+    with pytest.raises(ValueError):
+        simulate_hydrothermal_batch(**condition)
+
+@pytest.mark.parametrize("condition", CONDITIONS)
+def test_initial_state_is_exact_and_concentrations_are_not_negative(condition):
+    initial = {species: 0.0 for species in SPECIES}
+    initial["cellulose"] = condition["solid_loading"] * condition["cellulose_fraction"]
+    initial["hemicellulose"] = condition["solid_loading"] * condition["hemicellulose_fraction"]
+
+    scalar = simulate_hydrothermal_degradation(**condition)
+    assert {species: scalar[species][0] for species in SPECIES} == initial
+    assert all(scalar[species].min() >= 0.0 for species in SPECIES)
+
+    batch = simulate_hydrothermal_batch(**{name: [value, value] for name, value in condition.items()})
+    assert batch["concentrations"][:, 0, :].tolist() == [[initial[species] for species in SPECIES]] * 2
+    assert batch["concentrations"].min() >= 0.0
+
+    trajectory = HydrothermalTrajectory(*(condition[name] for name in list(condition)[:4]))
+    values = trajectory([5.0, 0.0, 1e-9])
+    assert values[:, 1].tolist() == [initial[species] for species in SPECIES]
+    assert values.min() >= 0.0
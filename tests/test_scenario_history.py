@@ -0,0 +1,59 @@
+# TESTES DO HISTÓRICO DE CENÁRIOS
+# Ordem de uso (LRU) e ordem de keys(): desenhar um cenário (peek) não conta
+# como uso; guardar de novo uma chave a torna a mais recente.
+#
+# Uso:
+#   python -m pytest -q tests
+
+import numpy as np
+
+from Scenario_History import ScenarioHistory
+
+SERIES = ("cellulose",)
+
+def _add(history, key):
+    time = np.linspace(0, 1, 100)
+    history.add(key, "pretreatment", {"temperature": float(key)}, {"time": time, "cellulose": time * key},
+                SERIES, {"yield": float(key)}, label=f"cenário {key}")
+
+def _budget(n_scenarios):
+    """Orçamento que cabe exatamente n_scenarios cenários."""
+    history = ScenarioHistory()
+    for key in range(n_scenarios):
+        _add(history, key)
+    return history.nbytes
+
+def test_readding_a_scenario_makes_it_the_most_recent():
+    history = ScenarioHistory()
+    for key in (1, 2, 3):
+        _add(history, key)
+    _add(history, 1)
+
+    assert history.keys("pretreatment") == [2, 3, 1]
+    assert history.keys("pretreatment")[-2:] == [3, 1]
+
+def test_peek_does_not_change_the_eviction_order():
+    history = ScenarioHistory(max_bytes=_budget(3))
+    for key in (1, 2, 3):
+        _add(history, key)
+    for key in history.keys("pretreatment"):
+        assert history.peek(key)["cellulose"].shape == (100,)
+    _add(history, 4)
+
+    # Desenhar não conta como uso: sai o guardado há mais tempo
+    assert history.keys("pretreatment") == [2, 3, 4]
+    assert history.evictions == 1
+
+def test_get_and_readd_protect_a_scenario_from_eviction():
+    history = ScenarioHistory(max_bytes=_budget(3))
+    for key in (1, 2, 3):
+        _add(history, key)
+    history.get(1)
+    _add(history, 4)
+    assert 2 not in history and 1 in history
+
+    # Uso: 3, 1, 4 → guardar 3 de novo deixa 1 como o usado há mais tempo
+    _add(history, 3)
+    _add(history, 5)
+    assert 1 not in history
+    assert history.keys("pretreatment") == [4, 3, 5]
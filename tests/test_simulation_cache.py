@@ -0,0 +1,80 @@
+# TESTES DO CACHE DE RESULTADOS DE SIMULAÇÃO
+# Descarte LRU pelo limite de memória, resultados grandes demais, contagem
+# de acertos e falhas e arrays somente leitura após put.
+#
+# Uso:
+#   python -m pytest -q tests
+
+import numpy as np
+import pytest
+
+from Instrumentation import Trace, tracing
+from Simulation_Cache import SimulationCache, cached_hydrothermal_degradation, result_nbytes
+
+CONDITION = {"temperature": 195.0, "solid_loading": 100.0, "cellulose_fraction": 0.348,
+             "hemicellulose_fraction": 0.230}
+
+def _array(n_bytes):
+    return np.zeros(n_bytes // 8)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SimulationCache(max_bytes=3 * 8_000)
+    for key in ("a", "b", "c"):
+        cache.put(key, _array(8_000))
+    cache.get("a")                  # "b" passa a ser o menos usado
+    cache.put("d", _array(8_000))
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+    assert cache.evictions == 1
+    assert cache.nbytes == 3 * 8_000 <= cache.max_bytes
+
+def test_oversized_result_is_returned_but_not_stored():
+    cache = SimulationCache(max_bytes=1_000)
+    cache.put("small", _array(800))
+    big = _array(8_000)
+
+    assert cache.put("big", big) is big
+    assert cache.get("big") is None
+    assert cache.get("small") is not None
+    assert cache.nbytes == result_nbytes(_array(800))
+
+def test_get_or_compute_computes_once():
+    cache = SimulationCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return _array(80)
+
+    first = cache.get_or_compute("key", compute)
+    assert cache.get_or_compute("key", compute) is first
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_cached_degradation_counts_one_lookup_per_call():
+    cache = SimulationCache()
+    trace = Trace()
+    with tracing(trace):
+        cached_hydrothermal_degradation(cache, **CONDITION, time_final=40.0)
+        # Outro tempo final: reaproveita a trajetória, que não é contada
+        cached_hydrothermal_degradation(cache, **CONDITION, time_final=60.0)
+        cached_hydrothermal_degradation(cache, **CONDITION, time_final=40.0)
+
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.stats()["hit_rate"] == pytest.approx(1 / 3)
+    counted = [(stage["n_cache_hits"], stage["n_cache_misses"]) for stage in trace.stages]
+    assert counted == [(0, 1), (0, 1), (1, 0)]
+
+def test_arrays_are_read_only_after_put():
+    cache = SimulationCache()
+    result = {"time": np.linspace(0, 1, 5), "nested": {"values": np.ones(5)}}
+    cache.put("dict", result)
+    with pytest.raises(ValueError):
+        result["time"][0] = 1.0
+    with pytest.raises(ValueError):
+        result["nested"]["values"][0] = 2.0
+
+    simulated = cached_hydrothermal_degradation(cache, **CONDITION, time_final=40.0)
+    with pytest.raises(ValueError):
+        simulated["cellulose"][0] = 0.0
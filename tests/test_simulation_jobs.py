@@ -0,0 +1,116 @@
+# TESTES DA FILA DE SIMULAÇÕES EM SEGUNDO PLANO
+# Jobs compartilhados entre vagas, cancelamento de jobs na fila, descarte de
+# jobs em execução e liberação de vagas inativas.
+#
+# Uso:
+#   python -m pytest -q tests
+
+import threading
+import time
+
+import pytest
+
+import Simulation_Jobs
+from Simulation_Jobs import SimulationJobs
+
+TIMEOUT = 10
+
+@pytest.fixture
+def jobs():
+    # Uma única thread: um job bloqueado mantém os seguintes na fila
+    jobs = SimulationJobs(max_workers=1)
+    yield jobs
+    jobs.shutdown()
+
+def _wait_until(condition):
+    """Espera os callbacks de conclusão (rodam na thread do pool após result())."""
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+def _blocking_job(jobs, owner, key):
+    """Envia um job que só termina quando release é sinalizado."""
+    started, release = threading.Event(), threading.Event()
+
+    def run():
+        started.set()
+        assert release.wait(TIMEOUT)
+        return key
+
+    future = jobs.submit(owner, key, run)
+    assert started.wait(TIMEOUT)
+    return future, release
+
+def test_owners_with_same_key_share_one_future(jobs):
+    calls = []
+    first = jobs.submit(("a", "hydrothermal"), "key", lambda: calls.append(1) or "result")
+    second = jobs.submit(("b", "hydrothermal"), "key", lambda: calls.append(1) or "result")
+
+    assert second is first
+    assert first.result(TIMEOUT) == "result"
+    assert calls == [1]
+    _wait_until(lambda: jobs.stats()["completed"] == 1)
+    stats = jobs.stats()
+    assert (stats["submitted"], stats["deduplicated"], stats["owners"]) == (1, 1, 2)
+
+def test_queued_job_is_cancelled_when_its_last_owner_leaves(jobs):
+    running, release = _blocking_job(jobs, "busy", "running")
+    queued = jobs.submit("a", "queued", lambda: "queued")
+    jobs.submit("b", "queued", lambda: "queued")
+
+    jobs.cancel("a")
+    assert not queued.cancelled()       # "b" ainda aguarda
+    jobs.cancel("b")
+    assert queued.cancelled()
+    assert jobs.key("b") is None
+    assert jobs.stats()["cancelled"] == 1
+
+    release.set()
+    assert running.result(TIMEOUT) == "running"
+    assert jobs.stats()["jobs"] == 1    # só o job de "busy"
+
+def test_new_key_on_same_owner_replaces_queued_job(jobs):
+    _, release = _blocking_job(jobs, "busy", "running")
+    old = jobs.submit("a", "old", lambda: "old")
+    new = jobs.submit("a", "new", lambda: "new")
+
+    assert old.cancelled()
+    release.set()
+    assert new.result(TIMEOUT) == "new"
+    assert jobs.job("a") is new
+
+def test_running_job_without_owners_is_discarded_not_kept(jobs):
+    running, release = _blocking_job(jobs, "a", "key")
+    jobs.cancel("a")
+    assert not running.cancelled()      # já em execução: termina normalmente
+
+    release.set()
+    assert running.result(TIMEOUT) == "key"
+    _wait_until(lambda: jobs.stats()["completed"] == 1)
+    stats = jobs.stats()
+    assert (stats["jobs"], stats["cancelled"]) == (0, 0)
+
+    # Nada ficou guardado: o mesmo pedido roda de novo
+    again = jobs.submit("a", "key", lambda: "again")
+    assert again is not running
+    assert again.result(TIMEOUT) == "again"
+    assert jobs.stats()["submitted"] == 2
+
+def test_idle_owners_are_released(jobs, monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(Simulation_Jobs.time, "monotonic", lambda: now[0])
+    jobs.idle_seconds = 60.0
+
+    idle = jobs.submit("idle", "idle-key", lambda: "idle")
+    active = jobs.submit("active", "active-key", lambda: "active")
+    assert idle.result(TIMEOUT) == "idle" and active.result(TIMEOUT) == "active"
+
+    now[0] += 45.0
+    assert jobs.job("active") is active  # consultar a vaga a mantém viva
+    now[0] += 30.0
+    stats = jobs.stats()
+
+    assert (stats["owners"], stats["expired"], stats["jobs"]) == (1, 1, 1)
+    assert jobs.job("idle") is None
+    assert jobs.job("active") is active
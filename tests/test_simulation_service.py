@@ -0,0 +1,124 @@
+# TESTES DE IDA E VOLTA DO SERVIÇO HTTP/JSON
+# Sobe o serviço em uma porta livre e conversa com ele por sockets:
+# agrupamento de requisições concorrentes em um lote, rejeição de entradas
+# inválidas (400), contadores de rota limitados e fechamento das conexões
+# keep-alive.
+#
+# Uso:
+#   python -m pytest -q tests
+
+import asyncio
+import io
+import json
+
+import numpy as np
+
+from Simulation_Service import BINARY_CONTENT_TYPE, SimulationService
+
+HYDROTHERMAL = {"temperature": 195, "solid_loading": 100, "cellulose_fraction": 0.4,
+                "hemicellulose_fraction": 0.25, "time_final": 60, "n_points": 20}
+FERMENTATION = {"biomass": 1, "glucose": 50, "xylose": 20, "n_points": 10}
+
+async def _request(reader, writer, method, path, payload=None, body=None, headers=()):
+    """Envia uma requisição na conexão e devolve (status, cabeçalhos, corpo)."""
+    if body is None:
+        body = b"" if payload is None else json.dumps(payload).encode()
+    head = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(body)}", *headers]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+    status_line, *lines = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    response_headers = dict(line.split(": ", 1) for line in lines if line)
+    content = await reader.readexactly(int(response_headers["Content-Length"]))
+    return int(status_line.split()[1]), response_headers, content
+
+async def _call(host, port, method, path, payload=None, body=None, headers=()):
+    """Uma requisição em uma conexão nova."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await _request(reader, writer, method, path, payload, body, headers)
+    finally:
+        writer.close()
+
+def _serve(scenario, **options):
+    """Roda scenario(service, host, port) com o serviço no ar e o fecha ao final."""
+    async def main():
+        service = SimulationService(port=0, **options)
+        host, port = await service.start()
+        try:
+            return await scenario(service, host, port)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+def test_concurrent_requests_are_solved_as_one_batch():
+    async def scenario(service, host, port):
+        conditions = [{**HYDROTHERMAL, "temperature": 185 + 5 * i} for i in range(5)]
+        responses = await asyncio.gather(*(
+            _call(host, port, "POST", "/simulate/hydrothermal", condition) for condition in conditions
+        ))
+        return service.metrics.snapshot(), responses
+
+    health, responses = _serve(scenario, window=0.2)
+
+    assert [status for status, _, _ in responses] == [200] * 5
+    bodies = [json.loads(content) for _, _, content in responses]
+    assert all(np.shape(body["concentrations"]) == (20, 10) for body in bodies)
+    # Temperaturas diferentes, resultados diferentes (cada um volta para a sua requisição)
+    degraded = [body["cellulose_degraded_percent"] for body in bodies]
+    assert degraded == sorted(degraded) and len(set(degraded)) == 5
+    assert (health["batches"], health["max_batch_size"]) == (1, 5)
+
+def test_binary_response_round_trip():
+    async def scenario(service, host, port):
+        return await _call(host, port, "POST", "/simulate/fermentation?format=npz", FERMENTATION)
+
+    status, headers, content = _serve(scenario)
+
+    assert status == 200 and headers["Content-Type"] == BINARY_CONTENT_TYPE
+    arrays = np.load(io.BytesIO(content))
+    assert arrays["concentrations"].shape == (10, 4)
+
+def test_invalid_inputs_return_400():
+    async def scenario(service, host, port):
+        requests = [
+            {**FERMENTATION, "params": {"mimax_Glu": -0.1}},
+            {**FERMENTATION, "params": {"Y_X_Glu": 0}},
+            {**FERMENTATION, "params": {"unknown": 1.0}},
+            {**FERMENTATION, "params": [0.2]},
+        ]
+        statuses = [(await _call(host, port, "POST", "/simulate/fermentation", payload))[0] for payload in requests]
+        statuses.append((await _call(host, port, "POST", "/simulate/hydrothermal", [HYDROTHERMAL]))[0])
+        statuses.append((await _call(host, port, "POST", "/simulate/hydrothermal", body=b"{not json"))[0])
+        statuses.append((await _call(host, port, "POST", "/simulate/hydrothermal",
+                                     {**HYDROTHERMAL, "temperature": 250}))[0])
+        return statuses
+
+    assert _serve(scenario) == [400] * 7
+
+def test_unknown_routes_share_one_counter():
+    async def scenario(service, host, port):
+        for path in ("/health", "/simulate/unknown", "/favicon.ico", "/a/b/c?x=1"):
+            await _call(host, port, "GET", path)
+        status, _, content = await _call(host, port, "GET", "/health")
+        return status, json.loads(content)
+
+    status, health = _serve(scenario)
+
+    assert status == 200
+    assert health["requests"] == {"/health": 2, "other": 3}
+    assert health["responses"]["404"] == 3
+
+def test_close_ends_keep_alive_connections():
+    async def scenario(service, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        status, headers, _ = await _request(reader, writer, "GET", "/health")
+        assert status == 200 and headers["Connection"] == "keep-alive"
+        assert service.metrics.open_connections == 1
+
+        await service.close()
+        # O servidor fecha a conexão ociosa: o cliente lê o fim do fluxo
+        eof = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return eof, service.metrics.open_connections
+
+    assert _serve(scenario) == (b"", 0)